@@ -9,7 +9,9 @@ import platform
 import sys
 from enum import IntEnum
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+
+import numpy as np
 
 
 # 平台特定的库加载
@@ -42,19 +44,23 @@ def _get_library_path() -> str:
 
     return str(lib_path)
 
-# 延迟加载库（仅在macOS平台需要时加载）
+# 延迟加载库（仅在需要时加载）
 _lib = None
 
+# 指针版函数原型（参数均为整数地址，可直接传入 ndarray 数据地址，零拷贝）
+_process_stream_ptr = None
+_process_reverse_stream_ptr = None
+
 def _ensure_library_loaded():
-    """确保库已加载（仅macOS平台）。"""
+    """确保库已加载（macOS，以及启用软件AEC的 Linux）。"""
     global _lib
 
-    # 检查是否为macOS平台
+    # Windows 使用系统级AEC
     system = platform.system().lower()
-    if system != 'darwin':
+    if system not in ('darwin', 'linux'):
         raise RuntimeError(
-            f"WebRTC APM library is only supported on macOS, current platform: {system}. "
-            f"Windows and Linux should use system-level AEC instead."
+            f"WebRTC APM library is only supported on macOS and Linux, current platform: {system}. "
+            f"Windows should use system-level AEC instead."
         )
 
     # 如果已加载，直接返回
@@ -278,12 +284,33 @@ def _init_function_signatures():
     _lib.WebRTC_APM_SetStreamDelayMs.argtypes = [ctypes.c_void_p, ctypes.c_int]
     _lib.WebRTC_APM_SetStreamDelayMs.restype = None
 
+    # 同一符号的 void* 版本：省去每次调用构造 ctypes 数组和指针对象
+    global _process_stream_ptr, _process_reverse_stream_ptr
+    ptr_prototype = ctypes.CFUNCTYPE(
+        ctypes.c_int,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+    )
+    _process_stream_ptr = ptr_prototype(('WebRTC_APM_ProcessStream', _lib))
+    _process_reverse_stream_ptr = ptr_prototype(
+        ('WebRTC_APM_ProcessReverseStream', _lib)
+    )
+
+def _int16_address(array: np.ndarray, name: str) -> int:
+    """获取 C 连续 int16 数组的数据地址。"""
+    if array.dtype != np.int16 or not array.flags['C_CONTIGUOUS']:
+        raise ValueError(f"{name} must be a C-contiguous int16 array")
+    return array.ctypes.data
+
 class WebRTCAudioProcessing:
     """WebRTC 音频处理的高级 Python 封装器。"""
 
     def __init__(self):
         """初始化音频处理模块。"""
-        # 确保库已加载（仅macOS）
+        # 确保库已加载（macOS / Linux）
         _ensure_library_loaded()
         _init_function_signatures()
 
@@ -360,6 +387,102 @@ class WebRTCAudioProcessing:
             self._handle, src, src_config, dest_config, dest
         )
     
+    def process_reverse_stream_array(self, src: np.ndarray, src_config: int,
+                                     dest_config: int, dest: np.ndarray) -> int:
+        """零拷贝处理一帧反向流（10ms），直接读写 ndarray 内存。
+
+        Args:
+            src: 源音频（C 连续 int16）
+            src_config: 源流配置句柄
+            dest_config: 目标流配置句柄
+            dest: 目标缓冲区（C 连续 int16，预分配）
+
+        Returns:
+            状态码（0表示成功）
+        """
+        return _process_reverse_stream_ptr(
+            self._handle,
+            _int16_address(src, 'src'),
+            src_config,
+            dest_config,
+            _int16_address(dest, 'dest'),
+        )
+
+    def process_stream_array(self, src: np.ndarray, src_config: int,
+                             dest_config: int, dest: np.ndarray) -> int:
+        """零拷贝处理一帧采集流（10ms），直接读写 ndarray 内存。
+
+        Args:
+            src: 源音频（C 连续 int16）
+            src_config: 源流配置句柄
+            dest_config: 目标流配置句柄
+            dest: 目标缓冲区（C 连续 int16，预分配，可与 src 相同）
+
+        Returns:
+            状态码（0表示成功）
+        """
+        return _process_stream_ptr(
+            self._handle,
+            _int16_address(src, 'src'),
+            src_config,
+            dest_config,
+            _int16_address(dest, 'dest'),
+        )
+
+    def process_frames(self, capture: np.ndarray, reference: np.ndarray,
+                       capture_config: int, render_config: int,
+                       dest: np.ndarray, frame_size: int,
+                       reverse_scratch: Optional[np.ndarray] = None) -> Tuple[int, int]:
+        """批量处理 N 个 10ms 帧（如 60ms 帧拆成 6 块）。
+
+        每块先送入参考信号（反向流）再处理采集信号，与逐帧调用顺序一致。
+        全程使用 ndarray 数据地址偏移，不构造 ctypes 数组、不拷贝、不拼接。
+
+        Args:
+            capture: 采集音频（C 连续 int16，长度为 frame_size 的整数倍）
+            reference: 参考音频（C 连续 int16，与 capture 等长）
+            capture_config: 采集流配置句柄
+            render_config: 反向流配置句柄
+            dest: 输出缓冲区（C 连续 int16，与 capture 等长，可与 capture 相同）
+            frame_size: 每块样本数（10ms）
+            reverse_scratch: 反向流输出暂存（frame_size 个 int16），默认内部分配
+
+        Returns:
+            (反向流状态码, 采集流状态码)：全部成功为 0，否则为第一个失败块的错误码
+        """
+        total = len(capture)
+        if total % frame_size != 0 or len(reference) != total or len(dest) != total:
+            raise ValueError("capture/reference/dest length mismatch")
+
+        if reverse_scratch is None:
+            reverse_scratch = np.empty(frame_size, dtype=np.int16)
+
+        capture_addr = _int16_address(capture, 'capture')
+        reference_addr = _int16_address(reference, 'reference')
+        dest_addr = _int16_address(dest, 'dest')
+        scratch_addr = _int16_address(reverse_scratch, 'reverse_scratch')
+        step = frame_size * 2  # int16 字节数
+
+        handle = self._handle
+        process_reverse = _process_reverse_stream_ptr
+        process = _process_stream_ptr
+        render_status = 0
+        capture_status = 0
+        for offset in range(0, total * 2, step):
+            result = process_reverse(
+                handle, reference_addr + offset, render_config, render_config,
+                scratch_addr,
+            )
+            if result != 0 and render_status == 0:
+                render_status = result
+            result = process(
+                handle, capture_addr + offset, capture_config, capture_config,
+                dest_addr + offset,
+            )
+            if result != 0 and capture_status == 0:
+                capture_status = result
+        return render_status, capture_status
+
     def set_stream_delay_ms(self, delay_ms: int) -> None:
         """设置流延迟（毫秒）。
         
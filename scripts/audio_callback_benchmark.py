@@ -0,0 +1,171 @@
+"""音频回调内存分配微基准.
+
+对比 AudioCodec 输出/输入回调在旧实现（每次回调 np.zeros / astype / 除法 /
+np.tile / 下混新数组）与当前实现（预分配缓冲区 + 原地 ufunc + 广播写入）下，
+每次回调的临时内存分配量（tracemalloc 峰值增量）和耗时。
+
+当前实现每次回调只剩少量切片视图对象（数百字节），不再分配采样数据缓冲区。
+重采样路径中 soxr 输出数组由库内部分配，不在本基准范围内，因此只测直接播放路径。
+
+用法:
+    python scripts/audio_callback_benchmark.py [--channels 2] [--iterations 2000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.utils.opus_loader import setup_opus  # noqa: E402
+
+setup_opus()
+
+from src.audio_codecs.audio_codec import AudioCodec  # noqa: E402
+from src.constants.constants import AudioConfig  # noqa: E402
+from src.utils.audio_utils import downmix_to_mono_into  # noqa: E402
+
+
+def legacy_output_callback(codec, outdata, frames):
+    """
+    旧版直接播放回调（用于对比）.
+    """
+    audio_data = codec._output_buffer.get_nowait()
+    if audio_data is None:
+        outdata.fill(0)
+        return
+    if len(audio_data) >= frames:
+        mono_samples = audio_data[:frames]
+    else:
+        mono_samples = np.zeros(frames, dtype=np.int16)
+        mono_samples[: len(audio_data)] = audio_data
+    mono_samples_float = mono_samples.astype(np.float32) / 32768.0
+    if codec.output_channels > 1:
+        outdata[:] = np.tile(
+            mono_samples_float.reshape(-1, 1), (1, codec.output_channels)
+        )
+    else:
+        outdata[:, 0] = mono_samples_float
+
+
+def legacy_downmix(indata, frames):
+    """
+    旧版输入下混 + int16 转换（用于对比）.
+    """
+    audio_data = indata.mean(axis=1, dtype=indata.dtype)
+    return (audio_data * 32768.0).astype(np.int16)
+
+
+def current_downmix(codec, indata, frames):
+    """
+    当前输入下混 + int16 转换路径（与 _input_callback/_process_capture_frame 一致）.
+    """
+    audio_data = downmix_to_mono_into(indata, codec._input_mono_frame[:frames])
+    np.multiply(audio_data, 32768.0, out=codec._capture_float_frame)
+    codec._capture_int16_frame[:] = codec._capture_float_frame
+    return codec._capture_int16_frame
+
+
+def measure(name, fn, iterations):
+    """
+    运行 fn 若干次，统计每次调用的临时分配峰值和平均耗时.
+    """
+    for _ in range(50):
+        fn()
+
+    peak_total = 0
+    tracemalloc.start()
+    for _ in range(iterations):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - before
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{name:<28} 临时分配 {peak_total / iterations:8.0f} B/回调 | "
+        f"耗时 {elapsed / iterations * 1e6:7.2f} us/回调"
+    )
+
+
+def build_codec(channels):
+    """
+    构造只用于回调基准的 AudioCodec（不打开任何音频设备）.
+    """
+    codec = AudioCodec()
+    codec.device_input_sample_rate = AudioConfig.INPUT_SAMPLE_RATE
+    codec.device_output_sample_rate = AudioConfig.OUTPUT_SAMPLE_RATE
+    codec.input_channels = channels
+    codec.output_channels = channels
+    codec._device_input_frame_size = AudioConfig.INPUT_FRAME_SIZE
+    codec._device_output_frame_size = AudioConfig.OUTPUT_FRAME_SIZE
+    asyncio.run(codec._create_resamplers())
+    codec._create_scratch_buffers()
+    return codec
+
+
+def main():
+    parser = argparse.ArgumentParser(description="音频回调内存分配微基准")
+    parser.add_argument("--channels", type=int, default=2, help="设备声道数")
+    parser.add_argument("--iterations", type=int, default=2000, help="回调次数")
+    args = parser.parse_args()
+
+    codec = build_codec(args.channels)
+    frames = AudioConfig.OUTPUT_FRAME_SIZE
+    frame = (np.random.randn(frames) * 3000).astype(np.int16)
+    outdata = np.zeros((frames, args.channels), dtype=np.float32)
+
+    def refill_and(callback):
+        def run():
+            codec._output_buffer.put(frame)
+            callback(outdata, frames)
+
+        return run
+
+    print(
+        f"输出: {frames} 帧 x {args.channels} 声道 | "
+        f"输入: {AudioConfig.INPUT_FRAME_SIZE} 帧 x {args.channels} 声道 | "
+        f"{args.iterations} 次"
+    )
+    measure(
+        "输出回调（旧实现）",
+        refill_and(lambda o, f: legacy_output_callback(codec, o, f)),
+        args.iterations,
+    )
+    measure(
+        "输出回调（当前实现）",
+        refill_and(codec._output_callback_direct),
+        args.iterations,
+    )
+
+    in_frames = AudioConfig.INPUT_FRAME_SIZE
+    indata = (np.random.randn(in_frames, args.channels) * 0.1).astype(np.float32)
+    measure(
+        "输入下混（旧实现）",
+        lambda: legacy_downmix(indata, in_frames),
+        args.iterations,
+    )
+    measure(
+        "输入下混（当前实现）",
+        lambda: current_downmix(codec, indata, in_frames),
+        args.iterations,
+    )
+
+    asyncio.run(codec.close())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,735 @@
+"""离线音频链路基准（模拟 sounddevice 音频流，无需声卡）.
+
+把 sounddevice.InputStream / OutputStream 替换为由 WAV 文件（或合成的间歇
+正弦脉冲）驱动的模拟流，按可配置的设备采样率、声道数和块大小实时调用
+AudioCodec 的输入/输出回调，端到端运行完整链路：
+
+    上行：模拟麦克风 → 输入回调（下混/重采样/编码） → 编码回调 + 音频监听器
+    下行：Opus 包（可加网络抖动/丢包） → 加密后经本机 UDP 发送 → UdpAudioTransport
+          （解密/重排） → PluginManager → AudioPlugin.on_incoming_audio
+          → write_audio(带序列号) → 抖动缓冲/解码（FEC/PLC） → 输出回调
+
+报告内容：
+    - 每次回调耗时 p50/p99/max 及超过块时长的次数
+    - 每次回调的临时内存分配（--trace-alloc，tracemalloc 为全局统计，
+      会计入同时运行的解码/事件循环线程，数值偏保守）
+    - 丢帧：采集缺帧、流水线溢出、重排迟到、抖动缓冲丢包/迟到、解码错误、
+      播放溢出/断流
+    - 端到端延迟：信号起音（能量越过阈值）从进入设备块到到达监听器、
+      从发出 UDP 包到写入输出块的时间（不含设备自身的硬件延迟）
+
+缺少 PortAudio（无声卡的 CI 机器）时以空模块代替 sounddevice，仅使用模拟流。
+配置了阈值时，超限以非零退出码结束，便于在 CI 中发现性能回归。
+
+用法:
+    python scripts/audio_pipeline_benchmark.py [--seconds 10]
+        [--input-wav mic.wav] [--output-wav tts.wav]
+        [--input-rate 48000] [--input-channels 2] [--input-blocksize 0]
+        [--output-rate 48000] [--output-channels 2] [--output-blocksize 0]
+        [--capture-worker] [--network-jitter-ms 0] [--packet-loss 0]
+        [--reorder-window 4] [--reorder-delay-ms 60]
+        [--trace-alloc] [--json report.json] [--max-p99-us 0] [--max-drops -1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+import tracemalloc
+import types
+import wave
+from pathlib import Path
+
+import numpy as np
+import soxr
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+try:
+    import sounddevice as sd
+except OSError:
+    # 未安装 PortAudio：模拟流不需要真实设备，用空模块占位
+    sd = types.ModuleType("sounddevice")
+    sys.modules["sounddevice"] = sd
+
+from src.utils.opus_loader import setup_opus  # noqa: E402
+
+setup_opus()
+
+import opuslib  # noqa: E402
+
+from src.audio_codecs.audio_codec import AudioCodec  # noqa: E402
+from src.constants.constants import AudioConfig  # noqa: E402
+from src.plugins.audio import AudioPlugin  # noqa: E402
+from src.plugins.manager import PluginManager  # noqa: E402
+from src.protocols.udp_audio_transport import UdpAudioTransport  # noqa: E402
+from src.protocols.udp_packet_codec import UdpPacketCodec  # noqa: E402
+
+# 起音检测阈值（块 RMS，满幅为 1.0）
+ONSET_ON_LEVEL = 0.05
+ONSET_OFF_LEVEL = 0.01
+# 重新检测起音前需要连续静音的块数
+ONSET_QUIET_BLOCKS = 3
+
+
+# ============= 信号准备 =============
+
+
+def load_wav(path):
+    """
+    读取 16-bit PCM WAV，返回 (形状 (N, channels) 的 float32 数组, 采样率).
+    """
+    with wave.open(str(path), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"仅支持 16-bit PCM WAV: {path}")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+    pcm = np.frombuffer(raw, dtype=np.int16).reshape(-1, channels)
+    return pcm.astype(np.float32) / 32768.0, rate
+
+
+def synth_bursts(rate, seconds, period=1.0, burst=0.2, freq=1000.0, level=0.5):
+    """
+    合成间歇正弦脉冲（每 period 秒一段 burst 秒的正弦，其余为静音），便于测量起音延迟.
+    """
+    t = np.arange(int(rate * seconds)) / rate
+    gate = (t % period) < burst
+    return (level * np.sin(2 * np.pi * freq * t) * gate).astype(np.float32)
+
+
+def to_format(signal, rate, target_rate, target_channels, seconds):
+    """
+    把 (N, channels) 或一维信号转换到目标采样率/声道数，并循环填满 seconds 秒.
+    """
+    if signal.ndim == 1:
+        signal = signal.reshape(-1, 1)
+    if rate != target_rate:
+        signal = soxr.resample(signal, rate, target_rate, quality="HQ")
+    if signal.shape[1] != target_channels:
+        mono = signal.mean(axis=1, keepdims=True)
+        signal = np.repeat(mono, target_channels, axis=1)
+    length = int(target_rate * seconds)
+    repeats = -(-length // len(signal))
+    return np.ascontiguousarray(np.tile(signal, (repeats, 1))[:length], np.float32)
+
+
+def block_levels(mono, block):
+    """
+    按块计算 RMS.
+    """
+    count = len(mono) // block
+    blocks = mono[: count * block].reshape(count, block).astype(np.float64)
+    return np.sqrt(np.mean(blocks * blocks, axis=1))
+
+
+def find_onsets(levels):
+    """
+    带迟滞的起音检测，返回起音所在块的下标列表.
+    """
+    onsets = []
+    armed = True
+    quiet = 0
+    for i, level in enumerate(levels):
+        if armed and level >= ONSET_ON_LEVEL:
+            onsets.append(i)
+            armed = False
+            quiet = 0
+        elif not armed:
+            quiet = quiet + 1 if level < ONSET_OFF_LEVEL else 0
+            if quiet >= ONSET_QUIET_BLOCKS:
+                armed = True
+    return onsets
+
+
+def match_latencies(sent_times, detect_times):
+    """
+    把每个参考起音时间与其后（下一参考起音之前）首个检测到的起音配对，返回延迟（毫秒）.
+    """
+    latencies = []
+    detect = sorted(detect_times)
+    j = 0
+    for i, sent in enumerate(sent_times):
+        limit = sent_times[i + 1] if i + 1 < len(sent_times) else float("inf")
+        while j < len(detect) and detect[j] < sent:
+            j += 1
+        if j < len(detect) and detect[j] < limit:
+            latencies.append((detect[j] - sent) * 1000)
+            j += 1
+    return latencies
+
+
+def percentiles(values, scale=1.0):
+    """
+    p50/p99/max 摘要.
+    """
+    if not values:
+        return {"count": 0, "p50": None, "p99": None, "max": None}
+    data = np.asarray(values, dtype=np.float64) * scale
+    return {
+        "count": len(data),
+        "p50": round(float(np.percentile(data, 50)), 1),
+        "p99": round(float(np.percentile(data, 99)), 1),
+        "max": round(float(data.max()), 1),
+    }
+
+
+# ============= 模拟设备 =============
+
+
+class SimulatedStream:
+    """
+    模拟 sounddevice 流：构造参数与 sd.InputStream / sd.OutputStream 一致，
+    由 SimulatedDevice 的时钟线程按块时长调用回调.
+    """
+
+    device = None  # 由 install_simulated_streams 设置
+    is_input = True
+
+    def __init__(
+        self,
+        device=None,
+        samplerate=None,
+        channels=None,
+        dtype=None,
+        blocksize=None,
+        callback=None,
+        finished_callback=None,
+        latency=None,
+        **kwargs,
+    ):
+        self.samplerate = samplerate
+        self.channels = channels
+        self.callback = callback
+        self.finished_callback = finished_callback
+        override = self.device.blocksize_for(self.is_input)
+        self.blocksize = override or blocksize
+        # 与 PortAudio 的 latency 属性一致（秒），此处取一个块的时长
+        self.latency = self.blocksize / samplerate
+        self.active = False
+        self.buffer = np.zeros((self.blocksize, channels), dtype=np.float32)
+
+    def start(self):
+        self.active = True
+        self.device.attach(self)
+
+    def stop(self):
+        self.active = False
+        self.device.detach(self)
+        if self.finished_callback:
+            self.finished_callback()
+
+    def close(self):
+        if self.active:
+            self.stop()
+
+
+class SimulatedInputStream(SimulatedStream):
+    is_input = True
+
+
+class SimulatedOutputStream(SimulatedStream):
+    is_input = False
+
+
+class CallbackStats:
+    """
+    单个流的回调统计（仅时钟线程写入）.
+    """
+
+    def __init__(self):
+        self.durations_ns = []
+        self.alloc_bytes = []
+        self.deadline_misses = 0
+
+
+class SimulatedDevice:
+    """
+    模拟声卡：一个时钟线程按各自块时长驱动输入/输出流回调，并记录耗时、分配和起音时间.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.trace_alloc = args.trace_alloc
+        self.input_signal = None
+        self.input_onset_blocks = set()
+
+        self._streams = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+        self.input_enabled = True
+
+        self.input_stats = CallbackStats()
+        self.output_stats = CallbackStats()
+        self.input_samples = 0
+        self.input_onset_times = []
+        self.output_levels = []  # (时间, RMS)
+
+    def blocksize_for(self, is_input):
+        return self.args.input_blocksize if is_input else self.args.output_blocksize
+
+    def attach(self, stream):
+        with self._lock:
+            self._streams.append([stream, None, 0])
+
+    def detach(self, stream):
+        with self._lock:
+            self._streams = [s for s in self._streams if s[0] is not stream]
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="simulated-audio-clock", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2.0)
+
+    def _run(self):
+        """
+        时钟线程：按绝对时间表调度（不累积漂移），到期的流依次回调.
+        """
+        while self._running:
+            now = time.perf_counter()
+            next_due = now + 0.005
+            with self._lock:
+                entries = list(self._streams)
+            for entry in entries:
+                stream, due, index = entry
+                if due is None:
+                    due = entry[1] = now
+                if now >= due:
+                    self._tick(stream, index)
+                    entry[2] = index + 1
+                    entry[1] = due + stream.blocksize / stream.samplerate
+                next_due = min(next_due, entry[1])
+            delay = next_due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def _tick(self, stream, index):
+        frames = stream.blocksize
+        data = stream.buffer
+        if stream.is_input:
+            if not self.input_enabled:
+                # 模拟麦克风已停止送数据
+                return
+            start = index * frames
+            chunk = self.input_signal[start : start + frames]
+            if len(chunk) < frames:
+                data.fill(0)
+            else:
+                data[:] = chunk
+                if index in self.input_onset_blocks:
+                    self.input_onset_times.append(time.perf_counter())
+            stats = self.input_stats
+        else:
+            stats = self.output_stats
+
+        if self.trace_alloc:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+        begin = time.perf_counter_ns()
+        stream.callback(data, frames, None, None)
+        elapsed = time.perf_counter_ns() - begin
+        if self.trace_alloc:
+            _, peak = tracemalloc.get_traced_memory()
+            stats.alloc_bytes.append(peak - before)
+
+        stats.durations_ns.append(elapsed)
+        if elapsed > frames / stream.samplerate * 1e9:
+            stats.deadline_misses += 1
+
+        if stream.is_input:
+            self.input_samples += frames
+        else:
+            mono = data[:, 0]
+            level = float(np.sqrt(np.dot(mono, mono) / frames))
+            self.output_levels.append((time.perf_counter(), level))
+
+
+def install_simulated_streams(device):
+    """
+    把 AudioCodec 使用的 sounddevice 流类替换为模拟流.
+    """
+    SimulatedStream.device = device
+    sd.InputStream = SimulatedInputStream
+    sd.OutputStream = SimulatedOutputStream
+
+
+class SimulatedAudioCodec(AudioCodec):
+    """
+    使用命令行给定的设备参数和配置覆盖项的 AudioCodec（不探测设备、不写配置文件）.
+    """
+
+    def __init__(self, args, overrides):
+        super().__init__()
+        self._args = args
+        self._overrides = overrides
+        base_config = self.config
+        self.config = types.SimpleNamespace(
+            get_config=lambda path, default=None: overrides.get(
+                path, base_config.get_config(path, default)
+            ),
+            update_config=lambda path, value: True,
+        )
+
+    async def _load_device_config(self):
+        args = self._args
+        self.mic_device_id = None
+        self.speaker_device_id = None
+        self.device_input_sample_rate = args.input_rate
+        self.device_output_sample_rate = args.output_rate
+        self.input_channels = args.input_channels
+        self.output_channels = args.output_channels
+        self._device_input_frame_size = int(
+            args.input_rate * (AudioConfig.FRAME_DURATION / 1000)
+        )
+        self._device_output_frame_size = int(
+            args.output_rate * (AudioConfig.FRAME_DURATION / 1000)
+        )
+
+
+# ============= 基准流程 =============
+
+
+def prepare_downlink(args, seconds):
+    """
+    准备下行 Opus 包及参考起音包下标.
+    """
+    rate = AudioConfig.OUTPUT_SAMPLE_RATE
+    frame = AudioConfig.OUTPUT_FRAME_SIZE
+    if args.output_wav:
+        signal, wav_rate = load_wav(args.output_wav)
+    else:
+        signal, wav_rate = synth_bursts(rate, seconds), rate
+    mono = to_format(signal, wav_rate, rate, 1, seconds)[:, 0]
+
+    count = len(mono) // frame
+    encoder = opuslib.Encoder(rate, 1, opuslib.APPLICATION_AUDIO)
+    pcm = np.clip(np.rint(mono * 32768.0), -32768, 32767).astype(np.int16)
+    packets = [
+        encoder.encode(pcm[i * frame : (i + 1) * frame].tobytes(), frame)
+        for i in range(count)
+    ]
+    return packets, set(find_onsets(block_levels(mono, frame)))
+
+
+async def feed_downlink(codec, packets, onset_packets, args, write_times):
+    """按帧时长经真实下行链路发送：可选网络抖动（会导致乱序）和随机丢包.
+
+    包经 UdpPacketCodec 加密后从本机 UDP 套接字发给 UdpAudioTransport，
+    再按应用的方式交给 PluginManager / AudioPlugin；丢掉的包在序列号上留下空洞，
+    由抖动缓冲做 FEC/PLC 补偿。返回 UDP 通道统计。
+    """
+    frame_s = AudioConfig.FRAME_DURATION / 1000
+    rng = random.Random(args.seed)
+    schedule = []
+    for seq, packet in enumerate(packets):
+        if args.packet_loss and rng.random() < args.packet_loss:
+            continue
+        jitter = rng.uniform(0, args.network_jitter_ms / 1000)
+        schedule.append((seq * frame_s + jitter, seq, packet))
+    schedule.sort()
+
+    aes_key = os.urandom(16).hex()
+    aes_nonce = "0100" + "0000" + os.urandom(8).hex() + "00000000"
+    sender = UdpPacketCodec(aes_key, aes_nonce)
+    receiver = UdpPacketCodec(aes_key, aes_nonce)
+
+    plugin = AudioPlugin()
+    plugin.codec = codec
+    plugins = PluginManager()
+    plugins.register(plugin)
+
+    # 与 Application 一致：按到达顺序串行转发给插件
+    incoming = asyncio.Queue()
+
+    def on_packets(ready):
+        for sequence, data in ready:
+            incoming.put_nowait((data, sequence))
+
+    async def dispatch():
+        while True:
+            data, sequence = await incoming.get()
+            await plugins.notify_incoming_audio(data, sequence)
+            incoming.task_done()
+
+    loop = asyncio.get_running_loop()
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    transport = await UdpAudioTransport.open(
+        loop,
+        "127.0.0.1",
+        server.getsockname()[1],
+        decoder=receiver.decode,
+        on_packets=on_packets,
+        reorder_window=args.reorder_window,
+        reorder_delay=args.reorder_delay_ms / 1000,
+        frame_duration_ms=AudioConfig.FRAME_DURATION,
+    )
+    client_address = transport.transport.get_extra_info("sockname")
+    dispatcher = asyncio.create_task(dispatch())
+    try:
+        start = loop.time()
+        for send_at, seq, packet in schedule:
+            delay = start + send_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if seq in onset_packets:
+                write_times[seq] = time.perf_counter()
+            server.sendto(sender.encode(packet, seq), client_address)
+        # 等待最后的缺口超时以及插件转发完成
+        await asyncio.sleep(args.reorder_delay_ms / 1000 + frame_s)
+        await incoming.join()
+        return transport.get_stats()
+    finally:
+        dispatcher.cancel()
+        transport.close()
+        server.close()
+
+
+async def run_benchmark(args):
+    seconds = args.seconds
+    device = SimulatedDevice(args)
+
+    # 上行信号与参考起音块
+    if args.input_wav:
+        signal, wav_rate = load_wav(args.input_wav)
+    else:
+        signal, wav_rate = synth_bursts(args.input_rate, seconds), args.input_rate
+    device.input_signal = to_format(
+        signal, wav_rate, args.input_rate, args.input_channels, seconds
+    )
+    input_block = args.input_blocksize or int(
+        args.input_rate * AudioConfig.FRAME_DURATION / 1000
+    )
+    device.input_onset_blocks = set(
+        find_onsets(block_levels(device.input_signal.mean(axis=1), input_block))
+    )
+
+    packets, onset_packets = prepare_downlink(args, seconds)
+
+    install_simulated_streams(device)
+    overrides = {
+        "AUDIO_DEVICES.CAPTURE_WORKER": args.capture_worker,
+        "AUDIO_DEVICES.RESAMPLE_PROFILE": args.resample_profile,
+        "AUDIO_DEVICES.RESAMPLE_INTEGER_FAST_PATH": args.integer_fast_path,
+    }
+    codec = SimulatedAudioCodec(args, overrides)
+
+    encoded = []  # (时间, 字节数)
+    listened = []  # (时间, RMS)
+
+    class LevelListener:
+        def on_audio_data(self, audio_data):
+            level = float(np.sqrt(np.mean(np.square(audio_data / 32768.0))))
+            listened.append((time.perf_counter(), level))
+
+    codec.set_encoded_callback(
+        lambda data: encoded.append((time.perf_counter(), len(data)))
+    )
+    codec.add_audio_listener(LevelListener())
+
+    if args.trace_alloc:
+        tracemalloc.start()
+
+    write_times = {}
+    try:
+        await codec.initialize()
+        device.start()
+        udp_stats = await feed_downlink(
+            codec, packets, onset_packets, args, write_times
+        )
+        # 停止上行输入后等待流水线和播放队列排空
+        device.input_enabled = False
+        await asyncio.sleep(0.5 + AudioConfig.FRAME_DURATION / 1000 * 10)
+        while not codec._output_buffer.empty():
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.2)
+        device.stop()
+    finally:
+        capture_stats = codec.get_capture_stats()
+        jitter_stats = codec.get_jitter_stats()
+        decode_stats = codec.get_decode_stats()
+        playback_stats = codec.get_playback_stats()
+        await codec.close()
+        if args.trace_alloc:
+            tracemalloc.stop()
+
+    # ---- 汇总 ----
+    protocol_samples = device.input_samples * AudioConfig.INPUT_SAMPLE_RATE
+    expected_frames = (
+        protocol_samples // args.input_rate // AudioConfig.INPUT_FRAME_SIZE
+    )
+    # 允许重采样器群时延滞留 1 帧
+    capture_missing = max(0, int(expected_frames) - len(encoded) - 1)
+
+    capture_latency = match_latencies(
+        device.input_onset_times,
+        [listened[i][0] for i in find_onsets([lv for _, lv in listened])],
+    )
+    output_onsets = find_onsets([lv for _, lv in device.output_levels])
+    playback_latency = match_latencies(
+        [write_times[seq] for seq in sorted(write_times)],
+        [device.output_levels[i][0] for i in output_onsets],
+    )
+
+    drops = {
+        "capture_missing_frames": capture_missing,
+        "capture_overflows": capture_stats["overflows"] if capture_stats else 0,
+        "reorder_late": udp_stats["late"],
+        "jitter_lost": jitter_stats["lost"],
+        "jitter_late_dropped": jitter_stats["late_dropped"],
+        "decode_errors": decode_stats["decode_errors"] if decode_stats else 0,
+        "playback_dropped": playback_stats["dropped_frames"],
+        # 最后一次断流是正常的播放结束
+        "playback_underruns": max(0, playback_stats["underruns"] - 1),
+    }
+
+    report = {
+        "config": {
+            "frame_ms": AudioConfig.FRAME_DURATION,
+            "input": f"{args.input_rate}Hz {args.input_channels}ch",
+            "output": f"{args.output_rate}Hz {args.output_channels}ch",
+            "input_blocksize": input_block,
+            "output_blocksize": args.output_blocksize
+            or int(args.output_rate * AudioConfig.FRAME_DURATION / 1000),
+            "capture_worker": args.capture_worker,
+            "resample_profile": args.resample_profile,
+            "integer_fast_path": args.integer_fast_path,
+            "network_jitter_ms": args.network_jitter_ms,
+            "packet_loss": args.packet_loss,
+            "reorder_window": args.reorder_window,
+            "reorder_delay_ms": args.reorder_delay_ms,
+            "seconds": seconds,
+        },
+        "input_callback_us": percentiles(device.input_stats.durations_ns, 1e-3),
+        "output_callback_us": percentiles(device.output_stats.durations_ns, 1e-3),
+        "input_deadline_misses": device.input_stats.deadline_misses,
+        "output_deadline_misses": device.output_stats.deadline_misses,
+        "capture_frames": {"expected": int(expected_frames), "encoded": len(encoded)},
+        "packets_sent": len(packets),
+        "drops": drops,
+        "drops_total": sum(drops.values()),
+        "capture_latency_ms": percentiles(capture_latency),
+        "playback_latency_ms": percentiles(playback_latency),
+        "capture_pipeline": capture_stats,
+        "udp_transport": udp_stats,
+        "jitter_buffer": jitter_stats,
+        "decode_worker": decode_stats,
+        "playback_buffer": playback_stats,
+    }
+    if args.trace_alloc:
+        report["input_callback_alloc_bytes"] = percentiles(
+            device.input_stats.alloc_bytes
+        )
+        report["output_callback_alloc_bytes"] = percentiles(
+            device.output_stats.alloc_bytes
+        )
+    return report
+
+
+def print_report(report):
+    def line(name, summary, unit):
+        if not summary["count"]:
+            print(f"{name:<16} 无数据")
+            return
+        print(
+            f"{name:<16} p50 {summary['p50']:>9} {unit} | "
+            f"p99 {summary['p99']:>9} {unit} | "
+            f"max {summary['max']:>9} {unit} | n={summary['count']}"
+        )
+
+    config = report["config"]
+    print(
+        f"\n===== 音频链路基准 | 帧长 {config['frame_ms']}ms | "
+        f"输入 {config['input']} 块{config['input_blocksize']} | "
+        f"输出 {config['output']} 块{config['output_blocksize']} =====\n"
+    )
+    line("输入回调耗时", report["input_callback_us"], "us")
+    line("输出回调耗时", report["output_callback_us"], "us")
+    if "input_callback_alloc_bytes" in report:
+        line("输入回调分配", report["input_callback_alloc_bytes"], "B")
+        line("输出回调分配", report["output_callback_alloc_bytes"], "B")
+    print(
+        f"超时回调: 输入 {report['input_deadline_misses']} | "
+        f"输出 {report['output_deadline_misses']}"
+    )
+    line("采集延迟", report["capture_latency_ms"], "ms")
+    line("播放延迟", report["playback_latency_ms"], "ms")
+    frames = report["capture_frames"]
+    print(f"上行帧: 期望 {frames['expected']} | 编码 {frames['encoded']}")
+    print(f"下行包: {report['packets_sent']}")
+    print(f"丢帧合计: {report['drops_total']} {report['drops']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线音频链路基准（模拟音频流）")
+    parser.add_argument("--seconds", type=float, default=10.0, help="运行时长（秒）")
+    parser.add_argument("--input-wav", help="模拟麦克风输入的 WAV（默认合成脉冲）")
+    parser.add_argument("--output-wav", help="下行 TTS 音频 WAV（默认合成脉冲）")
+    parser.add_argument("--input-rate", type=int, default=48000)
+    parser.add_argument("--input-channels", type=int, default=2)
+    parser.add_argument(
+        "--input-blocksize", type=int, default=0, help="输入块大小，0=按帧长"
+    )
+    parser.add_argument("--output-rate", type=int, default=48000)
+    parser.add_argument("--output-channels", type=int, default=2)
+    parser.add_argument(
+        "--output-blocksize", type=int, default=0, help="输出块大小，0=按帧长"
+    )
+    parser.add_argument("--capture-worker", action="store_true", help="采集流水线")
+    parser.add_argument("--resample-profile", default="low_latency")
+    parser.add_argument("--integer-fast-path", action="store_true")
+    parser.add_argument("--network-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--packet-loss", type=float, default=0.0, help="丢包率 0~1")
+    parser.add_argument("--reorder-window", type=int, default=4, help="重排窗口（包）")
+    parser.add_argument(
+        "--reorder-delay-ms", type=float, default=60, help="缺包最长等待（毫秒）"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--trace-alloc", action="store_true", help="统计内存分配")
+    parser.add_argument("--json", help="把报告写入 JSON 文件")
+    parser.add_argument(
+        "--max-p99-us", type=float, default=0, help="回调 p99 上限，0=不检查"
+    )
+    parser.add_argument(
+        "--max-drops", type=int, default=-1, help="丢帧合计上限，-1=不检查"
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+    failures = []
+    if args.max_p99_us > 0:
+        for key in ("input_callback_us", "output_callback_us"):
+            p99 = report[key]["p99"]
+            if p99 is not None and p99 > args.max_p99_us:
+                failures.append(f"{key} p99 {p99}us > {args.max_p99_us}us")
+    if 0 <= args.max_drops < report["drops_total"]:
+        failures.append(f"丢帧 {report['drops_total']} > {args.max_drops}")
+    for failure in failures:
+        print(f"失败: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""重采样档位 CPU 开销基准.
+
+按 AUDIO_DEVICES.RESAMPLE_PROFILE 的各档位（low_latency / balanced / hq），
+对常见设备采样率组合分别测量 soxr 与整数倍多相 FIR 快速路径
+（AUDIO_DEVICES.RESAMPLE_INTEGER_FAST_PATH）的开销：
+每帧耗时（进程 CPU 时间）和相对实时的 CPU 占比（单核）。
+
+用法:
+    python scripts/resampler_benchmark.py [--seconds 10] [--frame-ms 20]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.audio_codecs.resampler import (  # noqa: E402
+    RESAMPLE_PROFILES,
+    create_resampler,
+    describe_resampler,
+)
+
+# (输入采样率, 输出采样率, 说明)
+RATE_PAIRS = [
+    (48000, 16000, "USB麦克风 → 上行"),
+    (44100, 16000, "44.1k麦克风 → 上行"),
+    (24000, 48000, "下行 → 48k扬声器"),
+    (24000, 44100, "下行 → 44.1k扬声器"),
+    (48000, 24000, "48k参考 → 下行"),
+]
+
+
+def bench(resampler, in_rate, seconds, frame_ms):
+    """
+    按帧流式处理 seconds 秒正弦+噪声信号，返回 (每帧 CPU 微秒, 实时 CPU 占比%).
+    """
+    frame = int(in_rate * frame_ms / 1000)
+    frames = int(seconds * 1000 / frame_ms)
+    t = np.arange(frame * frames) / in_rate
+    signal = (
+        0.3 * np.sin(2 * np.pi * 440 * t) + 0.01 * np.random.randn(len(t))
+    ).astype(np.float32)
+
+    # 预热
+    for i in range(5):
+        resampler.resample_chunk(signal[i * frame : (i + 1) * frame], last=False)
+
+    start = time.process_time()
+    for i in range(frames):
+        resampler.resample_chunk(signal[i * frame : (i + 1) * frame], last=False)
+    cpu = time.process_time() - start
+
+    return cpu / frames * 1e6, cpu / seconds * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="重采样档位 CPU 开销基准")
+    parser.add_argument("--seconds", type=float, default=10.0, help="每项测试音频时长")
+    parser.add_argument("--frame-ms", type=int, default=20, help="回调帧长（毫秒）")
+    args = parser.parse_args()
+
+    print(f"每项 {args.seconds:.0f}s 音频，{args.frame_ms}ms/帧，CPU 占比按单核计算\n")
+    print(f"{'档位':<12}{'采样率':<16}{'后端':<14}{'us/帧':>10}{'CPU%':>9}  场景")
+    for profile in RESAMPLE_PROFILES:
+        for in_rate, out_rate, label in RATE_PAIRS:
+            candidates = [create_resampler(in_rate, out_rate, profile=profile)]
+            if in_rate % out_rate == 0 or out_rate % in_rate == 0:
+                # 整数倍时同时测量多相FIR快速路径
+                candidates.append(
+                    create_resampler(
+                        in_rate, out_rate, profile=profile, integer_fast_path=True
+                    )
+                )
+            for resampler in candidates:
+                per_frame_us, cpu_percent = bench(
+                    resampler, in_rate, args.seconds, args.frame_ms
+                )
+                print(
+                    f"{profile:<12}{f'{in_rate}→{out_rate}':<16}"
+                    f"{describe_resampler(resampler):<14}"
+                    f"{per_frame_us:>10.1f}{cpu_percent:>8.2f}%  {label}"
+                )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""唤醒词离线评测（准确率与吞吐）.
+
+用与 WakeWordDetector 相同的 sherpa_onnx.KeywordSpotter 配置（create_keyword_spotter），
+把正样本目录（包含唤醒词）和负样本目录（不含唤醒词的日常语音/噪声）中的 WAV
+逐帧送入检测，对每种线程数 × 帧长组合报告：
+
+    - 检出率：正样本中至少检出一次唤醒词的比例
+    - 误唤醒：负样本中的检出次数，折算为每小时误唤醒次数
+    - 检测延迟：检出时刻（已送入的音频时长）相对正样本语音结束（能量包络最后
+      高于峰值 -35dB 的位置）的延迟，可能为负（唤醒词后还有语音时）
+    - 实时率（RTF）：accept_waveform + decode_stream 耗时 / 音频时长
+
+只加载本地模型目录中的文件（encoder/decoder/joiner/tokens/keywords），不联网，
+可在各硬件型号上直接运行，按吞吐/准确率权衡调整 KEYWORDS_SCORE、
+KEYWORDS_THRESHOLD、MAX_ACTIVE_PATHS、NUM_THREADS。未指定的参数取配置文件中的
+WAKE_WORD_OPTIONS。WAV 须为 16-bit PCM，多声道会下混，非 16kHz 会重采样。
+
+用法:
+    python scripts/wake_word_benchmark.py --positive data/kws/pos --negative data/kws/neg
+        [--model-dir models] [--threads 1,2,4] [--frame-ms 20,60,100]
+        [--keywords-score 1.8] [--keywords-threshold 0.2] [--max-active-paths 2]
+        [--num-trailing-blanks 1] [--provider cpu] [--tail-ms 500]
+        [--json report.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+import wave
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import soxr
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.audio_processing.wake_word_detect import (  # noqa: E402
+    create_keyword_spotter,
+)
+from src.constants.constants import AudioConfig  # noqa: E402
+from src.utils.config_manager import ConfigManager  # noqa: E402
+from src.utils.resource_finder import resource_finder  # noqa: E402
+
+SAMPLE_RATE = AudioConfig.INPUT_SAMPLE_RATE
+# 语音结束判定：10ms 包络最后一次高于 (峰值 - SPEECH_END_DB) 的位置
+SPEECH_END_DB = 35.0
+SPEECH_END_FLOOR_DB = -60.0
+
+
+# ============= 语料 =============
+
+
+def load_wav(path):
+    """
+    读取 16-bit PCM WAV，返回 16kHz 单声道 float32 数组.
+    """
+    with wave.open(str(path), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"仅支持 16-bit PCM WAV: {path}")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+    pcm = np.frombuffer(raw, dtype=np.int16).reshape(-1, channels)
+    samples = pcm.astype(np.float32).mean(axis=1) / 32768.0
+    if rate != SAMPLE_RATE:
+        samples = soxr.resample(samples, rate, SAMPLE_RATE, quality="HQ")
+    return np.ascontiguousarray(samples, dtype=np.float32)
+
+
+def load_corpus(directory):
+    """
+    递归加载目录下的所有 WAV，返回 [(相对路径, 样本)].
+    """
+    if not directory:
+        return []
+    root = Path(directory)
+    if not root.is_dir():
+        raise FileNotFoundError(f"语料目录不存在: {root}")
+    corpus = []
+    for path in sorted(root.rglob("*.wav")):
+        try:
+            corpus.append((str(path.relative_to(root)), load_wav(path)))
+        except (ValueError, wave.Error) as e:
+            print(f"跳过 {path}: {e}")
+    return corpus
+
+
+def speech_end(samples):
+    """
+    估计语音结束时刻（秒）.
+    """
+    block = SAMPLE_RATE // 100
+    count = len(samples) // block
+    if count == 0:
+        return len(samples) / SAMPLE_RATE
+    blocks = samples[: count * block].reshape(count, block).astype(np.float64)
+    levels = 10 * np.log10(np.mean(blocks * blocks, axis=1) + 1e-10)
+    threshold = max(levels.max() - SPEECH_END_DB, SPEECH_END_FLOOR_DB)
+    above = np.nonzero(levels >= threshold)[0]
+    if len(above) == 0:
+        return len(samples) / SAMPLE_RATE
+    return (above[-1] + 1) * block / SAMPLE_RATE
+
+
+# ============= 评测 =============
+
+
+def run_file(spotter, samples, frame, tail):
+    """逐帧送入一条音频，返回 ([(检出时刻秒, 关键词)], 解码耗时秒).
+
+    与 WakeWordDetector 相同：accept_waveform 后循环 decode_stream，检出后重置流。
+    末尾补 tail 个样本的静音，让模型输出尾随空白后给出结果。
+    """
+    stream = spotter.create_stream()
+    audio = np.concatenate([samples, np.zeros(tail, dtype=np.float32)])
+    detections = []
+    elapsed = 0.0
+    for offset in range(0, len(audio), frame):
+        chunk = audio[offset : offset + frame]
+        start = time.perf_counter()
+        stream.accept_waveform(sample_rate=SAMPLE_RATE, waveform=chunk)
+        while spotter.is_ready(stream):
+            spotter.decode_stream(stream)
+            result = spotter.get_result(stream)
+            if result:
+                spotter.reset_stream(stream)
+                detections.append(((offset + len(chunk)) / SAMPLE_RATE, result))
+        elapsed += time.perf_counter() - start
+    return detections, elapsed
+
+
+def percentiles(values):
+    """
+    p50/p90/max 摘要（毫秒）.
+    """
+    if not values:
+        return {"count": 0, "p50": None, "p90": None, "max": None}
+    data = np.asarray(values, dtype=np.float64)
+    return {
+        "count": len(data),
+        "p50": round(float(np.percentile(data, 50)), 1),
+        "p90": round(float(np.percentile(data, 90)), 1),
+        "max": round(float(data.max()), 1),
+    }
+
+
+def evaluate(spotter_options, positives, negatives, threads, frame_ms, tail_ms):
+    """
+    评测一种线程数 × 帧长组合.
+    """
+    load_start = time.perf_counter()
+    spotter = create_keyword_spotter(num_threads=threads, **spotter_options)
+    load_time = time.perf_counter() - load_start
+
+    frame = int(SAMPLE_RATE * frame_ms / 1000)
+    tail = int(SAMPLE_RATE * tail_ms / 1000)
+    decode_time = 0.0
+    audio_time = 0.0
+
+    detected = 0
+    latencies = []
+    keywords = Counter()
+    misses = []
+    for name, samples in positives:
+        detections, elapsed = run_file(spotter, samples, frame, tail)
+        decode_time += elapsed
+        audio_time += (len(samples) + tail) / SAMPLE_RATE
+        if detections:
+            detected += 1
+            first_time, keyword = detections[0]
+            keywords[keyword] += 1
+            latencies.append((first_time - speech_end(samples)) * 1000)
+        else:
+            misses.append(name)
+
+    false_accepts = []
+    negative_seconds = 0.0
+    for name, samples in negatives:
+        detections, elapsed = run_file(spotter, samples, frame, tail)
+        decode_time += elapsed
+        audio_time += (len(samples) + tail) / SAMPLE_RATE
+        negative_seconds += len(samples) / SAMPLE_RATE
+        false_accepts.extend(
+            {"file": name, "time_s": round(t, 2), "keyword": keyword}
+            for t, keyword in detections
+        )
+
+    negative_hours = negative_seconds / 3600
+    return {
+        "threads": threads,
+        "frame_ms": frame_ms,
+        "model_load_s": round(load_time, 3),
+        "positives": len(positives),
+        "detected": detected,
+        "detection_rate": round(detected / len(positives), 4) if positives else None,
+        "keywords": dict(keywords),
+        "misses": misses,
+        "negative_hours": round(negative_hours, 4),
+        "false_accepts": len(false_accepts),
+        "false_accepts_per_hour": (
+            round(len(false_accepts) / negative_hours, 3) if negative_hours else None
+        ),
+        "false_accept_details": false_accepts,
+        "latency_ms": percentiles(latencies),
+        "audio_s": round(audio_time, 2),
+        "decode_s": round(decode_time, 3),
+        "rtf": round(decode_time / audio_time, 4) if audio_time else None,
+    }
+
+
+def print_report(results, options):
+    print(
+        f"\n===== 唤醒词离线评测 | 模型 {options['model_dir']} | "
+        f"score {options['keywords_score']} | "
+        f"threshold {options['keywords_threshold']} | "
+        f"paths {options['max_active_paths']} | "
+        f"blanks {options['num_trailing_blanks']} =====\n"
+    )
+    print(
+        f"{'线程':>4} {'帧长ms':>6} {'检出率':>8} {'误唤醒/h':>9} "
+        f"{'延迟p50':>8} {'延迟p90':>8} {'RTF':>7}"
+    )
+
+    def fmt(value, spec):
+        return "-" if value is None else format(value, spec)
+
+    for r in results:
+        latency = r["latency_ms"]
+        print(
+            f"{r['threads']:>4} {r['frame_ms']:>6} "
+            f"{fmt(r['detection_rate'], '.1%'):>8} "
+            f"{fmt(r['false_accepts_per_hour'], '.2f'):>9} "
+            f"{fmt(latency['p50'], '.0f'):>8} {fmt(latency['p90'], '.0f'):>8} "
+            f"{fmt(r['rtf'], '.4f'):>7}"
+        )
+
+    first = results[0]
+    print(
+        f"\n正样本 {first['positives']} 条 | 负样本 {first['negative_hours']:.2f} 小时"
+    )
+    for r in results:
+        if r["misses"]:
+            print(
+                f"[{r['threads']}线程/{r['frame_ms']}ms] 漏检: "
+                + ", ".join(r["misses"][:10])
+                + (" ..." if len(r["misses"]) > 10 else "")
+            )
+
+
+def parse_int_list(text):
+    return [int(item) for item in text.split(",") if item.strip()]
+
+
+def main():
+    config = ConfigManager.get_instance()
+
+    def option(key, default):
+        return config.get_config(f"WAKE_WORD_OPTIONS.{key}", default)
+
+    parser = argparse.ArgumentParser(description="唤醒词离线评测（准确率与吞吐）")
+    parser.add_argument("--positive", help="正样本 WAV 目录（包含唤醒词）")
+    parser.add_argument("--negative", help="负样本 WAV 目录（不含唤醒词）")
+    parser.add_argument(
+        "--model-dir", default=option("MODEL_PATH", "models"), help="本地模型目录"
+    )
+    parser.add_argument(
+        "--threads", default=str(option("NUM_THREADS", 4)), help="线程数列表，如 1,2,4"
+    )
+    parser.add_argument(
+        "--frame-ms",
+        default=f"{AudioConfig.FRAME_DURATION},100",
+        help="每次送入的音频时长列表（毫秒），如 20,60,100",
+    )
+    parser.add_argument(
+        "--keywords-score", type=float, default=option("KEYWORDS_SCORE", 1.8)
+    )
+    parser.add_argument(
+        "--keywords-threshold", type=float, default=option("KEYWORDS_THRESHOLD", 0.2)
+    )
+    parser.add_argument(
+        "--max-active-paths", type=int, default=option("MAX_ACTIVE_PATHS", 2)
+    )
+    parser.add_argument(
+        "--num-trailing-blanks", type=int, default=option("NUM_TRAILING_BLANKS", 1)
+    )
+    parser.add_argument("--provider", default=option("PROVIDER", "cpu"))
+    parser.add_argument(
+        "--tail-ms", type=int, default=500, help="每条音频末尾补静音时长（毫秒）"
+    )
+    parser.add_argument("--json", help="把报告写入 JSON 文件")
+    args = parser.parse_args()
+
+    if not args.positive and not args.negative:
+        parser.error("至少需要 --positive 或 --negative 之一")
+
+    model_dir = resource_finder.find_directory(args.model_dir) or Path(args.model_dir)
+    positives = load_corpus(args.positive)
+    negatives = load_corpus(args.negative)
+    if not positives and not negatives:
+        print("语料目录中没有可用的 WAV 文件")
+        sys.exit(1)
+
+    spotter_options = {
+        "model_dir": model_dir,
+        "sample_rate": SAMPLE_RATE,
+        "provider": args.provider,
+        "max_active_paths": args.max_active_paths,
+        "keywords_score": args.keywords_score,
+        "keywords_threshold": args.keywords_threshold,
+        "num_trailing_blanks": args.num_trailing_blanks,
+    }
+
+    results = []
+    for threads in parse_int_list(args.threads):
+        for frame_ms in parse_int_list(args.frame_ms):
+            print(f"评测中: {threads} 线程 / {frame_ms}ms 帧 ...")
+            results.append(
+                evaluate(
+                    spotter_options,
+                    positives,
+                    negatives,
+                    threads,
+                    frame_ms,
+                    args.tail_ms,
+                )
+            )
+
+    options = dict(spotter_options, model_dir=str(model_dir))
+    print_report(results, options)
+
+    if args.json:
+        report = {"options": options, "results": results}
+        Path(args.json).write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import asyncio
 import sys
 import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import Any, Awaitable
+from typing import Any, Awaitable, Optional
 
 # 允许作为脚本直接运行：把项目根目录加入 sys.path（src 的上一级）
 try:
@@ -24,12 +26,16 @@ from src.plugins.web_server import WebServerPlugin
 from src.protocols.mqtt_protocol import MqttProtocol
 from src.protocols.websocket_protocol import WebsocketProtocol
 from src.utils.config_manager import ConfigManager
+from src.utils.latency_tracer import AUDIO_RX, SENTENCE_START, STT, LatencyTracer
 from src.utils.logging_config import get_logger
 from src.utils.opus_loader import setup_opus
 
 logger = get_logger(__name__)
 setup_opus()
 
+# 被打断回复的残余下行音频停顿超过该时长（秒）后，再到达的音频视为新的回复
+ABORTED_AUDIO_GAP = 0.5
+
 
 class Application:
     _instance = None
@@ -69,10 +75,26 @@ class Application:
             ListeningMode.REALTIME if self.aec_enabled else ListeningMode.AUTO_STOP
         )
         self.keep_listening = False
+        self.aborted = False
+
+        # 音频编解码器（由音频插件初始化后设置）
+        self.audio_codec = None
 
         # 统一任务池（替代 _main_tasks/_bg_tasks）
         self._tasks: set[asyncio.Task] = set()
 
+        # 下行音频分发：按序排队，由单个任务批量转发给插件（避免每包一个任务）
+        self._incoming_audio: deque[tuple[bytes, Optional[int]]] = deque()
+        self._incoming_audio_task: asyncio.Task | None = None
+        # 回复代次：新回复开始（stt / tts start）时递增；打断时记下被中止的代次，
+        # 只丢弃属于该回复的残余下行音频
+        self._reply_generation = 0
+        self._aborted_generation: int | None = None
+        self._aborted_audio_at = 0.0
+
+        # 端到端延迟追踪（说话结束 → 首个 TTS 样本播放）
+        self._tracer = LatencyTracer.get_instance()
+
         # 关停事件
         self._shutdown_event: asyncio.Event | None = None
 
@@ -290,15 +312,54 @@ class Application:
         # if self._shutdown_event and not self._shutdown_event.is_set():
         #     self._shutdown_event.set()
 
-    def _on_incoming_audio(self, data: bytes):
+    def _on_incoming_audio(self, data: bytes, sequence: Optional[int] = None):
         logger.debug(f"收到二进制消息，长度: {len(data)}")
-        # 转发给插件
-        self.spawn(self.plugins.notify_incoming_audio(data), "plugin:on_audio")
+        if self._is_aborted_reply_audio():
+            return
+        self._tracer.mark(AUDIO_RX)
+        # 转发给插件：突发到达的包合并到同一个分发任务，保证包序
+        self._incoming_audio.append((data, sequence))
+        if self._incoming_audio_task is None or self._incoming_audio_task.done():
+            self._incoming_audio_task = self.spawn(
+                self._dispatch_incoming_audio(), "plugin:on_audio"
+            )
+            if self._incoming_audio_task is None:
+                self._incoming_audio.clear()
+
+    async def _dispatch_incoming_audio(self):
+        """
+        依次把排队的下行音频转发给插件，直到队列为空.
+        """
+        while self._incoming_audio:
+            data, sequence = self._incoming_audio.popleft()
+            await self.plugins.notify_incoming_audio(data, sequence)
+
+    def _is_aborted_reply_audio(self) -> bool:
+        """
+        判断下行音频是否属于被打断的回复.
+
+        MQTT 下 UDP 音频与 JSON 控制消息分路到达，新回复的首包可能早于其 tts start，
+        因此丢弃不能只靠 tts start 结束：进入新回复代次后不再丢弃；被中止回复的残余
+        音频是打断后连续到达的一段，停顿超过 ABORTED_AUDIO_GAP 后到达的音频属于新回复.
+        """
+        if self._aborted_generation != self._reply_generation:
+            return False
+        now = time.monotonic()
+        if now - self._aborted_audio_at > ABORTED_AUDIO_GAP:
+            self._aborted_generation = None
+            return False
+        self._aborted_audio_at = now
+        return True
 
     def _on_incoming_json(self, json_data):
         try:
             msg_type = json_data.get("type") if isinstance(json_data, dict) else None
             logger.info(f"收到JSON消息: type={msg_type}")
+            self._trace_incoming_json(msg_type, json_data)
+            if msg_type == "stt" or (
+                msg_type == "tts" and json_data.get("state") == "start"
+            ):
+                self._reply_generation += 1
             # 将 TTS start/stop 映射为设备状态（支持自动/实时，且不污染手动模式）
             if msg_type == "tts":
                 state = json_data.get("state")
@@ -348,6 +409,21 @@ class Application:
         except Exception:
             logger.info("收到JSON消息")
 
+    def _trace_incoming_json(self, msg_type, json_data) -> None:
+        """
+        端到端延迟打点：stt、tts start/sentence_start，tts stop 时结算本轮.
+        """
+        if msg_type == "stt":
+            self._tracer.mark(STT)
+        elif msg_type == "tts":
+            state = json_data.get("state")
+            if state == "start":
+                self._tracer.begin_response()
+            elif state == "sentence_start":
+                self._tracer.mark(SENTENCE_START)
+            elif state == "stop":
+                self._tracer.end_turn()
+
     async def _on_audio_channel_opened(self):
         logger.info("协议通道已打开")
         # 通道打开后进入 LISTENING（：简化为直读直写）
@@ -444,6 +520,14 @@ class Application:
 
         logger.info(f"中止语音输出，原因: {reason}")
         self.aborted = True
+
+        # 先在本地立即打断播放，不等待网络往返和状态广播
+        self._aborted_generation = self._reply_generation
+        self._aborted_audio_at = time.monotonic()
+        self._incoming_audio.clear()
+        if self.audio_codec:
+            self.audio_codec.interrupt_playback()
+
         await self.protocol.send_abort_speaking(reason)
         await self.set_device_state(DeviceState.IDLE)
 
@@ -1,15 +1,27 @@
 import platform
-from collections import deque
 from typing import Any, Dict, Optional
 
 import numpy as np
 import sounddevice as sd
 
+from src.audio_codecs.resampler import (
+    DEFAULT_RESAMPLE_PROFILE,
+    create_resampler,
+    describe_resampler,
+)
+from src.audio_codecs.ring_buffer import AudioRingBuffer
 from src.constants.constants import AudioConfig
+from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# 交给 APM 的回声路径延迟（毫秒）：
+# 未对齐的参考（BlackHole 环回）按经验值估计；
+# 播放参考已在 _get_reference_chunks 中按实测输出延迟手动对齐，剩余延迟约为 0
+UNALIGNED_STREAM_DELAY_MS = 40
+ALIGNED_STREAM_DELAY_MS = 0
+
 
 class AECProcessor:
     """
@@ -23,7 +35,12 @@ class AECProcessor:
         self._is_linux = self._platform == "linux"
         self._is_windows = self._platform == "windows"
 
-        # WebRTC APM 实例（仅 macOS 使用）
+        # Linux 软件AEC（无系统级回声消除时，以本进程播放音频作为参考信号）
+        self._linux_software_aec = bool(
+            ConfigManager.get_instance().get_config("AEC_OPTIONS.SOFTWARE_AEC", False)
+        )
+
+        # WebRTC APM 实例（macOS，或启用软件AEC的 Linux）
         self.apm = None
         self.apm_config = None
         self.capture_config = None
@@ -34,14 +51,29 @@ class AECProcessor:
         self.reference_device_id = None
         self.reference_sample_rate = None
 
-        # 参考信号重采样器（仅 macOS 使用）
+        # 参考信号重采样器（BlackHole 或播放参考 → 16kHz）
         self.reference_resampler = None
-        self._resample_reference_buffer = deque()
+
+        # 播放参考（进程内抽头）：输出回调把实际播放的单声道帧送入参考缓冲区
+        self._use_playback_reference = False
+        self._reference_delay_samples = 0
+        self._playback_reference_frame: Optional[np.ndarray] = None
 
         # 缓冲区
-        self._reference_buffer = deque()
         self._webrtc_frame_size = 160  # WebRTC标准：16kHz, 10ms = 160 samples
         self._system_frame_size = AudioConfig.INPUT_FRAME_SIZE  # 系统配置的帧大小
+        self._max_reference_samples = self._webrtc_frame_size * 20  # 约200ms
+
+        # 参考信号环形缓冲区：参考流线程写入，输入回调线程读取（SPSC）
+        # 重采样输出直接写入，无需再经过中间缓冲逐样本搬运
+        self._reference_buffer = AudioRingBuffer(
+            self._max_reference_samples * 2, dtype=np.int16
+        )
+        self._reference_frame = np.zeros(self._system_frame_size, dtype=np.int16)
+
+        # AEC 输出和反向流输出暂存（预分配，APM 直接写入）
+        self._aec_output = np.zeros(self._system_frame_size, dtype=np.int16)
+        self._reverse_scratch = np.zeros(self._webrtc_frame_size, dtype=np.int16)
 
         # 状态标志
         self._is_initialized = False
@@ -52,7 +84,12 @@ class AECProcessor:
         初始化AEC处理器.
         """
         try:
-            if self._is_windows or self._is_linux:
+            if self._is_linux and self._linux_software_aec:
+                # Linux 软件AEC：WebRTC APM + 本进程播放音频作为参考信号
+                await self._initialize_apm()
+                self._use_playback_reference = True
+                logger.info("Linux 平台启用软件回声消除（播放参考抽头）")
+            elif self._is_windows or self._is_linux:
                 # Windows 和 Linux 平台使用系统级AEC，无需额外处理
                 logger.info(
                     f"{self._platform.capitalize()} 平台使用系统级回声消除，AEC处理器已启用"
@@ -63,6 +100,10 @@ class AECProcessor:
                 # macOS 平台使用 WebRTC + BlackHole
                 await self._initialize_apm()
                 await self._initialize_reference_capture()
+                if self.reference_stream is None:
+                    # 没有 BlackHole 时退回到进程内播放参考
+                    self._use_playback_reference = True
+                    logger.info("未使用 BlackHole，改用播放参考抽头作为AEC参考信号")
             else:
                 logger.warning(f"当前平台 {self._platform} 暂不支持AEC功能")
                 self._is_initialized = True
@@ -78,10 +119,10 @@ class AECProcessor:
 
     async def _initialize_apm(self):
         """
-        初始化WebRTC音频处理模块（仅macOS）
+        初始化WebRTC音频处理模块（macOS，或启用软件AEC的 Linux）
         """
-        if not self._is_macos:
-            logger.warning("非macOS平台调用了_initialize_apm，这不应该发生")
+        if not (self._is_macos or self._is_linux):
+            logger.warning(f"{self._platform} 平台不支持 WebRTC APM")
             return
 
         try:
@@ -119,7 +160,7 @@ class AECProcessor:
             self.render_config = self.apm.create_stream_config(sample_rate, channels)
 
             # 设置流延迟
-            self.apm.set_stream_delay_ms(40)  # 50ms延迟
+            self.apm.set_stream_delay_ms(UNALIGNED_STREAM_DELAY_MS)
 
             logger.info("WebRTC APM初始化完成")
 
@@ -144,19 +185,24 @@ class AECProcessor:
             self.reference_device_id = reference_device["id"]
             self.reference_sample_rate = int(reference_device["default_samplerate"])
 
-            # 创建高质量重采样器（如需要）
+            # 创建重采样器（如需要），档位与AudioCodec一致
             if self.reference_sample_rate != AudioConfig.INPUT_SAMPLE_RATE:
-                import soxr
-
-                self.reference_resampler = soxr.ResampleStream(
+                config = ConfigManager.get_instance()
+                profile = config.get_config(
+                    "AUDIO_DEVICES.RESAMPLE_PROFILE", DEFAULT_RESAMPLE_PROFILE
+                )
+                self.reference_resampler = create_resampler(
                     self.reference_sample_rate,
                     AudioConfig.INPUT_SAMPLE_RATE,
-                    num_channels=1,
                     dtype="int16",
-                    quality="QQ",  # 快速质量，与AudioCodec一致
+                    profile=profile,
+                    integer_fast_path=config.get_config(
+                        "AUDIO_DEVICES.RESAMPLE_INTEGER_FAST_PATH", False
+                    ),
                 )
                 logger.info(
-                    f"参考信号重采样: {self.reference_sample_rate}Hz → {AudioConfig.INPUT_SAMPLE_RATE}Hz (使用soxr)"
+                    f"参考信号重采样: {self.reference_sample_rate}Hz → {AudioConfig.INPUT_SAMPLE_RATE}Hz "
+                    f"({describe_resampler(self.reference_resampler)}, {profile})"
                 )
 
             # 创建参考信号输入流（固定使用10ms帧，匹配WebRTC标准）
@@ -232,33 +278,19 @@ class AECProcessor:
             return
 
         try:
-            audio_data = indata.copy().flatten()
+            # 单声道 int16，reshape 为视图，拷贝由环形缓冲区完成
+            audio_data = indata.reshape(-1)
 
-            # 使用soxr高质量重采样
+            # 重采样到16kHz（soxr 或整数倍多相FIR）
             if self.reference_resampler:
-                # 重采样到16kHz
                 resampled_data = self.reference_resampler.resample_chunk(
                     audio_data, last=False
                 )
                 if len(resampled_data) > 0:
-                    self._resample_reference_buffer.extend(
-                        resampled_data.astype(np.int16)
-                    )
-
-                # 从缓冲区提取WebRTC标准帧
-                while len(self._resample_reference_buffer) >= self._webrtc_frame_size:
-                    for _ in range(self._webrtc_frame_size):
-                        self._reference_buffer.append(
-                            self._resample_reference_buffer.popleft()
-                        )
+                    self._reference_buffer.write(resampled_data)
             else:
                 # 无需重采样，直接使用
-                self._reference_buffer.extend(audio_data)
-
-            # 保持缓冲区大小合理
-            max_buffer_size = self._webrtc_frame_size * 20  # 保持约200ms的数据
-            while len(self._reference_buffer) > max_buffer_size:
-                self._reference_buffer.popleft()
+                self._reference_buffer.write(audio_data)
 
         except Exception as e:
             logger.error(f"参考信号回调错误: {e}")
@@ -281,12 +313,8 @@ class AECProcessor:
         if not self._is_initialized:
             return capture_audio
 
-        # Windows 和 Linux 平台直接返回原始音频（系统级处理）
-        if self._is_windows or self._is_linux:
-            return capture_audio
-
-        # macOS 平台使用 WebRTC AEC 处理
-        if not self._is_macos or self.apm is None:
+        # 未创建 APM（Windows / 系统级AEC 的 Linux）直接返回原始音频
+        if not self.is_active:
             return capture_audio
 
         try:
@@ -297,108 +325,152 @@ class AECProcessor:
                 )
                 return capture_audio
 
-            # 计算需要分割的块数
-            num_chunks = len(capture_audio) // self._webrtc_frame_size
-
-            if num_chunks == 1:
-                # 10ms帧，直接处理
-                return self._process_single_aec_frame(capture_audio)
-            else:
-                # 20ms/40ms/60ms帧，分割处理
-                return self._process_chunked_aec_frames(capture_audio, num_chunks)
+            return self._process_aec_frames(capture_audio)
 
         except Exception as e:
             logger.error(f"AEC处理失败: {e}")
             return capture_audio
 
-    def _process_single_aec_frame(self, capture_audio: np.ndarray) -> np.ndarray:
-        """
-        处理单个10ms WebRTC帧（仅macOS）
+    def _process_aec_frames(self, capture_audio: np.ndarray) -> np.ndarray:
+        """批量处理整帧（10ms/20ms/40ms/60ms，按 10ms 分块，一次调用完成）.
+
+        采集、参考、输出均为预分配 int16 数组，通过数据地址直接传给 APM，
+        不再逐样本构造 ctypes 数组，也不再拼接分块结果。
         """
-        if not self._is_macos:
+        total = len(capture_audio)
+        if len(self._aec_output) != total:
+            self._aec_output = np.zeros(total, dtype=np.int16)
+
+        capture = np.ascontiguousarray(capture_audio, dtype=np.int16)
+        reference = self._get_reference_chunks(total)
+
+        render_result, capture_result = self.apm.process_frames(
+            capture,
+            reference,
+            self.capture_config,
+            self.render_config,
+            self._aec_output,
+            self._webrtc_frame_size,
+            reverse_scratch=self._reverse_scratch,
+        )
+
+        if render_result != 0:
+            logger.warning(f"参考信号处理失败，错误码: {render_result}")
+
+        if capture_result != 0:
+            logger.warning(f"采集信号处理失败，错误码: {capture_result}")
             return capture_audio
 
-        try:
-            # 仅在macOS导入ctypes
-            import ctypes
+        return self._aec_output
 
-            # 获取参考信号
-            reference_audio = self._get_reference_frame(self._webrtc_frame_size)
-
-            # 创建ctypes缓冲区
-            capture_buffer = (ctypes.c_short * self._webrtc_frame_size)(*capture_audio)
-            reference_buffer = (ctypes.c_short * self._webrtc_frame_size)(
-                *reference_audio
-            )
-
-            processed_capture = (ctypes.c_short * self._webrtc_frame_size)()
-            processed_reference = (ctypes.c_short * self._webrtc_frame_size)()
-
-            # 首先处理参考信号（render stream）
-            render_result = self.apm.process_reverse_stream(
-                reference_buffer,
-                self.render_config,
-                self.render_config,
-                processed_reference,
-            )
+    def _get_reference_chunks(self, total: int) -> np.ndarray:
+        """获取与采集帧等长的参考信号.
 
-            if render_result != 0:
-                logger.warning(f"参考信号处理失败，错误码: {render_result}")
-
-            # 然后处理采集信号（capture stream）
-            capture_result = self.apm.process_stream(
-                capture_buffer,
-                self.capture_config,
-                self.capture_config,
-                processed_capture,
-            )
-
-            if capture_result != 0:
-                logger.warning(f"采集信号处理失败，错误码: {capture_result}")
-                return capture_audio
-
-            # 转换回numpy数组
-            return np.array(processed_capture, dtype=np.int16)
-
-        except Exception as e:
-            logger.error(f"AEC帧处理失败: {e}")
-            return capture_audio
-
-    def _process_chunked_aec_frames(
-        self, capture_audio: np.ndarray, num_chunks: int
-    ) -> np.ndarray:
+        以固定偏移读取：参考帧对应写位置之前 _reference_delay_samples（输出延迟）处
+        结束的 total 个样本，更早的样本全部丢弃，参考与采集的对齐不随积压漂移；
+        历史不足时在帧首补静音。
         """
-        分割处理大帧（20ms/40ms/60ms等）
+        frame = self._reference_frame
+        if len(frame) != total:
+            frame = self._reference_frame = np.zeros(total, dtype=np.int16)
+
+        buffer = self._reference_buffer
+        lag = self._reference_delay_samples
+        available = buffer.available()
+
+        # 丢弃早于 [写位置 - lag - total] 的样本（由消费者侧完成以保证SPSC）
+        excess = available - lag - total
+        if excess > 0:
+            buffer.skip(excess)
+            available -= excess
+
+        readable = min(max(available - lag, 0), total)
+        missing = total - readable
+        frame[:missing] = 0
+        if readable > 0:
+            buffer.read_into(frame[missing:])
+        return frame
+
+    @property
+    def is_active(self) -> bool:
         """
-        processed_chunks = []
-
-        for i in range(num_chunks):
-            # 提取当前10ms块
-            start_idx = i * self._webrtc_frame_size
-            end_idx = (i + 1) * self._webrtc_frame_size
-            chunk = capture_audio[start_idx:end_idx]
+        是否在进程内执行 WebRTC AEC（否则为系统级处理或未启用）.
+        """
+        return self._is_initialized and self.apm is not None
 
-            # 处理这个10ms块
-            processed_chunk = self._process_single_aec_frame(chunk)
-            processed_chunks.append(processed_chunk)
+    @property
+    def uses_playback_reference(self) -> bool:
+        """
+        是否需要 AudioCodec 提供播放参考抽头.
+        """
+        return self.is_active and self._use_playback_reference
 
-        # 将所有处理后的块重新组合
-        return np.concatenate(processed_chunks)
+    def enable_playback_reference(self, sample_rate: int, delay_ms: float):
+        """启用进程内播放参考（在输出流创建之后、安装抽头之前调用）.
 
-    def _get_reference_frame(self, frame_size: int) -> np.ndarray:
+        Args:
+            sample_rate: 抽头送入的单声道 float32 数据的采样率（输出设备采样率）
+            delay_ms: 输出延迟（交给 PortAudio 到扬声器发声的时间），用于时间对齐
         """
-        获取指定大小的参考信号帧.
+        if sample_rate != AudioConfig.INPUT_SAMPLE_RATE:
+            config = ConfigManager.get_instance()
+            profile = config.get_config(
+                "AUDIO_DEVICES.RESAMPLE_PROFILE", DEFAULT_RESAMPLE_PROFILE
+            )
+            self.reference_resampler = create_resampler(
+                sample_rate,
+                AudioConfig.INPUT_SAMPLE_RATE,
+                dtype="float32",
+                profile=profile,
+                integer_fast_path=config.get_config(
+                    "AUDIO_DEVICES.RESAMPLE_INTEGER_FAST_PATH", False
+                ),
+            )
+        else:
+            self.reference_resampler = None
+
+        self._reference_delay_samples = int(
+            max(delay_ms, 0) * AudioConfig.INPUT_SAMPLE_RATE / 1000
+        )
+        # 容量需覆盖对齐滞后 + 最大积压
+        self._reference_buffer = AudioRingBuffer(
+            self._reference_delay_samples + self._max_reference_samples * 2,
+            dtype=np.int16,
+        )
+        self._playback_reference_frame = np.zeros(
+            self._system_frame_size * 4, dtype=np.float32
+        )
+        # 输出延迟已由参考读取偏移补偿，APM 只需处理对齐后的剩余延迟
+        if self.apm is not None:
+            self.apm.set_stream_delay_ms(ALIGNED_STREAM_DELAY_MS)
+        logger.info(
+            f"AEC播放参考已启用: {sample_rate}Hz → 16kHz, 对齐延迟 {delay_ms:.1f}ms"
+        )
+
+    def feed_playback_reference(self, mono: np.ndarray):
+        """送入一帧实际播放的音频（输出回调线程调用，与采集侧构成 SPSC）.
+
+        Args:
+            mono: 单声道 float32 数据（设备采样率，静音时也应送入以保持时间轴连续）
         """
-        # 如果没有参考信号或缓冲区不足，返回静音
-        if len(self._reference_buffer) < frame_size:
-            return np.zeros(frame_size, dtype=np.int16)
+        if self._is_closing:
+            return
 
-        # 从缓冲区提取一帧
-        frame_data = []
-        for _ in range(frame_size):
-            frame_data.append(self._reference_buffer.popleft())
+        data = mono
+        if self.reference_resampler is not None:
+            data = self.reference_resampler.resample_chunk(mono, last=False)
+
+        count = len(data)
+        if count == 0:
+            return
+        if len(self._playback_reference_frame) < count:
+            self._playback_reference_frame = np.zeros(count, dtype=np.float32)
 
-        return np.array(frame_data, dtype=np.int16)
+        # float32 → int16：在预分配缓冲区内缩放限幅，写入环形缓冲区时截断取整
+        scaled = self._playback_reference_frame[:count]
+        np.multiply(data, 32767.0, out=scaled)
+        np.clip(scaled, -32768.0, 32767.0, out=scaled)
+        self._reference_buffer.write(scaled)
 
     async def close(self):
         """
@@ -411,8 +483,8 @@ class AECProcessor:
         logger.info("开始关闭AEC处理器...")
 
         try:
-            # 仅在 macOS 平台清理 WebRTC 相关资源
-            if self._is_macos:
+            # 清理 WebRTC 相关资源（macOS，或启用软件AEC的 Linux）
+            if self._is_macos or self.apm is not None:
                 # 停止参考信号流
                 if self.reference_stream:
                     try:
@@ -450,7 +522,6 @@ class AECProcessor:
 
             # 清理缓冲区
             self._reference_buffer.clear()
-            self._resample_reference_buffer.clear()
 
             self._is_initialized = False
             logger.info("AEC处理器已关闭")
@@ -1,26 +1,57 @@
 import asyncio
 import gc
+import time
 from collections import deque
+from pathlib import Path
 from typing import Callable, List, Optional, Protocol
 
 import numpy as np
 import opuslib
 import sounddevice as sd
-import soxr
 
 from src.audio_codecs.aec_processor import AECProcessor
+from src.audio_codecs.capture_pipeline import CapturePipeline
+from src.audio_codecs.decode_worker import OpusDecodeWorker
+from src.audio_codecs.encoder_controller import OpusEncoderController
+from src.audio_codecs.frame_bus import DROP_OLDEST, AudioFrameBus, FrameSubscription
+from src.audio_codecs.jitter_buffer import OpusJitterBuffer
+from src.audio_codecs.playback_buffer import PlaybackBuffer
+from src.audio_codecs.resampler import (
+    DEFAULT_RESAMPLE_PROFILE,
+    create_resampler,
+    describe_resampler,
+)
+from src.audio_codecs.ring_buffer import AudioRingBuffer
+from src.audio_codecs.session_recorder import FORMAT_OPUS, SessionRecorder
+from src.audio_codecs.vad_gate import VoiceActivityGate
 from src.constants.constants import AudioConfig
 from src.utils.audio_utils import (
-    downmix_to_mono,
-    safe_queue_put,
+    downmix_to_mono_into,
+    probe_sample_rate,
     select_audio_device,
-    upmix_mono_to_channels,
+    upmix_mono_into,
 )
 from src.utils.config_manager import ConfigManager
+from src.utils.latency_tracer import (
+    DECODE_FIRST,
+    PLAYBACK_FIRST,
+    SPEECH_LAST,
+    LatencyTracer,
+)
 from src.utils.logging_config import get_logger
+from src.utils.resource_finder import get_project_root
 
 logger = get_logger(__name__)
 
+# 播放缓冲区最大时长（毫秒）
+PLAYBACK_BUFFER_MS = 10000
+
+# 打断播放时的淡出时长（毫秒），避免硬截断产生爆音
+INTERRUPT_FADE_MS = 5
+
+# 采集帧总线容量（毫秒），订阅者最多可积压接近此时长的音频
+FRAME_BUS_MS = 4000
+
 
 class AudioListener(Protocol):
     """
@@ -28,8 +59,10 @@ class AudioListener(Protocol):
     """
 
     def on_audio_data(self, audio_data: np.ndarray) -> None:
-        """
-        接收音频数据的回调.
+        """接收音频数据的回调（在采集线程中同步调用）.
+
+        audio_data 是帧总线槽位的只读视图，所有监听器共享同一份数据，
+        需要在回调返回后继续使用时请自行拷贝；耗时处理请改用 subscribe_frames()。
         """
         ...
 
@@ -66,6 +99,7 @@ class AudioCodec:
         # Opus编解码器
         self.opus_encoder = None
         self.opus_decoder = None
+        self._encoder_controller: Optional[OpusEncoderController] = None
 
         # 设备原生信息
         self.device_input_sample_rate = None
@@ -79,9 +113,19 @@ class AudioCodec:
         self.input_resampler = None
         self.output_resampler = None
 
-        # 重采样缓冲区
-        self._resample_input_buffer = deque()
-        self._resample_output_buffer = deque()
+        # 重采样缓冲区（预分配环形缓冲区，按需在 _create_resamplers 中创建）
+        self._resample_input_buffer: Optional[AudioRingBuffer] = None
+        self._resample_output_buffer: Optional[AudioRingBuffer] = None
+        self._input_frame: Optional[np.ndarray] = None
+        self._output_mono_frame: Optional[np.ndarray] = None
+
+        # 回调临时缓冲区（预分配，回调内原地计算不再分配内存）
+        self._input_mono_frame: Optional[np.ndarray] = None
+        self._capture_mono_batch: Optional[np.ndarray] = None
+        self._capture_float_frame: Optional[np.ndarray] = None
+        self._capture_int16_frame: Optional[np.ndarray] = None
+        self._output_float_frame: Optional[np.ndarray] = None
+        self._output_convert_frame: Optional[np.ndarray] = None
 
         # 转换标记
         self._need_input_downmix = False
@@ -95,17 +139,65 @@ class AudioCodec:
         self.input_stream = None
         self.output_stream = None
 
-        # 播放队列
-        self._output_buffer = asyncio.Queue(maxsize=500)
+        # 采集流水线模式：回调只拷贝原始帧，工作线程负责重采样/AEC/编码/分发
+        self._capture_pipeline: Optional[CapturePipeline] = None
+        self._capture_frame_ring: Optional[AudioRingBuffer] = None
+        self._capture_frame: Optional[np.ndarray] = None
+
+        # 播放队列（跨线程：事件循环写入，输出回调读取）
+        self._output_buffer = PlaybackBuffer(
+            AudioConfig.OUTPUT_SAMPLE_RATE, PLAYBACK_BUFFER_MS
+        )
+
+        # 接收抖动缓冲区（解码前，自适应深度 + FEC/PLC 丢包隐藏）
+        self._jitter_buffer = OpusJitterBuffer(AudioConfig.FRAME_DURATION)
+        self._jitter_timer: Optional[asyncio.TimerHandle] = None
+
+        # 解码工作线程（批量解码后写入播放队列）
+        self._decode_worker: Optional[OpusDecodeWorker] = None
+
+        # 打断播放：事件循环递增播放代数，输出回调检测到变化后淡出并复位回调侧缓冲
+        self._playback_generation = 0
+        self._output_generation = 0
+        self._interrupt_started: Optional[float] = None
+        self._interrupt_latencies: deque = deque(maxlen=50)
+        # 清空输入重采样缓冲区：同样由事件循环递增代数，输入回调检测到后自行清空
+        self._input_clear_generation = 0
+        self._input_generation = 0
+        self._last_output = np.zeros(1, dtype=np.float32)
+        self._fade_ramp: Optional[np.ndarray] = None
+
+        # 上行语音门限（VAD_OPTIONS.UPLINK_GATE），由上层按监听模式开关
+        self._vad_gate: Optional[VoiceActivityGate] = None
+        self._vad_gate_active = False
 
         # 回调和监听器（解耦外部依赖）
         self._encoded_callback: Optional[Callable] = None
         self._audio_listeners: List[AudioListener] = []
 
+        # 采集帧总线：处理后的 16kHz int16 帧每帧只拷贝一次，监听器和订阅者共享
+        self.frame_bus = AudioFrameBus(
+            AudioConfig.INPUT_FRAME_SIZE,
+            capacity=max(4, FRAME_BUS_MS // AudioConfig.FRAME_DURATION),
+        )
+
         # 音频处理器（可选注入）
         self.audio_processor = audio_processor
         self._aec_enabled = False
 
+        # AEC 播放参考抽头：输出回调把实际播放的单声道帧送给 AEC（软件AEC模式）
+        self._reference_tap: Optional[Callable[[np.ndarray], None]] = None
+        self._silence_frame: Optional[np.ndarray] = None
+
+        # 会话录音（RECORDER.ENABLED）：opus 格式记录收发的编码包，
+        # pcm 格式作为监听器记录麦克风帧、作为播放抽头记录实际播放的音频
+        self._recorder: Optional[SessionRecorder] = None
+        self._packet_recorder: Optional[SessionRecorder] = None
+        self._playback_tap: Optional[Callable[[Optional[np.ndarray], int], None]] = None
+
+        # 端到端延迟追踪（输出回调记录首帧播放时刻）
+        self._tracer = LatencyTracer.get_instance()
+
         # 状态标记
         self._is_closing = False
 
@@ -128,6 +220,18 @@ class AudioCodec:
             # 创建重采样器和转换标记
             await self._create_resamplers()
 
+            # 预分配回调临时缓冲区
+            self._create_scratch_buffers()
+
+            # 创建上行语音门限（可选）
+            self._create_vad_gate()
+
+            # 创建会话录音（可选）
+            self._create_recorder()
+
+            # 创建采集流水线（可选）
+            self._create_capture_pipeline()
+
             # 创建音频流（使用设备原生格式）
             await self._create_streams()
 
@@ -135,6 +239,7 @@ class AudioCodec:
             if self.audio_processor:
                 try:
                     await self.audio_processor.initialize()
+                    self._install_reference_tap()
                     self._aec_enabled = self.audio_processor._is_initialized
                     logger.info(
                         f"AEC处理器已初始化: {'启用' if self._aec_enabled else '禁用'}"
@@ -177,6 +282,18 @@ class AudioCodec:
         self.input_channels = audio_config.get("input_channels", 1)
         self.output_channels = audio_config.get("output_channels", 1)
 
+        # 协商协议采样率（已探测过的设备直接命中缓存）
+        if self._negotiate_native_rates(
+            audio_config.get("input_device_name"),
+            audio_config.get("output_device_name"),
+        ):
+            self.config.update_config(
+                "AUDIO_DEVICES.input_sample_rate", self.device_input_sample_rate
+            )
+            self.config.update_config(
+                "AUDIO_DEVICES.output_sample_rate", self.device_output_sample_rate
+            )
+
         # 计算设备帧大小
         self._device_input_frame_size = int(
             self.device_input_sample_rate * (AudioConfig.FRAME_DURATION / 1000)
@@ -214,6 +331,9 @@ class AudioCodec:
         self.device_input_sample_rate = in_info["sample_rate"]
         self.device_output_sample_rate = out_info["sample_rate"]
 
+        # 设备支持协议采样率时直接使用，省去重采样
+        self._negotiate_native_rates(in_info["name"], out_info["name"])
+
         # 计算帧大小
         self._device_input_frame_size = int(
             self.device_input_sample_rate * (AudioConfig.FRAME_DURATION / 1000)
@@ -256,6 +376,72 @@ class AudioCodec:
         )
         self.config.update_config("AUDIO_DEVICES.output_channels", self.output_channels)
 
+    def _negotiate_native_rates(
+        self, input_name: Optional[str], output_name: Optional[str]
+    ) -> bool:
+        """优先以协议采样率（16kHz 输入 / 24kHz 输出）打开设备.
+
+        用 sd.check_input_settings/check_output_settings 探测设备是否原生支持协议采样率，
+        结果按设备名缓存在 AUDIO_DEVICES.RATE_PROBE_CACHE，之后启动不再重复探测。
+
+        Returns:
+            bool: 采样率是否有变化
+        """
+        if not self.config.get_config("AUDIO_DEVICES.NATIVE_RATE_NEGOTIATION", True):
+            return False
+
+        cache = dict(self.config.get_config("AUDIO_DEVICES.RATE_PROBE_CACHE", {}) or {})
+        cache_changed = False
+
+        def negotiate(kind, device_id, name, channels, current_rate, protocol_rate):
+            nonlocal cache_changed
+            if current_rate == protocol_rate:
+                return current_rate
+            entries = cache.setdefault(kind, {}).setdefault(name or str(device_id), {})
+            supported = entries.get(str(protocol_rate))
+            if supported is None:
+                supported = probe_sample_rate(kind, device_id, channels, protocol_rate)
+                entries[str(protocol_rate)] = supported
+                cache_changed = True
+                logger.info(
+                    f"探测{'输入' if kind == 'input' else '输出'}设备 {name} "
+                    f"{protocol_rate}Hz: {'支持' if supported else '不支持'}"
+                )
+            return protocol_rate if supported else current_rate
+
+        input_rate = negotiate(
+            "input",
+            self.mic_device_id,
+            input_name,
+            self.input_channels,
+            self.device_input_sample_rate,
+            AudioConfig.INPUT_SAMPLE_RATE,
+        )
+        output_rate = negotiate(
+            "output",
+            self.speaker_device_id,
+            output_name,
+            self.output_channels,
+            self.device_output_sample_rate,
+            AudioConfig.OUTPUT_SAMPLE_RATE,
+        )
+
+        if cache_changed:
+            self.config.update_config("AUDIO_DEVICES.RATE_PROBE_CACHE", cache)
+
+        changed = (
+            input_rate != self.device_input_sample_rate
+            or output_rate != self.device_output_sample_rate
+        )
+        if changed:
+            logger.info(
+                f"使用协议采样率打开设备 | 输入: {self.device_input_sample_rate}Hz → "
+                f"{input_rate}Hz | 输出: {self.device_output_sample_rate}Hz → {output_rate}Hz"
+            )
+        self.device_input_sample_rate = input_rate
+        self.device_output_sample_rate = output_rate
+        return changed
+
     async def _create_opus_codecs(self):
         """
         创建Opus编解码器.
@@ -267,21 +453,58 @@ class AudioCodec:
                 AudioConfig.CHANNELS,
                 opuslib.APPLICATION_VOIP,
             )
+            self._create_encoder_controller()
 
             # 输出解码器：24kHz单声道
             self.opus_decoder = opuslib.Decoder(
                 AudioConfig.OUTPUT_SAMPLE_RATE, AudioConfig.CHANNELS
             )
 
+            # 解码器此后只在解码工作线程中使用
+            self._decode_worker = OpusDecodeWorker(
+                self.opus_decoder, AudioConfig.OUTPUT_FRAME_SIZE, self._output_buffer
+            )
+            self._decode_worker.start()
+
             logger.info("Opus编解码器创建成功")
         except Exception as e:
             logger.error(f"创建Opus编解码器失败: {e}")
             raise
 
+    def _create_encoder_controller(self):
+        """
+        按配置（OPUS_ENCODER）设置编码参数并创建自适应控制器.
+        """
+        encoder_config = self.config.get_config("OPUS_ENCODER", {}) or {}
+        self._encoder_controller = OpusEncoderController(
+            self.opus_encoder,
+            AudioConfig.FRAME_DURATION,
+            bitrate=encoder_config.get("BITRATE", 16000),
+            min_bitrate=encoder_config.get("MIN_BITRATE", 8000),
+            complexity=encoder_config.get("COMPLEXITY", 5),
+            min_complexity=encoder_config.get("MIN_COMPLEXITY", 1),
+            dtx=encoder_config.get("DTX", False),
+            inband_fec=encoder_config.get("INBAND_FEC", False),
+            packet_loss_perc=encoder_config.get("PACKET_LOSS_PERC", 0),
+            adaptive=encoder_config.get("ADAPTIVE", True),
+        )
+        try:
+            self._encoder_controller.apply()
+        except Exception as e:
+            logger.warning(f"设置Opus编码参数失败，使用默认参数: {e}")
+
     async def _create_resamplers(self):
         """
         根据设备与服务端的差异，按需创建重采样器和转换标记.
         """
+        # 重采样档位：low_latency / balanced / hq；整数倍采样率可选多相FIR快速路径
+        profile = self.config.get_config(
+            "AUDIO_DEVICES.RESAMPLE_PROFILE", DEFAULT_RESAMPLE_PROFILE
+        )
+        fast_path = self.config.get_config(
+            "AUDIO_DEVICES.RESAMPLE_INTEGER_FAST_PATH", False
+        )
+
         # 输入转换器配置
         # 1. 声道下混标记
         self._need_input_downmix = self.input_channels > 1
@@ -290,28 +513,45 @@ class AudioCodec:
 
         # 2. 采样率重采样器
         if self.device_input_sample_rate != AudioConfig.INPUT_SAMPLE_RATE:
-            self.input_resampler = soxr.ResampleStream(
+            # 重采样器处理单声道（下混后）
+            self.input_resampler = create_resampler(
                 self.device_input_sample_rate,
                 AudioConfig.INPUT_SAMPLE_RATE,
-                num_channels=1,  # 重采样器处理单声道（下混后）
                 dtype="float32",
-                quality="QQ",  # 快速质量（低延迟）
+                profile=profile,
+                integer_fast_path=fast_path,
+            )
+            # 预留数帧余量，吸收重采样器输出长度抖动
+            self._resample_input_buffer = AudioRingBuffer(
+                AudioConfig.INPUT_FRAME_SIZE * 4, dtype=np.float32
+            )
+            self._input_frame = np.zeros(AudioConfig.INPUT_FRAME_SIZE, dtype=np.float32)
+            logger.info(
+                f"输入重采样: {self.device_input_sample_rate}Hz → 16kHz "
+                f"({describe_resampler(self.input_resampler)}, {profile})"
             )
-            logger.info(f"输入重采样: {self.device_input_sample_rate}Hz → 16kHz")
 
         # 输出转换器配置
         # 1. 采样率重采样器
         if self.device_output_sample_rate != AudioConfig.OUTPUT_SAMPLE_RATE:
-            self.output_resampler = soxr.ResampleStream(
+            # 重采样器处理单声道（上混前）
+            self.output_resampler = create_resampler(
                 AudioConfig.OUTPUT_SAMPLE_RATE,
                 self.device_output_sample_rate,
-                num_channels=1,  # 重采样器处理单声道（上混前）
                 dtype="float32",
-                quality="QQ",
+                profile=profile,
+                integer_fast_path=fast_path,
+            )
+            self._resample_output_buffer = AudioRingBuffer(
+                self._device_output_frame_size * 4, dtype=np.float32
+            )
+            self._output_mono_frame = np.zeros(
+                self._device_output_frame_size, dtype=np.float32
             )
             logger.info(
                 f"输出重采样: {AudioConfig.OUTPUT_SAMPLE_RATE}Hz → "
-                f"{self.device_output_sample_rate}Hz"
+                f"{self.device_output_sample_rate}Hz "
+                f"({describe_resampler(self.output_resampler)}, {profile})"
             )
 
         # 2. 声道上混标记
@@ -319,6 +559,164 @@ class AudioCodec:
         if self._need_output_upmix:
             logger.info(f"输出声道上混: 1ch → {self.output_channels}ch")
 
+    def _create_scratch_buffers(self):
+        """
+        按设备帧大小预分配输入/输出回调使用的临时缓冲区.
+        """
+        self._input_mono_frame = np.zeros(
+            self._device_input_frame_size, dtype=np.float32
+        )
+        self._capture_float_frame = np.zeros(
+            AudioConfig.INPUT_FRAME_SIZE, dtype=np.float32
+        )
+        self._capture_int16_frame = np.zeros(
+            AudioConfig.INPUT_FRAME_SIZE, dtype=np.int16
+        )
+        self._output_float_frame = np.zeros(
+            self._device_output_frame_size, dtype=np.float32
+        )
+        self._output_convert_frame = np.zeros(
+            AudioConfig.OUTPUT_FRAME_SIZE, dtype=np.float32
+        )
+        self._fade_ramp = self._build_fade_ramp(self._device_output_frame_size)
+
+    def _build_fade_ramp(self, frames: int) -> np.ndarray:
+        """
+        打断淡出包络：INTERRUPT_FADE_MS 内从 1 线性降到 0，其余为 0.
+        """
+        fade = max(1, int(self.device_output_sample_rate * INTERRUPT_FADE_MS / 1000))
+        ramp = np.zeros(frames, dtype=np.float32)
+        count = min(fade, frames)
+        ramp[:count] = np.linspace(1.0, 0.0, fade, endpoint=False)[:count]
+        return ramp
+
+    def _install_reference_tap(self):
+        """
+        AEC 需要播放参考时，按输出延迟对齐后在输出回调中抽取实际播放的音频.
+        """
+        if not self.audio_processor.uses_playback_reference:
+            return
+
+        # 输出延迟：交给 PortAudio 到扬声器发声之间的时间
+        delay_ms = 0.0
+        try:
+            if self.output_stream is not None:
+                delay_ms = float(self.output_stream.latency) * 1000
+        except Exception as e:
+            logger.debug(f"获取输出延迟失败: {e}")
+
+        self._silence_frame = np.zeros(self._device_output_frame_size, dtype=np.float32)
+        self.audio_processor.enable_playback_reference(
+            self.device_output_sample_rate, delay_ms
+        )
+        self._reference_tap = self.audio_processor.feed_playback_reference
+
+    def _tap_output(self, mono: Optional[np.ndarray], frames: int):
+        """
+        把本块实际播放的单声道音频送给各播放抽头（AEC 参考、会话录音），mono 为 None 表示静音.
+        """
+        if self._reference_tap is not None:
+            self._tap_reference(mono, frames)
+        if self._playback_tap is not None:
+            try:
+                self._playback_tap(mono, frames)
+            except Exception as e:
+                logger.debug(f"录音播放抽头失败: {e}")
+
+    def _tap_reference(self, mono: Optional[np.ndarray], frames: int):
+        """送入一帧播放参考（输出回调线程），mono 为 None 表示本帧输出静音."""
+        try:
+            if mono is None:
+                if len(self._silence_frame) < frames:
+                    self._silence_frame = np.zeros(frames, dtype=np.float32)
+                mono = self._silence_frame[:frames]
+            self._reference_tap(mono)
+        except Exception as e:
+            logger.debug(f"AEC播放参考抽头失败: {e}")
+
+    def _create_vad_gate(self):
+        """
+        按配置创建上行语音门限（VAD_OPTIONS）.
+        """
+        vad_config = self.config.get_config("VAD_OPTIONS", {}) or {}
+        if not vad_config.get("UPLINK_GATE", False):
+            return
+
+        self._vad_gate = VoiceActivityGate(
+            AudioConfig.INPUT_SAMPLE_RATE,
+            AudioConfig.FRAME_DURATION,
+            energy_threshold_db=vad_config.get("ENERGY_THRESHOLD_DB", -50.0),
+            snr_db=vad_config.get("SNR_DB", 9.0),
+            flatness_threshold=vad_config.get("FLATNESS_THRESHOLD", 0.45),
+            hangover_ms=vad_config.get("HANGOVER_MS", 800),
+            preroll_ms=vad_config.get("PREROLL_MS", 240),
+        )
+        logger.info("已启用上行语音门限（静音帧不发送）")
+
+    def _create_recorder(self):
+        """
+        按配置创建会话录音（RECORDER）.
+        """
+        recorder_config = self.config.get_config("RECORDER", {}) or {}
+        if not recorder_config.get("ENABLED", False):
+            return
+
+        directory = Path(recorder_config.get("DIRECTORY", "recordings"))
+        if not directory.is_absolute():
+            directory = get_project_root() / directory
+        fmt = recorder_config.get("FORMAT", FORMAT_OPUS)
+        try:
+            recorder = SessionRecorder(
+                directory,
+                fmt=fmt,
+                mic_sample_rate=AudioConfig.INPUT_SAMPLE_RATE,
+                speaker_sample_rate=(
+                    AudioConfig.OUTPUT_SAMPLE_RATE
+                    if fmt == FORMAT_OPUS
+                    else self.device_output_sample_rate
+                ),
+                max_file_mb=recorder_config.get("MAX_FILE_MB", 20),
+                max_file_seconds=recorder_config.get("MAX_FILE_SECONDS", 1800),
+                max_total_mb=recorder_config.get("MAX_TOTAL_MB", 500),
+                queue_size=recorder_config.get("QUEUE_SIZE", 1000),
+            )
+            recorder.start()
+        except Exception as e:
+            logger.warning(f"创建会话录音失败: {e}")
+            return
+
+        self._recorder = recorder
+        if fmt == FORMAT_OPUS:
+            self._packet_recorder = recorder
+        else:
+            self.add_audio_listener(recorder)
+            self._playback_tap = recorder.on_playback
+
+    def _create_capture_pipeline(self):
+        """
+        按配置创建采集流水线（AUDIO_DEVICES.CAPTURE_WORKER）.
+        """
+        if not self.config.get_config("AUDIO_DEVICES.CAPTURE_WORKER", False):
+            return
+
+        # 16kHz 单声道组帧缓冲，容纳一整批重采样输出
+        self._capture_frame_ring = AudioRingBuffer(
+            AudioConfig.INPUT_FRAME_SIZE * 40, dtype=np.float32
+        )
+        self._capture_frame = np.zeros(AudioConfig.INPUT_FRAME_SIZE, dtype=np.float32)
+        capacity_frames = 32
+        self._capture_mono_batch = np.zeros(
+            self._device_input_frame_size * capacity_frames, dtype=np.float32
+        )
+        self._capture_pipeline = CapturePipeline(
+            channels=self.input_channels,
+            frame_size=self._device_input_frame_size,
+            process_batch=self._process_capture_batch,
+            capacity_frames=capacity_frames,
+        )
+        self._capture_pipeline.start()
+        logger.info("已启用采集流水线模式（工作线程处理编码与分发）")
+
     async def _create_streams(self):
         """
         创建音频流（完全使用设备原生格式）
@@ -370,13 +768,22 @@ class AudioCodec:
         if self._is_closing:
             return
 
+        # 流水线模式：回调只拷贝原始帧，其余交给工作线程
+        if self._capture_pipeline is not None:
+            self._capture_pipeline.push(indata)
+            return
+
         try:
             # 步骤1: 声道下混（立体声/多声道 → 单声道）
             if self._need_input_downmix:
-                # indata shape: (frames, channels)
-                audio_data = downmix_to_mono(indata, keepdims=False)
+                # indata shape: (frames, channels)，原地下混到预分配缓冲区
+                if len(self._input_mono_frame) < frames:
+                    self._input_mono_frame = np.zeros(frames, dtype=np.float32)
+                audio_data = downmix_to_mono_into(
+                    indata, self._input_mono_frame[:frames]
+                )
             else:
-                audio_data = indata.flatten()  # 已经是单声道
+                audio_data = indata[:, 0]  # 已经是单声道（视图，无拷贝）
 
             # 步骤2: 采样率转换（设备采样率 → 16kHz）
             if self.input_resampler is not None:
@@ -388,60 +795,111 @@ class AudioCodec:
             if len(audio_data) != AudioConfig.INPUT_FRAME_SIZE:
                 return
 
-            # 步骤4: 转换为 int16 供 Opus 编码和 AEC 处理
-            audio_data_int16 = (audio_data * 32768.0).astype(np.int16)
+            self._process_capture_frame(audio_data)
 
-            # 步骤5: AEC处理（如果启用）
-            if self._aec_enabled and self.audio_processor._is_macos:
-                try:
-                    audio_data_int16 = self.audio_processor.process_audio(
-                        audio_data_int16
-                    )
-                except Exception as e:
-                    logger.warning(f"AEC处理失败，使用原始音频: {e}")
+        except Exception as e:
+            logger.error(f"输入回调错误: {e}")
 
-            # 步骤6: Opus编码并实时发送
-            if self._encoded_callback:
-                try:
-                    pcm_data = audio_data_int16.tobytes()
-                    encoded_data = self.opus_encoder.encode(
-                        pcm_data, AudioConfig.INPUT_FRAME_SIZE
-                    )
-                    if encoded_data:
-                        self._encoded_callback(encoded_data)
-                except Exception as e:
-                    logger.warning(f"实时录音编码失败: {e}")
+    def _process_capture_batch(self, batch: np.ndarray):
+        """采集工作线程：批量处理一组设备原生帧.
 
-            # 步骤7: 通知音频监听器（解耦唤醒词检测）
-            for listener in self._audio_listeners:
-                try:
-                    listener.on_audio_data(audio_data_int16.copy())
-                except Exception as e:
-                    logger.warning(f"音频监听器处理失败: {e}")
+        Args:
+            batch: 形状 (N, channels) 的 float32 数组，N 为整数个设备帧
+        """
+        if self._is_closing:
+            return
 
-        except Exception as e:
-            logger.error(f"输入回调错误: {e}")
+        # 声道下混
+        if self._need_input_downmix:
+            audio_data = downmix_to_mono_into(
+                batch, self._capture_mono_batch[: len(batch)]
+            )
+        else:
+            audio_data = batch[:, 0]
+
+        # 整批一次重采样
+        if self.input_resampler is not None:
+            audio_data = self.input_resampler.resample_chunk(audio_data, last=False)
+
+        # 按协议帧长切分，逐帧 AEC/编码/分发
+        self._capture_frame_ring.write(audio_data)
+        frame = self._capture_frame
+        while self._capture_frame_ring.available() >= len(frame):
+            self._capture_frame_ring.read_into(frame)
+            self._process_capture_frame(frame)
+
+    def _process_capture_frame(self, audio_data: np.ndarray):
+        """处理一帧 16kHz 单声道 float32 音频：int16 转换 → AEC → Opus编码 → 监听器.
+
+        在输入回调（直接模式）或采集工作线程（流水线模式）中调用。
+        """
+        # 转换为 int16 供 Opus 编码和 AEC 处理（预分配缓冲区，赋值时截断取整）
+        np.multiply(audio_data, 32768.0, out=self._capture_float_frame)
+        audio_data_int16 = self._capture_int16_frame
+        audio_data_int16[:] = self._capture_float_frame
+
+        # AEC处理（如果启用）
+        if self._aec_enabled and self.audio_processor.is_active:
+            try:
+                audio_data_int16 = self.audio_processor.process_audio(audio_data_int16)
+            except Exception as e:
+                logger.warning(f"AEC处理失败，使用原始音频: {e}")
+
+        # Opus编码并实时发送
+        if self._encoded_callback:
+            try:
+                pcm_data = audio_data_int16.tobytes()
+                encoded_data = self._encoder_controller.encode(
+                    pcm_data, AudioConfig.INPUT_FRAME_SIZE
+                )
+                if encoded_data:
+                    if self._vad_gate_active:
+                        # 语音门限：非语音帧不发送，起音时补发预缓冲
+                        for packet in self._vad_gate.process(
+                            audio_data_int16, encoded_data
+                        ):
+                            self._encoded_callback(packet)
+                        if self._vad_gate.in_speech:
+                            self._tracer.mark_last(SPEECH_LAST)
+                    else:
+                        self._encoded_callback(encoded_data)
+                    if self._packet_recorder is not None:
+                        self._packet_recorder.on_uplink_packet(encoded_data)
+            except Exception as e:
+                logger.warning(f"实时录音编码失败: {e}")
+
+        # 发布到帧总线（唯一一次拷贝），监听器共享同一只读视图
+        listeners = self._audio_listeners
+        if not listeners and not self.frame_bus.has_subscribers:
+            return
+        frame = self.frame_bus.publish(audio_data_int16)
+        for listener in listeners:
+            try:
+                listener.on_audio_data(frame)
+            except Exception as e:
+                logger.warning(f"音频监听器处理失败: {e}")
 
     def _process_input_resampling(self, audio_data):
         """
         输入重采样处理：设备采样率 → 16kHz 使用缓冲区累积数据，凑够一帧再返回.
         """
         try:
+            # 清空请求：由输入回调（该缓冲区唯一的读写方）执行，避免跨线程竞争
+            if self._input_generation != self._input_clear_generation:
+                self._input_generation = self._input_clear_generation
+                self._resample_input_buffer.clear()
+
             resampled_data = self.input_resampler.resample_chunk(audio_data, last=False)
             if len(resampled_data) > 0:
-                self._resample_input_buffer.extend(resampled_data)
+                self._resample_input_buffer.write(resampled_data)
 
             # 累积到目标帧大小
-            expected_frame_size = AudioConfig.INPUT_FRAME_SIZE
-            if len(self._resample_input_buffer) < expected_frame_size:
+            if self._resample_input_buffer.available() < len(self._input_frame):
                 return None
 
-            # 取出一帧
-            frame_data = []
-            for _ in range(expected_frame_size):
-                frame_data.append(self._resample_input_buffer.popleft())
-
-            return np.array(frame_data, dtype=np.float32)
+            # 取出一帧（向量化切片拷贝到预分配帧）
+            self._resample_input_buffer.read_into(self._input_frame)
+            return self._input_frame
 
         except Exception as e:
             logger.error(f"输入重采样失败: {e}")
@@ -456,6 +914,11 @@ class AudioCodec:
                 logger.warning(f"输出流状态: {status}")
 
         try:
+            # 打断：本块输出淡出，丢弃回调侧残留数据
+            if self._output_generation != self._playback_generation:
+                self._output_interrupted(outdata, frames)
+                return
+
             # 获取解码后的24kHz单声道数据
             if self.output_resampler is not None:
                 # 需要重采样：24kHz → 设备采样率
@@ -468,45 +931,78 @@ class AudioCodec:
             logger.error(f"输出回调错误: {e}")
             outdata.fill(0)
 
+    def _output_interrupted(self, outdata, frames):
+        """打断后的第一个输出块（输出回调线程）
+
+        从上一块最后一个样本淡出到静音，清空重采样输出缓冲区和重采样器状态，
+        并记录从触发打断到输出静音块的耗时。
+        """
+        self._output_generation = self._playback_generation
+
+        if len(self._fade_ramp) < frames:
+            self._fade_ramp = self._build_fade_ramp(frames)
+        mono = self._output_float_frame[:frames]
+        np.multiply(self._fade_ramp[:frames], self._last_output[0], out=mono)
+        if self._need_output_upmix:
+            upmix_mono_into(mono, outdata)
+        else:
+            outdata[:, 0] = mono
+        self._last_output[0] = 0.0
+
+        if self._resample_output_buffer is not None:
+            self._resample_output_buffer.clear()
+        if self.output_resampler is not None:
+            self.output_resampler.clear()
+
+        self._tap_output(mono, frames)
+
+        started = self._interrupt_started
+        if started is not None:
+            self._interrupt_started = None
+            self._interrupt_latencies.append((time.perf_counter() - started) * 1000)
+
     def _output_callback_direct(self, outdata, frames):
         """直接播放（设备支持24kHz时）
 
         处理流程:
         1. 从队列取出单声道数据 (OUTPUT_FRAME_SIZE个样本)
-        2. 截取或填充到所需帧数
-        3. 转换 int16 → float32
-        4. 如需上混,复制到多声道;否则直接输出
-        """
-        try:
-            # 从播放队列获取音频数据（单声道 int16 数据）
-            audio_data = self._output_buffer.get_nowait()
-
-            # audio_data 是单声道数据,长度通常 = OUTPUT_FRAME_SIZE
-            # 截取或填充到所需帧数
-            if len(audio_data) >= frames:
-                mono_samples = audio_data[:frames]
-            else:
-                # 数据不足,填充静音
-                mono_samples = np.zeros(frames, dtype=np.int16)
-                mono_samples[: len(audio_data)] = audio_data
-
-            # 转换为 float32 用于播放
-            mono_samples_float = mono_samples.astype(np.float32) / 32768.0
-
-            # 声道处理
-            if self._need_output_upmix:
-                # 单声道 → 多声道（复制到所有声道）
-                multi_channel = upmix_mono_to_channels(
-                    mono_samples_float, self.output_channels
-                )
-                outdata[:] = multi_channel
-            else:
-                # 单声道输出
-                outdata[:, 0] = mono_samples_float
+        2. int16 → float32 转换写入预分配缓冲区，不足部分补静音
+        3. 如需上混,广播到多声道;否则直接输出
 
-        except asyncio.QueueEmpty:
+        整个过程原地计算，回调内不分配新数组。
+        """
+        # 从播放队列获取音频数据（单声道 int16 数据）
+        audio_data = self._output_buffer.get_nowait()
+        if audio_data is None:
             # 无数据时输出静音
             outdata.fill(0)
+            self._last_output[0] = 0.0
+            self._tap_output(None, frames)
+            return
+
+        self._tracer.mark(PLAYBACK_FIRST, after=DECODE_FIRST)
+
+        if len(self._output_float_frame) < frames:
+            self._output_float_frame = np.zeros(frames, dtype=np.float32)
+        mono_samples = self._output_float_frame[:frames]
+
+        # audio_data 是单声道数据,长度通常 = OUTPUT_FRAME_SIZE
+        # 截取或填充到所需帧数，同时转换为 float32
+        count = min(len(audio_data), frames)
+        mono_samples[:count] = audio_data[:count]
+        mono_samples[count:] = 0
+        np.multiply(mono_samples, 1.0 / 32768.0, out=mono_samples)
+        self._last_output[:] = mono_samples[frames - 1 :]
+
+        # 声道处理
+        if self._need_output_upmix:
+            # 单声道 → 多声道（广播到所有声道）
+            upmix_mono_into(mono_samples, outdata)
+        else:
+            # 单声道输出
+            outdata[:, 0] = mono_samples
+
+        self._tap_output(mono_samples, frames)
 
     def _output_callback_with_resample(self, outdata, frames):
         """重采样播放（24kHz → 设备采样率）
@@ -520,40 +1016,48 @@ class AudioCodec:
         try:
             # 持续处理24kHz单声道数据进行重采样
             # 注意: 缓冲区保存的是单声道数据,所以比较 frames 而非 frames*channels
-            while len(self._resample_output_buffer) < frames:
-                try:
-                    audio_data = self._output_buffer.get_nowait()
-                    # 转换 int16 → float32
-                    audio_data_float = audio_data.astype(np.float32) / 32768.0
-                    # 24kHz单声道 → 设备采样率单声道重采样
-                    resampled_data = self.output_resampler.resample_chunk(
-                        audio_data_float, last=False
-                    )
-                    if len(resampled_data) > 0:
-                        self._resample_output_buffer.extend(resampled_data)
-                except asyncio.QueueEmpty:
+            while self._resample_output_buffer.available() < frames:
+                audio_data = self._output_buffer.get_nowait()
+                if audio_data is None:
                     break
+                self._tracer.mark(PLAYBACK_FIRST, after=DECODE_FIRST)
+                # 转换 int16 → float32（预分配缓冲区，原地缩放）
+                if len(self._output_convert_frame) < len(audio_data):
+                    self._output_convert_frame = np.zeros(
+                        len(audio_data), dtype=np.float32
+                    )
+                audio_data_float = self._output_convert_frame[: len(audio_data)]
+                audio_data_float[:] = audio_data
+                np.multiply(audio_data_float, 1.0 / 32768.0, out=audio_data_float)
+                # 24kHz单声道 → 设备采样率单声道重采样
+                resampled_data = self.output_resampler.resample_chunk(
+                    audio_data_float, last=False
+                )
+                if len(resampled_data) > 0:
+                    self._resample_output_buffer.write(resampled_data)
 
             # 取出所需帧数的单声道数据
-            if len(self._resample_output_buffer) >= frames:
-                frame_data = []
-                for _ in range(frames):
-                    frame_data.append(self._resample_output_buffer.popleft())
-                mono_data = np.array(frame_data, dtype=np.float32)
+            if self._resample_output_buffer.available() >= frames:
+                if len(self._output_mono_frame) < frames:
+                    self._output_mono_frame = np.zeros(frames, dtype=np.float32)
+                mono_data = self._output_mono_frame[:frames]
+                self._resample_output_buffer.read_into(mono_data)
+                self._last_output[:] = mono_data[frames - 1 :]
 
                 # 声道处理
                 if self._need_output_upmix:
-                    # 单声道 → 多声道（复制到所有声道）
-                    multi_channel = upmix_mono_to_channels(
-                        mono_data, self.output_channels
-                    )
-                    outdata[:] = multi_channel
+                    # 单声道 → 多声道（广播到所有声道）
+                    upmix_mono_into(mono_data, outdata)
                 else:
                     # 单声道输出
                     outdata[:, 0] = mono_data
+
+                self._tap_output(mono_data, frames)
             else:
                 # 数据不足时输出静音
                 outdata.fill(0)
+                self._last_output[0] = 0.0
+                self._tap_output(None, frames)
 
         except Exception as e:
             logger.warning(f"重采样输出失败: {e}")
@@ -592,6 +1096,26 @@ class AudioCodec:
         else:
             logger.info("已清除编码音频回调")
 
+    def set_uplink_gate(self, enabled: bool):
+        """开关上行语音门限并重置门控状态（未配置 VAD_OPTIONS.UPLINK_GATE 时无效）.
+
+        Args:
+            enabled: True=只发送语音帧, False=发送全部帧
+        """
+        if self._vad_gate is None:
+            return
+        self._vad_gate.reset()
+        self._vad_gate_active = enabled
+
+    def report_send_backlog(self, depth: int):
+        """报告上行发送队列深度，供编码控制器自适应调整码率.
+
+        Args:
+            depth: 待发送的音频包数
+        """
+        if self._encoder_controller is not None:
+            self._encoder_controller.report_send_backlog(depth)
+
     def add_audio_listener(self, listener: AudioListener):
         """添加音频监听器（解耦唤醒词检测等功能）
 
@@ -616,40 +1140,90 @@ class AudioCodec:
             self._audio_listeners.remove(listener)
             logger.info(f"已移除音频监听器: {listener.__class__.__name__}")
 
-    async def write_audio(self, opus_data: bytes):
+    def subscribe_frames(
+        self,
+        name: str,
+        max_pending: Optional[int] = None,
+        policy: str = DROP_OLDEST,
+        notify=None,
+    ) -> FrameSubscription:
+        """订阅采集帧总线（16kHz 单声道 int16，每帧 INPUT_FRAME_SIZE 个样本）.
+
+        订阅者在自己的线程中读取，采集线程不会等待或拷贝；积压超过 max_pending 帧时
+        按 policy 丢弃（DROP_OLDEST / SKIP_TO_LATEST）。
+
+        Args:
+            name: 订阅者名称
+            max_pending: 最大积压帧数，默认取总线上限
+            policy: 丢弃策略
+            notify: 每发布一帧时 set() 的 threading.Event
+        """
+        subscription = self.frame_bus.subscribe(name, max_pending, policy, notify)
+        logger.info(
+            f"已订阅采集帧总线: {name}（积压上限 {subscription.max_pending} 帧，"
+            f"{subscription.policy}）"
+        )
+        return subscription
+
+    def unsubscribe_frames(self, subscription: FrameSubscription):
+        """
+        取消采集帧总线订阅.
+        """
+        self.frame_bus.unsubscribe(subscription)
+        logger.info(f"已取消采集帧总线订阅: {subscription.name}")
+
+    async def write_audio(self, opus_data: bytes, sequence: Optional[int] = None):
         """解码并播放音频（服务端 Opus 数据 → 扬声器）
 
         Args:
             opus_data: 服务端返回的 Opus 编码数据
+            sequence: 传输层序号（UDP 等不可靠传输提供），None 时按到达顺序编号
 
         流程:
-            Opus解码 → 24kHz单声道PCM → 播放队列 → 输出回调处理
+            抖动缓冲 → 解码线程批量解码（含FEC/PLC） → 24kHz单声道PCM → 播放队列 → 输出回调处理
         """
         try:
-            # Opus解码为24kHz PCM数据
-            pcm_data = self.opus_decoder.decode(
-                opus_data, AudioConfig.OUTPUT_FRAME_SIZE
-            )
-
-            audio_array = np.frombuffer(pcm_data, dtype=np.int16)
+            if self._packet_recorder is not None:
+                self._packet_recorder.on_downlink_packet(opus_data)
+            self._jitter_buffer.push(opus_data, sequence)
+            self._drain_jitter_buffer()
+        except Exception as e:
+            logger.warning(f"音频写入失败，丢弃此帧: {e}")
 
-            expected_length = AudioConfig.OUTPUT_FRAME_SIZE * AudioConfig.CHANNELS
-            if len(audio_array) != expected_length:
-                logger.warning(
-                    f"解码音频长度异常: {len(audio_array)}, 期望: {expected_length}"
-                )
-                return
+    def _drain_jitter_buffer(self):
+        """
+        从抖动缓冲区取出就绪的包提交解码线程，并按需安排下一次检查（事件循环线程）.
+        """
+        if self._decode_worker is None:
+            return
+        # 已提交但尚未解码的帧也计入播放余量，避免误判断流
+        headroom_ms = (
+            self._output_buffer.buffered_ms()
+            + self._decode_worker.pending_frames() * AudioConfig.FRAME_DURATION
+        )
+        items = self._jitter_buffer.pop_ready(headroom_ms)
+        self._decode_worker.submit(items)
+        self._schedule_jitter_tick()
 
-            # 放入播放队列（使用工具函数安全入队）
-            if not safe_queue_put(
-                self._output_buffer, audio_array, replace_oldest=True
-            ):
-                logger.warning("播放队列已满，丢弃音频帧")
+    def _schedule_jitter_tick(self):
+        """
+        抖动缓冲区活跃期间每半帧检查一次，处理预缓冲超时和断流隐藏.
+        """
+        if self._jitter_timer is not None or self._is_closing:
+            return
+        if not self._jitter_buffer.active:
+            return
+        loop = asyncio.get_running_loop()
+        self._jitter_timer = loop.call_later(
+            AudioConfig.FRAME_DURATION / 2000, self._on_jitter_tick
+        )
 
-        except opuslib.OpusError as e:
-            logger.warning(f"Opus解码失败，丢弃此帧: {e}")
+    def _on_jitter_tick(self):
+        self._jitter_timer = None
+        try:
+            self._drain_jitter_buffer()
         except Exception as e:
-            logger.warning(f"音频写入失败，丢弃此帧: {e}")
+            logger.warning(f"抖动缓冲区处理失败: {e}")
 
     async def write_pcm_direct(self, pcm_data: np.ndarray):
         """直接写入 PCM 数据到播放队列（供 MusicPlayer 使用）
@@ -682,13 +1256,14 @@ class AudioCodec:
                         f"PCM 数据过长，截断: {len(pcm_data)} → {expected_length}"
                     )
 
-            # 放入播放队列（不替换旧数据，阻塞等待）
-            if not safe_queue_put(self._output_buffer, pcm_data, replace_oldest=False):
-                # 队列满时阻塞等待
-                await asyncio.wait_for(self._output_buffer.put(pcm_data), timeout=2.0)
+            # 放入播放队列（不替换旧数据，队列满时等待回调腾出空间）
+            while not self._output_buffer.put(pcm_data, replace_oldest=False):
+                if not await self._output_buffer.wait_for_room(
+                    len(pcm_data), timeout=2.0
+                ):
+                    logger.warning("播放队列阻塞超时，丢弃 PCM 帧")
+                    return
 
-        except asyncio.TimeoutError:
-            logger.warning("播放队列阻塞超时，丢弃 PCM 帧")
         except Exception as e:
             logger.warning(f"写入 PCM 数据失败: {e}")
 
@@ -751,6 +1326,42 @@ class AudioCodec:
             else:
                 raise
 
+    def interrupt_playback(self, trigger_time: Optional[float] = None) -> int:
+        """打断播放（barge-in 快速路径，事件循环线程调用，不等待、不做 GC）.
+
+        - 丢弃抖动缓冲区、解码线程待解码数据和播放队列（均为 O(1) 清空）
+        - 递增播放代数：输出回调在下一块检测到变化，淡出后输出静音，
+          并自行清空重采样输出缓冲区（该缓冲区只由回调线程读写，避免跨线程竞争）
+
+        Args:
+            trigger_time: 打断触发时刻（time.perf_counter()），用于统计打断延迟；
+                默认为调用时刻
+
+        Returns:
+            被丢弃的帧数
+        """
+        self._interrupt_started = trigger_time or time.perf_counter()
+
+        if self._jitter_timer is not None:
+            self._jitter_timer.cancel()
+            self._jitter_timer = None
+        cleared_count = self._jitter_buffer.reset()
+        # 先作废解码线程中的批次，再清空播放队列，保证清空后不会再写入旧数据
+        if self._decode_worker is not None:
+            cleared_count += self._decode_worker.clear()
+        cleared_count += self._output_buffer.clear()
+
+        self._playback_generation += 1
+
+        # 输出流未运行时回调不会执行，直接在此复位
+        if self.output_stream is None or not self.output_stream.active:
+            self._output_generation = self._playback_generation
+            self._interrupt_started = None
+            if self._resample_output_buffer is not None:
+                cleared_count += self._resample_output_buffer.clear()
+
+        return cleared_count
+
     async def clear_audio_queue(self):
         """清空音频队列.
 
@@ -759,31 +1370,114 @@ class AudioCodec:
             - 唤醒词触发时打断旧音频
             - 错误恢复时清空脏数据
         """
-        cleared_count = 0
+        cleared_count = self.interrupt_playback()
 
-        # 清空播放队列
-        while not self._output_buffer.empty():
-            try:
-                self._output_buffer.get_nowait()
-                cleared_count += 1
-            except asyncio.QueueEmpty:
-                break
-
-        # 清空重采样缓冲区
-        if self._resample_input_buffer:
-            cleared_count += len(self._resample_input_buffer)
-            self._resample_input_buffer.clear()
-
-        if self._resample_output_buffer:
-            cleared_count += len(self._resample_output_buffer)
-            self._resample_output_buffer.clear()
+        # 清空输入重采样缓冲区：输入回调在下一块中执行；输入流未运行时直接在此复位
+        if self._resample_input_buffer is not None:
+            self._input_clear_generation += 1
+            if self.input_stream is None or not self.input_stream.active:
+                self._input_generation = self._input_clear_generation
+                cleared_count += self._resample_input_buffer.clear()
 
         if cleared_count > 0:
             logger.info(f"清空音频队列，丢弃 {cleared_count} 帧音频数据")
 
-        if cleared_count > 100:
-            gc.collect()
-            logger.debug("执行垃圾回收以释放内存")
+    def get_interrupt_stats(self) -> dict:
+        """获取打断延迟统计（毫秒）.
+
+        callback_*: 从触发打断到输出回调输出淡出块的耗时；
+        output_latency_ms: 输出流缓冲延迟，两者之和约为触发到扬声器静音的时间
+        """
+        latencies = list(self._interrupt_latencies)
+        output_latency_ms = 0.0
+        try:
+            if self.output_stream is not None:
+                output_latency_ms = float(self.output_stream.latency) * 1000
+        except Exception:
+            pass
+        return {
+            "count": len(latencies),
+            "callback_last_ms": round(latencies[-1], 2) if latencies else None,
+            "callback_avg_ms": (
+                round(sum(latencies) / len(latencies), 2) if latencies else None
+            ),
+            "callback_max_ms": round(max(latencies), 2) if latencies else None,
+            "output_latency_ms": round(output_latency_ms, 2),
+        }
+
+    def get_capture_stats(self) -> Optional[dict]:
+        """获取采集流水线统计（回调耗时、溢出、批处理耗时）.
+
+        Returns:
+            dict: 统计信息；未启用流水线模式时返回 None
+        """
+        if self._capture_pipeline is None:
+            return None
+        return self._capture_pipeline.get_stats()
+
+    def get_jitter_stats(self) -> dict:
+        """获取接收抖动缓冲区统计（深度、目标深度、抖动估计、FEC/PLC 隐藏次数）.
+
+        Returns:
+            dict: 统计信息
+        """
+        return self._jitter_buffer.get_stats()
+
+    def get_decode_stats(self) -> Optional[dict]:
+        """获取解码工作线程统计（批大小、批解码耗时、解码错误）.
+
+        Returns:
+            dict: 统计信息；解码器未创建时返回 None
+        """
+        if self._decode_worker is None:
+            return None
+        return self._decode_worker.get_stats()
+
+    def get_encoder_stats(self) -> Optional[dict]:
+        """获取编码统计（当前码率/复杂度、编码耗时与负载、参数调整次数）.
+
+        Returns:
+            dict: 统计信息；编码器未创建时返回 None
+        """
+        if self._encoder_controller is None:
+            return None
+        return self._encoder_controller.get_stats()
+
+    def get_frame_bus_stats(self) -> dict:
+        """获取采集帧总线统计（已发布帧数、各订阅者积压/读取/丢弃帧数）.
+
+        Returns:
+            dict: 统计信息
+        """
+        return self.frame_bus.get_stats()
+
+    def get_recorder_stats(self) -> Optional[dict]:
+        """获取会话录音统计（录音时长、磁盘写入量/写调用次数及每小时折算、丢弃数）.
+
+        Returns:
+            dict: 统计信息；未启用录音时返回 None
+        """
+        if self._recorder is None:
+            return None
+        return self._recorder.get_stats()
+
+    def get_vad_stats(self) -> Optional[dict]:
+        """获取上行语音门限统计（发送/抑制的帧数和字节数）.
+
+        Returns:
+            dict: 统计信息；未启用语音门限时返回 None
+        """
+        if self._vad_gate is None:
+            return None
+        return self._vad_gate.get_stats()
+
+    def get_playback_stats(self) -> dict:
+        """获取播放缓冲区统计（欠载、溢出、丢帧、当前缓冲时长）.
+
+        Returns:
+            dict: 统计信息
+        """
+        return self._output_buffer.get_stats()
 
     # ============= AEC 控制方法 =============
 
@@ -827,7 +1521,7 @@ class AudioCodec:
         """关闭音频编解码器并释放所有资源.
 
         清理顺序:
-        1. 设置关闭标志，停止音频流
+        1. 设置关闭标志，停止音频流和采集/解码工作线程
         2. 清空回调和监听器引用
         3. 清空队列和缓冲区
         4. 关闭AEC处理器
@@ -851,8 +1545,26 @@ class AudioCodec:
             # 等待回调完全停止
             await asyncio.sleep(0.05)
 
+            # 停止采集工作线程
+            if self._capture_pipeline is not None:
+                self._capture_pipeline.stop()
+                self._capture_pipeline = None
+
+            # 停止解码工作线程
+            if self._decode_worker is not None:
+                self._decode_worker.stop()
+                self._decode_worker = None
+
+            # 停止会话录音（写完队列中的数据）
+            if self._recorder is not None:
+                recorder, self._recorder = self._recorder, None
+                self._packet_recorder = None
+                self._playback_tap = None
+                await asyncio.to_thread(recorder.stop)
+
             # 2. 清空回调和监听器
             self._encoded_callback = None
+            self._reference_tap = None
             self._audio_listeners.clear()
 
             # 3. 清空队列和缓冲区
@@ -874,6 +1586,7 @@ class AudioCodec:
             self.output_resampler = None
 
             # 6. 释放编解码器
+            self._encoder_controller = None
             self.opus_encoder = None
             self.opus_decoder = None
 
@@ -0,0 +1,166 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from src.audio_codecs.ring_buffer import AudioRingBuffer
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class CapturePipeline:
+    """
+    采集流水线：实时回调只做拷贝，重活交给专用工作线程.
+
+    流程：
+    - 输入回调线程：push() 把设备原生帧（交错多声道 float32）拷贝进预分配环形缓冲区，
+      然后唤醒工作线程，耗时固定且可统计
+    - 工作线程：一次取出所有已到达的完整设备帧，交给 process_batch 批量处理
+      （下混、重采样、AEC、Opus 编码、监听器分发）
+
+    环形缓冲区满时整帧丢弃并计入溢出，绝不阻塞回调线程。
+    """
+
+    def __init__(
+        self,
+        channels: int,
+        frame_size: int,
+        process_batch: Callable[[np.ndarray], None],
+        capacity_frames: int = 32,
+        name: str = "audio-capture",
+    ):
+        """初始化采集流水线.
+
+        Args:
+            channels: 设备声道数
+            frame_size: 设备每帧样本数（每声道）
+            process_batch: 批处理函数，接收形状 (N, channels) 的 float32 数组
+            capacity_frames: 环形缓冲区可容纳的设备帧数
+            name: 工作线程名
+        """
+        self._channels = channels
+        self._frame_samples = frame_size * channels
+        self._process_batch = process_batch
+        self._name = name
+
+        capacity = self._frame_samples * capacity_frames
+        self._ring = AudioRingBuffer(capacity, dtype=np.float32)
+        self._batch = np.zeros(capacity, dtype=np.float32)
+
+        self._event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # 回调侧统计（仅回调线程写入）
+        self.callback_count = 0
+        self.callback_time_total = 0.0
+        self.callback_time_max = 0.0
+        self.overflows = 0
+
+        # 工作线程统计（仅工作线程写入）
+        self.batch_count = 0
+        self.frames_processed = 0
+        self.process_time_total = 0.0
+        self.process_time_max = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """
+        启动工作线程.
+        """
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+        logger.info(f"采集工作线程已启动: {self._name}")
+
+    def stop(self, timeout: float = 1.0):
+        """
+        停止工作线程并丢弃未处理数据.
+        """
+        if not self._running:
+            return
+        self._running = False
+        self._event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        self._ring.clear()
+        logger.info(f"采集工作线程已停止: {self._name}")
+
+    def push(self, indata: np.ndarray):
+        """输入回调调用：拷贝原始设备帧并唤醒工作线程.
+
+        Args:
+            indata: sounddevice 回调提供的 (frames, channels) float32 数组
+        """
+        start = time.perf_counter()
+
+        samples = indata.reshape(-1)
+        if self._ring.free() >= len(samples):
+            self._ring.write(samples)
+        else:
+            # 工作线程跟不上，整帧丢弃
+            self.overflows += 1
+        self._event.set()
+
+        elapsed = time.perf_counter() - start
+        self.callback_count += 1
+        self.callback_time_total += elapsed
+        if elapsed > self.callback_time_max:
+            self.callback_time_max = elapsed
+
+    def _run(self):
+        """
+        工作线程主循环.
+        """
+        while self._running:
+            self._event.wait(timeout=0.1)
+            self._event.clear()
+            if not self._running:
+                break
+
+            available = self._ring.available()
+            count = available - available % self._frame_samples
+            if count <= 0:
+                continue
+
+            batch = self._batch[:count]
+            self._ring.read_into(batch)
+
+            start = time.perf_counter()
+            try:
+                self._process_batch(batch.reshape(-1, self._channels))
+            except Exception as e:
+                logger.error(f"采集批处理失败: {e}", exc_info=True)
+            elapsed = time.perf_counter() - start
+
+            self.batch_count += 1
+            self.frames_processed += count // self._frame_samples
+            self.process_time_total += elapsed
+            if elapsed > self.process_time_max:
+                self.process_time_max = elapsed
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取流水线统计信息（时间单位：微秒）.
+        """
+        callbacks = max(self.callback_count, 1)
+        batches = max(self.batch_count, 1)
+        return {
+            "callbacks": self.callback_count,
+            "callback_avg_us": round(self.callback_time_total / callbacks * 1e6, 1),
+            "callback_max_us": round(self.callback_time_max * 1e6, 1),
+            "overflows": self.overflows,
+            "batches": self.batch_count,
+            "frames_per_batch": round(self.frames_processed / batches, 2),
+            "process_avg_us": round(self.process_time_total / batches * 1e6, 1),
+            "process_max_us": round(self.process_time_max * 1e6, 1),
+            "pending_samples": self._ring.available(),
+        }
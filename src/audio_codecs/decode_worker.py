@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import opuslib
+
+from src.audio_codecs.jitter_buffer import OpusJitterBuffer
+from src.audio_codecs.playback_buffer import PlaybackBuffer
+from src.utils.latency_tracer import AUDIO_RX, DECODE_FIRST, LatencyTracer
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class OpusDecodeWorker:
+    """
+    Opus 解码工作线程：把解码从事件循环移到后台线程.
+
+    - 事件循环侧 submit() 只做入队（抖动缓冲区输出的解码指令），不阻塞
+    - 工作线程每次唤醒取出所有排队指令，按序解码到一块连续的 PCM 数组，
+      再按帧切片（视图，无额外拷贝）一次性写入播放缓冲区，保证包序
+    - clear() 递增代数，丢弃清空前已在解码中的数据，避免打断后残留旧音频
+    """
+
+    def __init__(
+        self,
+        decoder,
+        frame_size: int,
+        playback: PlaybackBuffer,
+        max_batch: int = 32,
+        name: str = "opus-decode",
+    ):
+        """初始化解码工作线程.
+
+        Args:
+            decoder: opuslib.Decoder 实例（此后只在工作线程中使用）
+            frame_size: 每帧解码样本数
+            playback: 解码结果写入的播放缓冲区
+            max_batch: 单批最多解码的帧数
+            name: 工作线程名
+        """
+        self._decoder = decoder
+        self._frame_size = frame_size
+        self._playback = playback
+        self._max_batch = max_batch
+        self._name = name
+
+        self._pending: Deque[Tuple[str, Optional[bytes]]] = deque()
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._generation = 0
+        self._in_flight = 0
+
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._tracer = LatencyTracer.get_instance()
+
+        # 统计（仅工作线程写入）
+        self.batch_count = 0
+        self.frames_decoded = 0
+        self.decode_errors = 0
+        self.decode_time_total = 0.0
+        self.decode_time_max = 0.0
+
+    def start(self):
+        """
+        启动工作线程.
+        """
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+        logger.info(f"解码工作线程已启动: {self._name}")
+
+    def stop(self, timeout: float = 1.0):
+        """
+        停止工作线程并丢弃未解码数据.
+        """
+        if not self._running:
+            return
+        self._running = False
+        self.clear()
+        self._event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        logger.info(f"解码工作线程已停止: {self._name}")
+
+    def submit(self, items: List[Tuple[str, Optional[bytes]]]):
+        """提交解码指令（事件循环线程调用）.
+
+        Args:
+            items: [(kind, packet)]，kind 为 OpusJitterBuffer.NORMAL / FEC / PLC
+        """
+        if not items:
+            return
+        with self._lock:
+            self._pending.extend(items)
+        self._event.set()
+
+    def pending_frames(self) -> int:
+        """
+        已提交但尚未写入播放缓冲区的帧数.
+        """
+        return len(self._pending) + self._in_flight
+
+    def clear(self) -> int:
+        """丢弃所有未解码指令及正在解码的批次.
+
+        Returns:
+            被丢弃的指令数
+        """
+        with self._lock:
+            cleared = len(self._pending)
+            self._pending.clear()
+            self._generation += 1
+        return cleared
+
+    def _decode_one(self, kind: str, packet: Optional[bytes]) -> bytes:
+        if kind == OpusJitterBuffer.FEC:
+            # 用下一包的带内 FEC 恢复丢失帧
+            return self._decoder.decode(packet, self._frame_size, decode_fec=True)
+        if kind == OpusJitterBuffer.PLC:
+            # 空包解码：libopus 生成丢包隐藏帧
+            return self._decoder.decode(b"", self._frame_size)
+        return self._decoder.decode(packet, self._frame_size)
+
+    def _run(self):
+        """
+        工作线程主循环.
+        """
+        frame_size = self._frame_size
+        while self._running:
+            self._event.wait(timeout=0.1)
+            self._event.clear()
+
+            while self._running:
+                with self._lock:
+                    if not self._pending:
+                        break
+                    count = min(len(self._pending), self._max_batch)
+                    batch = [self._pending.popleft() for _ in range(count)]
+                    generation = self._generation
+                    self._in_flight = count
+
+                start = time.perf_counter()
+                block = np.empty(count * frame_size, dtype=np.int16)
+                decoded = 0
+                for kind, packet in batch:
+                    try:
+                        pcm = np.frombuffer(
+                            self._decode_one(kind, packet), dtype=np.int16
+                        )
+                    except opuslib.OpusError as e:
+                        self.decode_errors += 1
+                        logger.warning(f"Opus解码失败，丢弃此帧: {e}")
+                        continue
+                    if len(pcm) != frame_size:
+                        self.decode_errors += 1
+                        logger.warning(
+                            f"解码音频长度异常: {len(pcm)}, 期望: {frame_size}"
+                        )
+                        continue
+                    block[decoded * frame_size : (decoded + 1) * frame_size] = pcm
+                    decoded += 1
+
+                frames = [
+                    block[i * frame_size : (i + 1) * frame_size] for i in range(decoded)
+                ]
+                with self._lock:
+                    # 解码期间被清空则丢弃整批
+                    if generation == self._generation and frames:
+                        self._playback.put_many(frames, replace_oldest=True)
+                        self._tracer.mark(DECODE_FIRST, after=AUDIO_RX)
+                    self._in_flight = 0
+
+                elapsed = time.perf_counter() - start
+                self.batch_count += 1
+                self.frames_decoded += decoded
+                self.decode_time_total += elapsed
+                if elapsed > self.decode_time_max:
+                    self.decode_time_max = elapsed
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取解码统计信息（时间单位：微秒）.
+        """
+        batches = max(self.batch_count, 1)
+        return {
+            "pending_frames": len(self._pending),
+            "batches": self.batch_count,
+            "frames_decoded": self.frames_decoded,
+            "frames_per_batch": round(self.frames_decoded / batches, 2),
+            "decode_errors": self.decode_errors,
+            "batch_avg_us": round(self.decode_time_total / batches * 1e6, 1),
+            "batch_max_us": round(self.decode_time_max * 1e6, 1),
+        }
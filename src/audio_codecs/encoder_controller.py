@@ -0,0 +1,220 @@
+import time
+from typing import Dict
+
+import opuslib
+import opuslib.api.ctl
+import opuslib.api.encoder
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class OpusEncoderController:
+    """
+    Opus 编码参数控制器：按配置设置码率/复杂度/DTX/FEC，并在运行时自适应调整.
+
+    - 编码耗时：统计每个评估周期内编码耗时占帧时长的比例（单核负载），
+      过高时逐级降低复杂度，长期空闲时逐级恢复到配置值
+    - 发送积压：上层报告发送队列深度，取评估周期内的最小值（整个周期都有积压才算
+      拥塞，预缓冲补发等瞬时突发不会触发），拥塞时按比例降低码率，
+      无积压时逐步恢复到目标码率
+    - 所有 CTL 调用都在编码线程（record_encode 内）执行，编码器不跨线程访问；
+      report_send_backlog() 只写一个整数，可在事件循环线程调用
+    """
+
+    # 每个评估周期的时长（毫秒）
+    EVALUATE_INTERVAL_MS = 1000
+    # 编码负载（耗时/帧长）阈值
+    LOAD_HIGH = 0.15
+    LOAD_LOW = 0.05
+    # 发送积压阈值（待发送包数）
+    BACKLOG_HIGH = 4
+    # 积压时码率下调比例、恢复时上调比例
+    BITRATE_DOWN = 0.75
+    BITRATE_UP = 1.1
+
+    def __init__(
+        self,
+        encoder,
+        frame_duration_ms: int,
+        bitrate: int = 16000,
+        min_bitrate: int = 8000,
+        complexity: int = 5,
+        min_complexity: int = 1,
+        dtx: bool = False,
+        inband_fec: bool = False,
+        packet_loss_perc: int = 0,
+        adaptive: bool = True,
+    ):
+        """初始化编码控制器.
+
+        Args:
+            encoder: opuslib.Encoder 实例
+            frame_duration_ms: 帧长（毫秒）
+            bitrate: 目标码率（bps）
+            min_bitrate: 自适应下调的码率下限（bps）
+            complexity: 目标复杂度（0~10）
+            min_complexity: 自适应下调的复杂度下限
+            dtx: 是否启用不连续传输（静音时输出极小包）
+            inband_fec: 是否启用带内 FEC
+            packet_loss_perc: 预期丢包率（%），影响 FEC 冗余量
+            adaptive: 是否按编码耗时和发送积压自适应调整
+        """
+        self._encoder = encoder
+        self._frame_s = frame_duration_ms / 1000
+        self.target_bitrate = int(bitrate)
+        self.min_bitrate = min(int(min_bitrate), self.target_bitrate)
+        self.target_complexity = max(0, min(10, int(complexity)))
+        self.min_complexity = max(0, min(int(min_complexity), self.target_complexity))
+        self.dtx = bool(dtx)
+        self.inband_fec = bool(inband_fec)
+        self.packet_loss_perc = max(0, min(100, int(packet_loss_perc)))
+        self.adaptive = adaptive
+
+        self.bitrate = self.target_bitrate
+        self.complexity = self.target_complexity
+
+        self._evaluate_frames = max(
+            1, round(self.EVALUATE_INTERVAL_MS / frame_duration_ms)
+        )
+        self._window_frames = 0
+        self._window_time = 0.0
+        self._send_backlog = 0
+        self._backlog_floor = None
+
+        # 统计
+        self.frames_encoded = 0
+        self.encode_time_total = 0.0
+        self.encode_time_max = 0.0
+        self.last_load = 0.0
+        self.bitrate_changes = 0
+        self.complexity_changes = 0
+
+    def apply(self):
+        """
+        把当前参数写入编码器（创建编码器后调用一次）.
+        """
+        self._ctl("bitrate", self.bitrate)
+        self._ctl("complexity", self.complexity)
+        self._ctl("signal", opuslib.SIGNAL_VOICE)
+        self._ctl("inband_fec", int(self.inband_fec))
+        self._ctl("packet_loss_perc", self.packet_loss_perc)
+        self._ctl("dtx", int(self.dtx))
+        logger.info(
+            f"Opus编码参数: 码率 {self.bitrate}bps | 复杂度 {self.complexity} | "
+            f"DTX {'开' if self.dtx else '关'} | FEC {'开' if self.inband_fec else '关'}"
+            f"（预期丢包 {self.packet_loss_perc}%）| 自适应 {'开' if self.adaptive else '关'}"
+        )
+
+    def encode(self, pcm: bytes, frame_size: int) -> bytes:
+        """编码一帧并记录耗时（编码线程调用）.
+
+        Args:
+            pcm: int16 PCM 字节
+            frame_size: 每帧样本数
+        """
+        start = time.perf_counter()
+        encoded = self._encoder.encode(pcm, frame_size)
+        self.record_encode(time.perf_counter() - start)
+        return encoded
+
+    def record_encode(self, elapsed: float):
+        """记录一次编码耗时，每个评估周期调整一次参数（编码线程调用）.
+
+        Args:
+            elapsed: 编码耗时（秒）
+        """
+        self.frames_encoded += 1
+        self.encode_time_total += elapsed
+        if elapsed > self.encode_time_max:
+            self.encode_time_max = elapsed
+
+        self._window_frames += 1
+        self._window_time += elapsed
+        if self._window_frames < self._evaluate_frames:
+            return
+
+        self.last_load = self._window_time / (self._window_frames * self._frame_s)
+        self._window_frames = 0
+        self._window_time = 0.0
+        backlog = self._backlog_floor or 0
+        self._backlog_floor = None
+
+        if self.adaptive:
+            self._adjust_complexity(self.last_load)
+            self._adjust_bitrate(backlog)
+
+    def report_send_backlog(self, depth: int):
+        """报告当前发送队列深度（待发送的包数，可在任意线程调用）.
+
+        Args:
+            depth: 待发送包数
+        """
+        self._send_backlog = depth
+        floor = self._backlog_floor
+        if floor is None or depth < floor:
+            self._backlog_floor = depth
+
+    def _adjust_complexity(self, load: float):
+        if load > self.LOAD_HIGH and self.complexity > self.min_complexity:
+            complexity = self.complexity - 1
+        elif load < self.LOAD_LOW and self.complexity < self.target_complexity:
+            complexity = self.complexity + 1
+        else:
+            return
+        if self._set("complexity", complexity):
+            logger.info(
+                f"编码负载 {load:.0%}，复杂度调整: {self.complexity} → {complexity}"
+            )
+            self.complexity = complexity
+            self.complexity_changes += 1
+
+    def _adjust_bitrate(self, backlog: int):
+        if backlog >= self.BACKLOG_HIGH and self.bitrate > self.min_bitrate:
+            bitrate = max(self.min_bitrate, int(self.bitrate * self.BITRATE_DOWN))
+        elif backlog == 0 and self.bitrate < self.target_bitrate:
+            bitrate = min(self.target_bitrate, int(self.bitrate * self.BITRATE_UP))
+        else:
+            return
+        if self._set("bitrate", bitrate):
+            logger.info(
+                f"发送积压 {backlog} 包，码率调整: {self.bitrate} → {bitrate}bps"
+            )
+            self.bitrate = bitrate
+            self.bitrate_changes += 1
+
+    def _ctl(self, name: str, value: int):
+        """
+        直接调用 OPUS_SET_* CTL（opuslib 3.0.1 的 inband_fec/dtx 属性 setter 有缺陷）.
+        """
+        opuslib.api.encoder.encoder_ctl(
+            self._encoder.encoder_state, getattr(opuslib.api.ctl, f"set_{name}"), value
+        )
+
+    def _set(self, name: str, value: int) -> bool:
+        try:
+            self._ctl(name, value)
+            return True
+        except opuslib.OpusError as e:
+            logger.warning(f"设置Opus编码参数失败 {name}={value}: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取编码统计信息（时间单位：微秒）.
+        """
+        frames = max(self.frames_encoded, 1)
+        return {
+            "bitrate": self.bitrate,
+            "complexity": self.complexity,
+            "dtx": self.dtx,
+            "inband_fec": self.inband_fec,
+            "frames_encoded": self.frames_encoded,
+            "encode_avg_us": round(self.encode_time_total / frames * 1e6, 1),
+            "encode_max_us": round(self.encode_time_max * 1e6, 1),
+            "encode_load": round(self.last_load, 4),
+            "send_backlog": self._send_backlog,
+            "bitrate_changes": self.bitrate_changes,
+            "complexity_changes": self.complexity_changes,
+        }
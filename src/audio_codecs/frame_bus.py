@@ -0,0 +1,260 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 订阅者积压超过上限时的丢弃策略：
+# DROP_OLDEST 丢弃最旧的帧，保留最近 max_pending 帧（KWS/VAD 等实时消费者）
+# SKIP_TO_LATEST 丢弃全部积压，只保留最新一帧（电平表等只关心当前值）
+DROP_OLDEST = "drop_oldest"
+SKIP_TO_LATEST = "skip_to_latest"
+
+
+class FrameSubscription:
+    """
+    帧总线的一个订阅者：持有自己的读游标，只由订阅者自己的线程读取.
+
+    生产者从不修改游标，也不等待订阅者；积压超过 max_pending 时，
+    由订阅者在下一次读取时按丢弃策略跳过帧，并计入 dropped。
+    """
+
+    def __init__(
+        self,
+        bus: "AudioFrameBus",
+        name: str,
+        max_pending: int,
+        policy: str,
+        notify: Optional[threading.Event],
+    ):
+        self._bus = bus
+        self.name = name
+        self.max_pending = max_pending
+        self.policy = policy
+        self.notify = notify
+
+        # 下一帧的序号（订阅时从最新位置开始，不回放历史帧）
+        self.cursor = bus.sequence
+        self._last_read: Optional[int] = None
+
+        # 统计（仅订阅者线程写入）
+        self.frames_read = 0
+        self.dropped = 0
+
+    def pending(self) -> int:
+        """
+        尚未读取的帧数（未应用丢弃策略）.
+        """
+        return self._bus.sequence - self.cursor
+
+    def _apply_policy(self) -> int:
+        """
+        按丢弃策略跳过积压帧，返回当前可读帧数.
+        """
+        pending = self._bus.sequence - self.cursor
+        if pending > self.max_pending:
+            keep = self.max_pending if self.policy == DROP_OLDEST else 1
+            skip = pending - keep
+            self.cursor += skip
+            self.dropped += skip
+            pending = keep
+        return pending
+
+    def read(self) -> Optional[np.ndarray]:
+        """读取下一帧，返回总线槽位的只读视图（无拷贝），没有新帧时返回 None.
+
+        视图在生产者绕回覆盖该槽位前有效（至少 capacity - max_pending 帧），
+        需要长期保存时请自行拷贝，或用 still_valid() 确认读取期间未被覆盖。
+        """
+        if self._apply_policy() <= 0:
+            return None
+        seq = self.cursor
+        self.cursor = seq + 1
+        self.frames_read += 1
+        self._last_read = seq
+        return self._bus.view(seq)
+
+    def still_valid(self) -> bool:
+        """
+        最近一次 read() 返回的视图是否仍未被生产者覆盖.
+        """
+        if self._last_read is None:
+            return False
+        return self._bus.is_valid(self._last_read)
+
+    def read_into(self, out: np.ndarray) -> int:
+        """把积压的整帧批量拷贝到 out（一维数组），返回样本数.
+
+        拷贝后校验序号：读取期间被生产者覆盖的帧（极慢消费者）计入丢弃并剔除。
+        """
+        frame_size = self._bus.frame_size
+        count = min(self._apply_policy(), len(out) // frame_size)
+        if count <= 0:
+            return 0
+
+        start = self.cursor
+        self._bus.copy_frames(start, count, out)
+
+        # 读取期间已被覆盖的帧（序号落出有效窗口）
+        torn = min(count, self._bus.first_valid() - start)
+        if torn > 0:
+            kept = count - torn
+            out[: kept * frame_size] = out[torn * frame_size : count * frame_size]
+            self.dropped += torn
+            count = kept
+
+        self.cursor = start + count + max(torn, 0)
+        self.frames_read += count
+        return count * frame_size
+
+    def clear(self) -> int:
+        """
+        丢弃全部积压帧（不计入 dropped），返回丢弃的帧数.
+        """
+        head = self._bus.sequence
+        cleared = head - self.cursor
+        self.cursor = head
+        return cleared
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "name": self.name,
+            "policy": self.policy,
+            "max_pending": self.max_pending,
+            "pending": self.pending(),
+            "frames_read": self.frames_read,
+            "dropped": self.dropped,
+        }
+
+
+class AudioFrameBus:
+    """
+    只读音频帧总线：采集线程每帧只拷贝一次，所有消费者共享同一份数据.
+
+    - 预分配 capacity 个帧槽位（二维数组），每个槽位配一个预先创建的只读视图；
+      publish() 把帧拷贝到下一个槽位后递增序号，不分配内存、不加锁
+    - 每个订阅者持有独立游标；一帧的"引用计数"即游标尚未越过它的订阅者数，
+      生产者绕回覆盖时不等待任何订阅者，被越过的订阅者按各自的丢弃策略跳帧
+    - 订阅者列表为不可变元组，订阅/退订时整体替换，生产者遍历快照无需加锁
+
+    单生产者（采集线程），订阅者可在任意线程读取自己的订阅。
+    """
+
+    def __init__(self, frame_size: int, capacity: int = 64, dtype=np.int16):
+        """初始化帧总线.
+
+        Args:
+            frame_size: 每帧样本数
+            capacity: 槽位数（帧）
+            dtype: 样本数据类型
+        """
+        if capacity < 4:
+            raise ValueError(f"帧总线容量过小: {capacity}")
+
+        self.frame_size = int(frame_size)
+        self.capacity = int(capacity)
+        self._slots = np.zeros((self.capacity, self.frame_size), dtype=dtype)
+        self._flat = self._slots.reshape(-1)
+        self._views: List[np.ndarray] = []
+        for slot in self._slots:
+            view = slot.view()
+            view.flags.writeable = False
+            self._views.append(view)
+
+        # 已发布的帧数（下一帧序号），只由生产者写入
+        self.sequence = 0
+
+        self._subscribers: Tuple[FrameSubscription, ...] = ()
+        self._lock = threading.Lock()
+
+    @property
+    def max_pending_limit(self) -> int:
+        """
+        订阅者积压上限的最大值：留出余量，保证保留的最旧帧不会正被覆盖.
+        """
+        return self.capacity - 2
+
+    def subscribe(
+        self,
+        name: str,
+        max_pending: Optional[int] = None,
+        policy: str = DROP_OLDEST,
+        notify: Optional[threading.Event] = None,
+    ) -> FrameSubscription:
+        """添加订阅者.
+
+        Args:
+            name: 订阅者名称（统计用）
+            max_pending: 最大积压帧数，超过按 policy 丢弃，默认取上限
+            policy: DROP_OLDEST 或 SKIP_TO_LATEST
+            notify: 每发布一帧时 set() 的事件，用于唤醒订阅者线程
+        """
+        if policy not in (DROP_OLDEST, SKIP_TO_LATEST):
+            raise ValueError(f"未知的丢弃策略: {policy}")
+        limit = self.max_pending_limit
+        max_pending = limit if max_pending is None else max(1, min(max_pending, limit))
+
+        subscription = FrameSubscription(self, name, max_pending, policy, notify)
+        with self._lock:
+            self._subscribers = self._subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: FrameSubscription):
+        with self._lock:
+            self._subscribers = tuple(
+                s for s in self._subscribers if s is not subscription
+            )
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def publish(self, frame: np.ndarray) -> np.ndarray:
+        """发布一帧（生产者调用），返回该帧槽位的只读视图.
+
+        Args:
+            frame: 一帧样本，长度必须等于 frame_size
+        """
+        seq = self.sequence
+        slot = seq % self.capacity
+        self._slots[slot] = frame
+        # 数据写完后再发布序号
+        self.sequence = seq + 1
+
+        for subscription in self._subscribers:
+            if subscription.notify is not None:
+                subscription.notify.set()
+        return self._views[slot]
+
+    def view(self, seq: int) -> np.ndarray:
+        return self._views[seq % self.capacity]
+
+    def first_valid(self) -> int:
+        """
+        仍完整可读的最旧序号（更旧的槽位可能已被覆盖或正在写入）.
+        """
+        return self.sequence - self.capacity + 1
+
+    def is_valid(self, seq: int) -> bool:
+        return seq >= self.first_valid()
+
+    def copy_frames(self, start: int, count: int, out: np.ndarray):
+        """
+        把序号 [start, start + count) 的帧拷贝到 out（环绕时最多两段）.
+        """
+        frame_size = self.frame_size
+        slot = start % self.capacity
+        first = min(count, self.capacity - slot)
+        out[: first * frame_size] = self._flat[
+            slot * frame_size : (slot + first) * frame_size
+        ]
+        if count > first:
+            out[first * frame_size : count * frame_size] = self._flat[
+                : (count - first) * frame_size
+            ]
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "frames_published": self.sequence,
+            "capacity": self.capacity,
+            "subscribers": [s.get_stats() for s in self._subscribers],
+        }
@@ -0,0 +1,232 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class OpusJitterBuffer:
+    """
+    接收端 Opus 抖动缓冲区（位于解码器之前）.
+
+    工作方式：
+    - 预缓冲：每段语音开始时先积累到目标深度（或等待目标时长）再开始输出
+    - 自适应目标深度：按 RFC 3550 思路估计到达间隔抖动，只统计"晚到"部分，
+      目标深度 = 一帧 + jitter_factor × 抖动估计，限定在 [min, max] 范围
+    - 丢包隐藏：只针对真实的序号空洞（已缓存更后面的包）且播放即将断流时，
+      下一包可用则用 FEC 恢复，否则 PLC
+    - 缓冲区取空（无后续包）时不做隐藏：在有限时间内等待晚到的包，
+      超时视为语音段结束，下一个包重新预缓冲
+
+    输出为解码指令列表 [(kind, packet)]，由调用方负责实际解码：
+    - NORMAL: 正常解码 packet
+    - FEC: 用 packet（下一包）的带内 FEC 恢复当前帧
+    - PLC: 空包解码，由 libopus 生成隐藏帧
+
+    序号可选：WebSocket 等可靠传输没有序号，按到达顺序自动编号；
+    此时不会出现空洞，只会出现晚到导致的断流。
+    """
+
+    NORMAL = "normal"
+    FEC = "fec"
+    PLC = "plc"
+
+    def __init__(
+        self,
+        frame_duration_ms: int,
+        min_target_ms: Optional[float] = None,
+        max_target_ms: float = 400.0,
+        jitter_factor: float = 3.0,
+        max_late_wait_ms: Optional[float] = None,
+    ):
+        """初始化抖动缓冲区.
+
+        Args:
+            frame_duration_ms: 每个 Opus 包的帧长（毫秒）
+            min_target_ms: 目标深度下限，默认一帧
+            max_target_ms: 目标深度上限
+            jitter_factor: 抖动估计到目标深度的放大系数
+            max_late_wait_ms: 缓冲区取空后等待晚到包的最长时间，默认为当前目标深度
+        """
+        self.frame_ms = float(frame_duration_ms)
+        self.min_target_ms = float(min_target_ms or frame_duration_ms)
+        self.max_target_ms = max(float(max_target_ms), self.min_target_ms)
+        self.jitter_factor = jitter_factor
+        self.max_late_wait_ms = max_late_wait_ms
+
+        self._packets: Dict[int, bytes] = {}
+        self._next_seq: Optional[int] = None
+        self._auto_seq = 0
+        self._started = False
+        self._spurt_start: Optional[float] = None
+        self._last_arrival: Optional[float] = None
+        self._jitter_ms = 0.0
+        self._dry_since: Optional[float] = None
+
+        # 统计
+        self.received = 0
+        self.late_dropped = 0
+        self.duplicates = 0
+        self.concealed_plc = 0
+        self.recovered_fec = 0
+        self.lost = 0
+        self.prebuffers = 0
+
+    @property
+    def active(self) -> bool:
+        """
+        是否仍需定时驱动（正在输出或有待输出的包）.
+        """
+        return self._started or bool(self._packets)
+
+    def target_ms(self) -> float:
+        """
+        当前自适应目标深度（毫秒）.
+        """
+        target = self.frame_ms + self.jitter_factor * self._jitter_ms
+        return min(max(target, self.min_target_ms), self.max_target_ms)
+
+    def buffered_ms(self) -> float:
+        """
+        已缓冲但尚未输出的音频时长（毫秒）.
+        """
+        return len(self._packets) * self.frame_ms
+
+    def push(
+        self,
+        packet: bytes,
+        sequence: Optional[int] = None,
+        arrival: Optional[float] = None,
+    ) -> bool:
+        """放入一个 Opus 包.
+
+        Args:
+            packet: Opus 数据
+            sequence: 传输层序号，None 时按到达顺序自动编号
+            arrival: 到达时间（time.monotonic），默认当前时间
+
+        Returns:
+            True=已缓存, False=晚到或重复被丢弃
+        """
+        now = time.monotonic() if arrival is None else arrival
+        if sequence is None:
+            sequence = self._auto_seq
+        self._auto_seq = sequence + 1
+
+        # 到达间隔抖动估计（只统计晚到部分；超长间隔视为新语音段，不计入）
+        if self._last_arrival is not None:
+            gap_ms = (now - self._last_arrival) * 1000.0
+            if gap_ms <= self.max_target_ms + self.frame_ms:
+                late_ms = max(gap_ms - self.frame_ms, 0.0)
+                self._jitter_ms += (late_ms - self._jitter_ms) / 16.0
+        self._last_arrival = now
+
+        # 空闲时以新包重新同步序号
+        if not self._started and not self._packets:
+            self._next_seq = sequence
+            self._spurt_start = now
+
+        if sequence < self._next_seq:
+            self.late_dropped += 1
+            return False
+        if sequence in self._packets:
+            self.duplicates += 1
+            return False
+
+        self._packets[sequence] = packet
+        self.received += 1
+        return True
+
+    def pop_ready(
+        self, playback_ms: float, now: Optional[float] = None
+    ) -> List[Tuple[str, Optional[bytes]]]:
+        """取出当前应当解码的指令.
+
+        Args:
+            playback_ms: 播放缓冲区中剩余的 PCM 时长（毫秒），用于判断是否即将断流
+            now: 当前时间（time.monotonic），默认当前时间
+
+        Returns:
+            [(kind, packet)] 解码指令列表，按播放顺序排列
+        """
+        now = time.monotonic() if now is None else now
+        out: List[Tuple[str, Optional[bytes]]] = []
+
+        if not self._started:
+            if not self._packets:
+                return out
+            waited_ms = (now - self._spurt_start) * 1000.0
+            target = self.target_ms()
+            if self.buffered_ms() < target and waited_ms < target:
+                return out
+            self._started = True
+            self.prebuffers += 1
+
+        while True:
+            packet = self._packets.pop(self._next_seq, None)
+            if packet is not None:
+                out.append((self.NORMAL, packet))
+                self._next_seq += 1
+                self._dry_since = None
+                continue
+
+            # 只有即将断流时才做隐藏，否则继续等待晚到/乱序的包
+            headroom_ms = playback_ms + len(out) * self.frame_ms
+            if headroom_ms >= self.frame_ms:
+                break
+
+            if self._packets:
+                # 序号空洞：视为丢包，优先用下一包的 FEC 恢复
+                following = self._packets.get(self._next_seq + 1)
+                if following is not None:
+                    out.append((self.FEC, following))
+                    self.recovered_fec += 1
+                else:
+                    out.append((self.PLC, None))
+                    self.concealed_plc += 1
+                self.lost += 1
+                self._next_seq += 1
+                self._dry_since = None
+                continue
+
+            # 无后续包：可能只是晚到，也可能是语音段结束，不做隐藏也不推进序号；
+            # 等待超过上限后结束本段
+            if self._dry_since is None:
+                self._dry_since = now
+            wait_ms = self.max_late_wait_ms
+            if wait_ms is None:
+                wait_ms = self.target_ms()
+            if (now - self._dry_since) * 1000.0 >= wait_ms:
+                self._started = False
+                self._dry_since = None
+            break
+
+        return out
+
+    def reset(self) -> int:
+        """清空缓冲区（打断/清队列时调用），保留抖动估计.
+
+        Returns:
+            被丢弃的包数
+        """
+        cleared = len(self._packets)
+        self._packets.clear()
+        self._started = False
+        self._dry_since = None
+        self._last_arrival = None
+        return cleared
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取抖动缓冲区统计信息.
+        """
+        return {
+            "depth_packets": len(self._packets),
+            "depth_ms": round(self.buffered_ms(), 1),
+            "target_ms": round(self.target_ms(), 1),
+            "jitter_ms": round(self._jitter_ms, 2),
+            "received": self.received,
+            "late_dropped": self.late_dropped,
+            "duplicates": self.duplicates,
+            "lost": self.lost,
+            "concealed_plc": self.concealed_plc,
+            "recovered_fec": self.recovered_fec,
+            "prebuffers": self.prebuffers,
+        }
@@ -0,0 +1,214 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import numpy as np
+
+
+class PlaybackBuffer:
+    """
+    跨线程播放缓冲区：事件循环写入，PortAudio 输出回调读取.
+
+    设计要点：
+    - 容量按毫秒计算（而非帧数），与帧长配置无关
+    - 回调侧 get_nowait() 非阻塞，只持有极短的锁
+    - 生产者侧提供可等待的 wait_for_room()，用于 MusicPlayer 背压；
+      回调释放空间后通过 call_soon_threadsafe 唤醒，且仅在有等待者时唤醒
+    - 统计欠载（underrun）、溢出（overrun）和丢弃帧数
+    """
+
+    def __init__(self, sample_rate: int, max_duration_ms: int):
+        """初始化播放缓冲区.
+
+        Args:
+            sample_rate: 缓冲数据的采样率（单声道）
+            max_duration_ms: 最大缓冲时长（毫秒）
+        """
+        self.sample_rate = sample_rate
+        self.max_duration_ms = max_duration_ms
+        self._max_samples = int(sample_rate * max_duration_ms / 1000)
+
+        self._frames: Deque[np.ndarray] = deque()
+        self._queued_samples = 0
+        self._lock = threading.RLock()
+
+        # 背压等待者（事件循环侧）
+        self._room_event: Optional[asyncio.Event] = None
+        self._room_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._room_needed = 0
+
+        # 回调侧状态：上一次读取是否拿到数据，用于识别欠载
+        self._was_playing = False
+
+        # 统计
+        self.underruns = 0
+        self.overruns = 0
+        self.dropped_frames = 0
+
+    # ============= 生产者侧（事件循环） =============
+
+    def put(self, frame: np.ndarray, replace_oldest: bool = True) -> bool:
+        """放入一帧 PCM 数据.
+
+        Args:
+            frame: 单声道 int16 帧
+            replace_oldest: True=空间不足时丢弃最旧帧腾出空间, False=直接拒绝新帧
+
+        Returns:
+            True=成功入队, False=空间不足且未入队
+        """
+        n = len(frame)
+        with self._lock:
+            if self._queued_samples + n > self._max_samples:
+                if not replace_oldest:
+                    # 由调用方决定等待（背压）或放弃，不计入溢出
+                    return False
+                self.overruns += 1
+                while self._frames and self._queued_samples + n > self._max_samples:
+                    dropped = self._frames.popleft()
+                    self._queued_samples -= len(dropped)
+                    self.dropped_frames += 1
+            self._frames.append(frame)
+            self._queued_samples += n
+            return True
+
+    def put_many(self, frames: List[np.ndarray], replace_oldest: bool = True) -> int:
+        """一次放入多帧（单次加锁，保持顺序）.
+
+        Args:
+            frames: 单声道 int16 帧列表
+            replace_oldest: 同 put()
+
+        Returns:
+            成功入队的帧数
+        """
+        count = 0
+        with self._lock:
+            for frame in frames:
+                if not self.put(frame, replace_oldest=replace_oldest):
+                    break
+                count += 1
+        return count
+
+    async def wait_for_room(
+        self, samples: int, timeout: Optional[float] = None
+    ) -> bool:
+        """等待缓冲区腾出指定样本数的空间.
+
+        Args:
+            samples: 需要的空闲样本数
+            timeout: 超时时间（秒），None 表示一直等待
+
+        Returns:
+            True=已有足够空间, False=等待超时
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        samples = min(samples, self._max_samples)
+
+        while True:
+            remaining = None if deadline is None else deadline - loop.time()
+            with self._lock:
+                if self._max_samples - self._queued_samples >= samples:
+                    return True
+                if remaining is not None and remaining <= 0:
+                    return False
+                event = asyncio.Event()
+                self._room_event = event
+                self._room_loop = loop
+                self._room_needed = samples
+
+            try:
+                await asyncio.wait_for(event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    if self._room_event is event:
+                        self._room_event = None
+                return False
+
+    # ============= 消费者侧（音频回调线程） =============
+
+    def get_nowait(self) -> Optional[np.ndarray]:
+        """
+        取出一帧，无数据时返回 None（非阻塞，可在实时回调中调用）.
+        """
+        with self._lock:
+            if not self._frames:
+                if self._was_playing:
+                    # 播放过程中数据断流（包含一次正常播放结束）
+                    self.underruns += 1
+                    self._was_playing = False
+                return None
+
+            frame = self._frames.popleft()
+            self._queued_samples -= len(frame)
+            self._was_playing = True
+
+            event = self._room_event
+            if (
+                event is not None
+                and self._max_samples - self._queued_samples >= self._room_needed
+            ):
+                self._room_event = None
+                loop = self._room_loop
+            else:
+                event = None
+
+        if event is not None:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # 事件循环已关闭
+                pass
+        return frame
+
+    # ============= 通用 =============
+
+    def clear(self) -> int:
+        """清空缓冲区.
+
+        Returns:
+            被丢弃的帧数
+        """
+        with self._lock:
+            cleared = len(self._frames)
+            self._frames.clear()
+            self._queued_samples = 0
+            self._was_playing = False
+
+            event = self._room_event
+            self._room_event = None
+            loop = self._room_loop
+
+        if event is not None:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass
+        return cleared
+
+    def empty(self) -> bool:
+        return not self._frames
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def buffered_ms(self) -> float:
+        """
+        当前缓冲的音频时长（毫秒）.
+        """
+        return self._queued_samples * 1000.0 / self.sample_rate
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取缓冲区统计信息.
+        """
+        return {
+            "buffered_frames": len(self._frames),
+            "buffered_ms": round(self.buffered_ms(), 1),
+            "max_duration_ms": self.max_duration_ms,
+            "underruns": self.underruns,
+            "overruns": self.overruns,
+            "dropped_frames": self.dropped_frames,
+        }
@@ -0,0 +1,236 @@
+from typing import Dict, Union
+
+import numpy as np
+import soxr
+from numpy.lib.stride_tricks import as_strided
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 重采样档位：soxr 质量等级 + 整数倍快速路径的 FIR 参数
+#   fir_taps: 每相抽头数（越多阻带越深、群时延越大）
+#   kaiser_beta: Kaiser 窗参数（越大旁瓣越低、过渡带越宽）
+#   cutoff: 截止频率相对新奈奎斯特频率的比例
+RESAMPLE_PROFILES: Dict[str, Dict[str, Union[str, int, float]]] = {
+    "low_latency": {
+        "soxr_quality": "QQ",
+        "fir_taps": 8,
+        "kaiser_beta": 5.0,
+        "cutoff": 0.85,
+    },
+    "balanced": {
+        "soxr_quality": "MQ",
+        "fir_taps": 16,
+        "kaiser_beta": 7.0,
+        "cutoff": 0.9,
+    },
+    "hq": {
+        "soxr_quality": "HQ",
+        "fir_taps": 32,
+        "kaiser_beta": 9.0,
+        "cutoff": 0.92,
+    },
+}
+
+DEFAULT_RESAMPLE_PROFILE = "low_latency"
+
+
+def get_resample_profile(name: str) -> Dict[str, Union[str, int, float]]:
+    """获取重采样档位参数，未知档位回退到默认档位.
+
+    Args:
+        name: 档位名（low_latency / balanced / hq）
+    """
+    profile = RESAMPLE_PROFILES.get(str(name).lower())
+    if profile is None:
+        logger.warning(
+            f"未知的重采样档位: {name}，使用默认档位 {DEFAULT_RESAMPLE_PROFILE}"
+        )
+        profile = RESAMPLE_PROFILES[DEFAULT_RESAMPLE_PROFILE]
+    return profile
+
+
+class PolyphaseResampler:
+    """
+    整数倍采样率转换（纯 NumPy 多相 FIR），接口与 soxr.ResampleStream 一致.
+
+    - 抽取（如 48k→16k）：只计算保留下来的输出点，跨步窗口视图 + 矩阵向量乘
+    - 插值（如 24k→48k）：滤波器拆成 up 个子相分别卷积，交织得到输出
+    - 跨调用保留滤波历史，流式处理无拼接断点
+    - 群时延固定（约 taps/2 个低采样率样本），每块输出长度严格等于输入长度 × 比例，
+      不像 soxr 那样按内部分块输出、长度抖动
+
+    int16 输入在 float32 下计算，输出时四舍五入并限幅。
+
+    注意：纯 NumPy 实现的单帧调用开销仍高于 soxr（见 scripts/resampler_benchmark.py），
+    因此默认关闭，通过 AUDIO_DEVICES.RESAMPLE_INTEGER_FAST_PATH 启用。
+    """
+
+    def __init__(
+        self,
+        in_rate: int,
+        out_rate: int,
+        dtype: str = "float32",
+        taps: int = 16,
+        kaiser_beta: float = 7.0,
+        cutoff: float = 0.9,
+    ):
+        """初始化多相重采样器.
+
+        Args:
+            in_rate: 输入采样率
+            out_rate: 输出采样率，与 in_rate 必须成整数倍关系
+            dtype: 输入/输出数据类型（float32 或 int16）
+            taps: 每相抽头数
+            kaiser_beta: Kaiser 窗参数
+            cutoff: 截止频率相对新奈奎斯特频率的比例
+        """
+        if in_rate % out_rate == 0:
+            self.down, self.up = in_rate // out_rate, 1
+        elif out_rate % in_rate == 0:
+            self.down, self.up = 1, out_rate // in_rate
+        else:
+            raise ValueError(f"采样率不成整数倍: {in_rate} → {out_rate}")
+
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.dtype = np.dtype(dtype)
+
+        factor = max(self.down, self.up)
+        length = taps * factor
+        # 窗函数法设计低通：截止于较低采样率奈奎斯特频率的 cutoff 倍
+        fc = 0.5 * cutoff / factor
+        n = np.arange(length) - (length - 1) / 2.0
+        h = 2 * fc * np.sinc(2 * fc * n) * np.kaiser(length, kaiser_beta)
+        h /= h.sum()
+
+        if self.down > 1:
+            # 抽取：窗口内样本按时间正序，与反转后的滤波器做点积
+            self._window = length
+            self._kernel = h[::-1].astype(np.float32)
+        else:
+            # 插值：拆成 up 个子相（各自为普通 FIR），补偿插零带来的 1/up 增益
+            self._window = taps
+            self._phases = [
+                (h[p :: self.up] * self.up).astype(np.float32) for p in range(self.up)
+            ]
+
+        # 滤波历史 + 当前块的连续工作缓冲区，前 _filled 个样本有效
+        self._buffer = np.zeros(self._window - 1 + 4096, dtype=np.float32)
+        self._filled = self._window - 1
+
+    def resample_chunk(self, x: np.ndarray, last: bool = False) -> np.ndarray:
+        """重采样一块数据.
+
+        Args:
+            x: 一维输入数据
+            last: 是否为最后一块（为 True 时补零冲刷滤波器尾部）
+
+        Returns:
+            重采样后的一维数据，类型与 dtype 一致
+        """
+        x = np.asarray(x).reshape(-1)
+        if last:
+            x = np.concatenate((x, np.zeros(self._window - 1, dtype=x.dtype)))
+
+        needed = self._filled + len(x)
+        if needed > len(self._buffer):
+            grown = np.zeros(needed * 2, dtype=np.float32)
+            grown[: self._filled] = self._buffer[: self._filled]
+            self._buffer = grown
+        self._buffer[self._filled : needed] = x
+        data = self._buffer[:needed]
+
+        if self.down > 1:
+            count = (needed - self._window) // self.down + 1
+            if count <= 0:
+                self._filled = needed
+                return np.zeros(0, dtype=self.dtype)
+            # 每个输出点对应一个步长为 down 的窗口（行间跨 down 个样本，BLAS 可直接处理）
+            itemsize = data.itemsize
+            windows = as_strided(
+                data,
+                shape=(count, self._window),
+                strides=(self.down * itemsize, itemsize),
+                writeable=False,
+            )
+            out = np.dot(windows, self._kernel)
+            consumed = count * self.down
+        else:
+            count = needed - self._window + 1
+            out = np.empty((count, self.up), dtype=np.float32)
+            for p, phase in enumerate(self._phases):
+                out[:, p] = np.convolve(data, phase, mode="valid")
+            out = out.reshape(-1)
+            consumed = count
+
+        # 未消费的样本移到缓冲区开头，作为下一块的滤波历史
+        remaining = needed - consumed
+        self._buffer[:remaining] = self._buffer[consumed:needed]
+        self._filled = remaining
+
+        if last:
+            self.clear()
+
+        if self.dtype == np.int16:
+            return np.clip(np.rint(out), -32768, 32767).astype(np.int16)
+        return out.astype(self.dtype, copy=False)
+
+    def clear(self):
+        """
+        清空滤波历史.
+        """
+        self._buffer[: self._window - 1] = 0
+        self._filled = self._window - 1
+
+
+def create_resampler(
+    in_rate: int,
+    out_rate: int,
+    dtype: str = "float32",
+    profile: str = DEFAULT_RESAMPLE_PROFILE,
+    integer_fast_path: bool = False,
+):
+    """按档位创建单声道流式重采样器.
+
+    启用快速路径且采样率成整数倍时使用 PolyphaseResampler，否则使用 soxr.ResampleStream。
+
+    Args:
+        in_rate: 输入采样率
+        out_rate: 输出采样率
+        dtype: 数据类型（float32 或 int16）
+        profile: 档位名（low_latency / balanced / hq）
+        integer_fast_path: 是否启用整数倍快速路径
+
+    Returns:
+        具有 resample_chunk(x, last=False) 方法的重采样器
+    """
+    params = get_resample_profile(profile)
+    integer_ratio = in_rate % out_rate == 0 or out_rate % in_rate == 0
+    if integer_fast_path and integer_ratio:
+        return PolyphaseResampler(
+            in_rate,
+            out_rate,
+            dtype=dtype,
+            taps=int(params["fir_taps"]),
+            kaiser_beta=float(params["kaiser_beta"]),
+            cutoff=float(params["cutoff"]),
+        )
+    return soxr.ResampleStream(
+        in_rate,
+        out_rate,
+        num_channels=1,
+        dtype=dtype,
+        quality=str(params["soxr_quality"]),
+    )
+
+
+def describe_resampler(resampler) -> str:
+    """
+    重采样器后端的简短描述（用于日志）.
+    """
+    if isinstance(resampler, PolyphaseResampler):
+        ratio = f"1/{resampler.down}" if resampler.down > 1 else f"x{resampler.up}"
+        return f"多相FIR {ratio}"
+    return "soxr"
@@ -0,0 +1,138 @@
+from typing import Union
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    预分配的单生产者/单消费者（SPSC）音频环形缓冲区.
+
+    设计要点：
+    - 底层为固定容量的 NumPy 一维数组，运行期间不再分配内存
+    - 读写位置为单调递增计数器，生产者只修改写位置，消费者只修改读位置，
+      依赖 GIL 保证整数赋值的原子性，无需加锁即可跨线程使用
+    - 写入/读取均为向量化切片拷贝（环绕时最多两段），替代逐样本 popleft
+
+    使用约束：
+    - 同一时刻只允许一个线程写入、一个线程读取
+    - 缓冲区满时丢弃本次写入中放不下的部分（新数据），由调用方决定容量
+    """
+
+    def __init__(self, capacity: int, dtype: Union[np.dtype, str] = np.float32):
+        """初始化环形缓冲区.
+
+        Args:
+            capacity: 最大可容纳的样本数
+            dtype: 样本数据类型
+        """
+        if capacity <= 0:
+            raise ValueError(f"环形缓冲区容量必须为正数: {capacity}")
+
+        self._capacity = int(capacity)
+        self._buffer = np.zeros(self._capacity, dtype=dtype)
+
+        # 单调递增的读写计数器（取模得到实际下标）
+        self._write_pos = 0
+        self._read_pos = 0
+
+        # 因缓冲区已满而丢弃的样本数
+        self.dropped_samples = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._buffer.dtype
+
+    def __len__(self) -> int:
+        return self._write_pos - self._read_pos
+
+    def available(self) -> int:
+        """
+        可读取的样本数.
+        """
+        return self._write_pos - self._read_pos
+
+    def free(self) -> int:
+        """
+        可写入的样本数.
+        """
+        return self._capacity - (self._write_pos - self._read_pos)
+
+    def write(self, data: np.ndarray) -> int:
+        """写入样本（生产者调用）.
+
+        Args:
+            data: 一维样本数组，会按缓冲区 dtype 拷贝
+
+        Returns:
+            实际写入的样本数，缓冲区不足时小于 len(data)
+        """
+        n = len(data)
+        free = self._capacity - (self._write_pos - self._read_pos)
+        if n > free:
+            self.dropped_samples += n - free
+            n = free
+        if n <= 0:
+            return 0
+
+        start = self._write_pos % self._capacity
+        first = min(n, self._capacity - start)
+        self._buffer[start : start + first] = data[:first]
+        if n > first:
+            self._buffer[: n - first] = data[first:n]
+
+        # 数据拷贝完成后再发布写位置
+        self._write_pos += n
+        return n
+
+    def read_into(self, out: np.ndarray) -> int:
+        """读取样本到预分配数组（消费者调用）.
+
+        Args:
+            out: 目标一维数组，最多读取 len(out) 个样本
+
+        Returns:
+            实际读取的样本数，数据不足时小于 len(out)，其余部分保持不变
+        """
+        n = min(len(out), self._write_pos - self._read_pos)
+        if n <= 0:
+            return 0
+
+        start = self._read_pos % self._capacity
+        first = min(n, self._capacity - start)
+        out[:first] = self._buffer[start : start + first]
+        if n > first:
+            out[first:n] = self._buffer[: n - first]
+
+        # 数据拷贝完成后再释放读位置
+        self._read_pos += n
+        return n
+
+    def skip(self, n: int) -> int:
+        """丢弃最旧的样本（消费者调用）.
+
+        Args:
+            n: 要丢弃的样本数
+
+        Returns:
+            实际丢弃的样本数
+        """
+        n = min(n, self._write_pos - self._read_pos)
+        if n <= 0:
+            return 0
+        self._read_pos += n
+        return n
+
+    def clear(self) -> int:
+        """清空缓冲区（O(1)，只移动读位置）.
+
+        Returns:
+            被丢弃的样本数
+        """
+        write_pos = self._write_pos
+        cleared = write_pos - self._read_pos
+        self._read_pos = write_pos
+        return cleared
@@ -0,0 +1,536 @@
+import os
+import struct
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 录音格式
+FORMAT_OPUS = "opus"  # 直接封装已编码的 Opus 包（Ogg Opus），不重新编码
+FORMAT_PCM = "pcm"  # 16-bit PCM WAV：麦克风处理后的帧 + 实际播放的音频
+
+# 录音轨道
+TRACK_MIC = "mic"
+TRACK_SPEAKER = "speaker"
+
+
+def _build_crc_table():
+    table = []
+    for i in range(256):
+        crc = i << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else crc << 1
+        table.append(crc & 0xFFFFFFFF)
+    return table
+
+
+_CRC_TABLE = _build_crc_table()
+
+
+def ogg_crc(data: bytes) -> int:
+    """
+    Ogg 页校验和（CRC-32，多项式 0x04C11DB7，不反射，初值 0）.
+    """
+    crc = 0
+    table = _CRC_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ table[((crc >> 24) ^ byte) & 0xFF]
+    return crc
+
+
+def opus_packet_samples(packet: bytes) -> int:
+    """
+    按 TOC 字节计算 Opus 包时长（48kHz 样本数，RFC 6716 3.1）.
+    """
+    if not packet:
+        return 0
+    toc = packet[0]
+    config = toc >> 3
+    if config < 12:
+        # SILK：10/20/40/60ms
+        frame = (480, 960, 1920, 2880)[config & 3]
+    elif config < 16:
+        # Hybrid：10/20ms
+        frame = 480 if config & 1 == 0 else 960
+    else:
+        # CELT：2.5/5/10/20ms
+        frame = (120, 240, 480, 960)[config & 3]
+
+    code = toc & 3
+    if code == 0:
+        count = 1
+    elif code in (1, 2):
+        count = 2
+    else:
+        count = packet[1] & 0x3F if len(packet) > 1 else 0
+    return frame * count
+
+
+class OggOpusWriter:
+    """
+    把已编码的 Opus 包封装为 Ogg 页（RFC 7845），单声道，不重新编码.
+
+    每页最多 PAGE_PACKETS 个包（约 1 秒），页数据交给 write 回调输出。
+    """
+
+    PAGE_PACKETS = 50
+
+    def __init__(self, write, input_sample_rate: int, serial: int, tags=()):
+        """初始化 Ogg Opus 封装.
+
+        Args:
+            write: 输出函数，接收一页的字节
+            input_sample_rate: 原始采样率（写入 OpusHead，仅供播放器参考）
+            serial: Ogg 逻辑流序列号
+            tags: OpusTags 注释（"KEY=value" 字符串）
+        """
+        self._write = write
+        self._serial = serial & 0xFFFFFFFF
+        self._page_seq = 0
+        self._granule = 0
+        self._packets = []
+        self._segments = 0
+
+        head = struct.pack("<8sBBHIhB", b"OpusHead", 1, 1, 0, input_sample_rate, 0, 0)
+        self._write_page([head], granule=0, flags=0x02)
+
+        vendor = b"py-xiaozhi"
+        comments = [tag.encode("utf-8") for tag in tags]
+        opus_tags = struct.pack("<8sI", b"OpusTags", len(vendor)) + vendor
+        opus_tags += struct.pack("<I", len(comments))
+        for comment in comments:
+            opus_tags += struct.pack("<I", len(comment)) + comment
+        self._write_page([opus_tags], granule=0, flags=0)
+
+    def write_packet(self, packet: bytes):
+        segments = len(packet) // 255 + 1
+        if self._packets and (
+            self._segments + segments > 255 or len(self._packets) >= self.PAGE_PACKETS
+        ):
+            self.flush()
+        self._packets.append(packet)
+        self._segments += segments
+
+    def flush(self, eos: bool = False):
+        """
+        把缓存的包写成一页（eos=True 时标记流结束）.
+        """
+        if not self._packets and not eos:
+            return
+        for packet in self._packets:
+            self._granule += opus_packet_samples(packet)
+        self._write_page(self._packets, self._granule, 0x04 if eos else 0)
+        self._packets = []
+        self._segments = 0
+
+    def _write_page(self, packets, granule: int, flags: int):
+        lacing = bytearray()
+        for packet in packets:
+            lacing.extend(b"\xff" * (len(packet) // 255))
+            lacing.append(len(packet) % 255)
+        header = struct.pack(
+            "<4sBBqIIIB",
+            b"OggS",
+            0,
+            flags,
+            granule,
+            self._serial,
+            self._page_seq,
+            0,
+            len(lacing),
+        )
+        page = bytearray(header + lacing + b"".join(packets))
+        struct.pack_into("<I", page, 22, ogg_crc(page))
+        self._page_seq += 1
+        self._write(bytes(page))
+
+
+def _wav_header(sample_rate: int, data_bytes: int) -> bytes:
+    """
+    16-bit 单声道 WAV 文件头.
+    """
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        1,
+        sample_rate,
+        sample_rate * 2,
+        2,
+        16,
+        b"data",
+        data_bytes,
+    )
+
+
+class _TrackFile:
+    """
+    一路录音的当前文件：自管写缓冲（写线程独占），按大小/时长轮转.
+    """
+
+    def __init__(self, recorder: "SessionRecorder", track: str, sample_rate: int):
+        self._recorder = recorder
+        self.track = track
+        self.sample_rate = sample_rate
+        self.path: Optional[Path] = None
+        self._file = None
+        self._ogg: Optional[OggOpusWriter] = None
+        self._buffer = bytearray()
+        self._opened_at = 0.0
+        self._last_flush = 0.0
+        self.file_bytes = 0
+
+        # 统计
+        self.audio_seconds = 0.0
+        self.files_opened = 0
+
+    def _open(self):
+        recorder = self._recorder
+        self.path = recorder.next_path(self.track)
+        self._file = open(self.path, "wb", buffering=0)
+        self._opened_at = self._last_flush = time.monotonic()
+        self.file_bytes = 0
+        self.files_opened += 1
+        if recorder.format == FORMAT_OPUS:
+            self._ogg = OggOpusWriter(
+                self._append,
+                self.sample_rate,
+                serial=hash((self.path.name, self.track)),
+                tags=(f"TRACK={self.track}", f"FILE={self.path.name}"),
+            )
+        else:
+            # 数据长度在关闭时回填
+            self._append(_wav_header(self.sample_rate, 0))
+
+    def _append(self, data: bytes):
+        self._buffer.extend(data)
+        self.file_bytes += len(data)
+        if len(self._buffer) >= self._recorder.write_chunk:
+            self._flush_buffer()
+
+    def _flush_buffer(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._recorder.bytes_written += len(self._buffer)
+            self._recorder.write_ops += 1
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def write_packet(self, packet: bytes):
+        self._rotate_if_needed()
+        self._ogg.write_packet(packet)
+        self.audio_seconds += opus_packet_samples(packet) / 48000
+
+    def write_pcm(self, pcm: bytes):
+        self._rotate_if_needed()
+        self._append(pcm)
+        self.audio_seconds += len(pcm) / 2 / self.sample_rate
+
+    def tick(self, now: float):
+        """
+        定时刷盘：缓冲数据最多滞留 flush_interval 秒.
+        """
+        if self._file is None:
+            return
+        if now - self._last_flush >= self._recorder.flush_interval:
+            if self._ogg is not None:
+                self._ogg.flush()
+            self._flush_buffer()
+
+    def _rotate_if_needed(self):
+        if self._file is None:
+            self._open()
+            return
+        recorder = self._recorder
+        if (
+            self.file_bytes >= recorder.max_file_bytes
+            or time.monotonic() - self._opened_at >= recorder.max_file_seconds
+        ):
+            self.close()
+            self._open()
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            if self._ogg is not None:
+                self._ogg.flush(eos=True)
+                self._ogg = None
+            self._flush_buffer()
+            if self._recorder.format == FORMAT_PCM:
+                data_bytes = self.file_bytes - 44
+                self._file.seek(0)
+                self._file.write(_wav_header(self.sample_rate, data_bytes))
+                self._recorder.write_ops += 1
+        finally:
+            self._file.close()
+            self._file = None
+            self._recorder.enforce_retention()
+
+
+class SessionRecorder:
+    """
+    会话录音器：记录设备实际听到和播放的音频，用于现场问题排查.
+
+    - opus 格式：上行编码包（on_uplink_packet）和下行收到的包（on_downlink_packet）
+      直接封装为 Ogg Opus，不重新编码，每小时每路仅数 MB
+    - pcm 格式：作为 AudioListener 接收处理后的麦克风帧（on_audio_data），
+      作为播放抽头接收实际播放的音频（on_playback），分别写入 WAV
+    - 音频线程只把数据放入有界队列（满时丢弃并计数），不做任何磁盘 I/O；
+      写线程自管写缓冲，每 write_chunk 字节或 flush_interval 秒落盘一次，
+      写调用次数 ≈ 数据量 / write_chunk + 时长 / flush_interval，有上界
+    - 文件按大小/时长轮转，目录总大小超过上限时删除最旧的录音
+    """
+
+    # 文件后缀
+    SUFFIXES = {FORMAT_OPUS: ".opus", FORMAT_PCM: ".wav"}
+
+    def __init__(
+        self,
+        directory,
+        fmt: str = FORMAT_OPUS,
+        mic_sample_rate: int = 16000,
+        speaker_sample_rate: int = 24000,
+        max_file_mb: float = 20,
+        max_file_seconds: float = 1800,
+        max_total_mb: float = 500,
+        queue_size: int = 1000,
+        write_chunk_kb: int = 64,
+        flush_interval: float = 5.0,
+    ):
+        """初始化录音器.
+
+        Args:
+            directory: 录音目录
+            fmt: FORMAT_OPUS 或 FORMAT_PCM
+            mic_sample_rate: 上行采样率
+            speaker_sample_rate: 下行采样率（pcm 格式为播放设备采样率）
+            max_file_mb: 单个文件大小上限，超过轮转
+            max_file_seconds: 单个文件时长上限（秒），超过轮转
+            max_total_mb: 录音目录总大小上限，超过删除最旧文件
+            queue_size: 待写队列上限（条），满时丢弃新数据
+            write_chunk_kb: 写缓冲大小，攒满后一次写入
+            flush_interval: 最长刷盘间隔（秒）
+        """
+        if fmt not in self.SUFFIXES:
+            raise ValueError(f"不支持的录音格式: {fmt}")
+        self.directory = Path(directory)
+        self.format = fmt
+        self.max_file_bytes = int(max_file_mb * 1024 * 1024)
+        self.max_file_seconds = max_file_seconds
+        self.max_total_bytes = int(max_total_mb * 1024 * 1024)
+        self.write_chunk = int(write_chunk_kb * 1024)
+        self.flush_interval = flush_interval
+
+        self._queue: Deque[Tuple[str, object]] = deque()
+        self._queue_size = queue_size
+        self._event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._file_index = 0
+
+        self._tracks = {
+            TRACK_MIC: _TrackFile(self, TRACK_MIC, mic_sample_rate),
+            TRACK_SPEAKER: _TrackFile(self, TRACK_SPEAKER, speaker_sample_rate),
+        }
+
+        # 统计（回调侧只写 dropped，其余仅写线程写入）
+        self.dropped = 0
+        self.bytes_written = 0
+        self.write_ops = 0
+        self.files_deleted = 0
+        self.write_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """
+        启动写线程.
+        """
+        if self._running:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="session-recorder", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"会话录音已启动: {self.directory}（{self.format}）")
+
+    def stop(self, timeout: float = 2.0):
+        """
+        停止写线程，写完队列中剩余数据并关闭文件.
+        """
+        if not self._running:
+            return
+        self._running = False
+        self._event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        logger.info(f"会话录音已停止: {self.get_stats()}")
+
+    # ---------- 音频线程调用（不阻塞） ----------
+
+    def _enqueue(self, track: str, payload):
+        if not self._running:
+            return
+        if len(self._queue) >= self._queue_size:
+            self.dropped += 1
+            return
+        self._queue.append((track, payload))
+        self._event.set()
+
+    def on_uplink_packet(self, packet: bytes):
+        """
+        上行 Opus 编码包（采集线程）.
+        """
+        self._enqueue(TRACK_MIC, packet)
+
+    def on_downlink_packet(self, packet: bytes):
+        """
+        下行收到的 Opus 包（事件循环线程）.
+        """
+        self._enqueue(TRACK_SPEAKER, packet)
+
+    def on_audio_data(self, audio_data: np.ndarray):
+        """
+        AudioListener：处理后的麦克风帧（16kHz int16，采集线程）.
+        """
+        self._enqueue(TRACK_MIC, audio_data.tobytes())
+
+    def on_playback(self, mono: Optional[np.ndarray], frames: int):
+        """播放抽头：本块实际输出的单声道 float32 音频（输出回调线程）.
+
+        Args:
+            mono: 播放的样本，None 表示本块输出静音
+            frames: 本块帧数
+        """
+        self._enqueue(TRACK_SPEAKER, frames if mono is None else mono.tobytes())
+
+    # ---------- 写线程 ----------
+
+    def _run(self):
+        tracks = self._tracks
+        while True:
+            self._event.wait(timeout=self.flush_interval)
+            self._event.clear()
+
+            while self._queue:
+                track, payload = self._queue.popleft()
+                try:
+                    self._write(tracks[track], payload)
+                except OSError as e:
+                    self.write_errors += 1
+                    logger.warning(f"写入录音失败: {e}")
+
+            now = time.monotonic()
+            for track_file in tracks.values():
+                try:
+                    track_file.tick(now)
+                except OSError as e:
+                    self.write_errors += 1
+                    logger.warning(f"录音刷盘失败: {e}")
+
+            if not self._running:
+                break
+
+        for track_file in tracks.values():
+            try:
+                track_file.close()
+            except OSError as e:
+                logger.warning(f"关闭录音文件失败: {e}")
+
+    def _write(self, track_file: _TrackFile, payload):
+        if self.format == FORMAT_OPUS:
+            track_file.write_packet(payload)
+        elif isinstance(payload, int):
+            track_file.write_pcm(bytes(payload * 2))
+        elif track_file.track == TRACK_SPEAKER:
+            # 播放抽头为 float32，转换为 int16
+            samples = np.frombuffer(payload, dtype=np.float32)
+            pcm = np.clip(samples * 32767.0, -32768, 32767).astype(np.int16)
+            track_file.write_pcm(pcm.tobytes())
+        else:
+            track_file.write_pcm(payload)
+
+    def next_path(self, track: str) -> Path:
+        """
+        新录音文件路径：时间戳-序号-轨道.
+        """
+        self._file_index += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        suffix = self.SUFFIXES[self.format]
+        return self.directory / f"{stamp}-{self._file_index:04d}-{track}{suffix}"
+
+    def enforce_retention(self):
+        """
+        目录总大小超过上限时，从最旧的已关闭录音开始删除.
+        """
+        open_paths = {t.path for t in self._tracks.values() if t._file is not None}
+        files = []
+        total = 0
+        for suffix in self.SUFFIXES.values():
+            for path in self.directory.glob(f"*{suffix}"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                total += stat.st_size
+                if path not in open_paths:
+                    files.append((stat.st_mtime, stat.st_size, path))
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_total_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.files_deleted += 1
+            except OSError as e:
+                logger.warning(f"删除旧录音失败 {path}: {e}")
+
+    def get_stats(self) -> Dict[str, object]:
+        """
+        获取录音统计，含每小时音频（两路时长之和）的磁盘写入量和写调用次数.
+        """
+        tracks = {}
+        audio_seconds = 0.0
+        for name, track_file in self._tracks.items():
+            audio_seconds += track_file.audio_seconds
+            tracks[name] = {
+                "audio_seconds": round(track_file.audio_seconds, 1),
+                "files": track_file.files_opened,
+                "current_file": track_file.path.name if track_file.path else None,
+            }
+        hours = audio_seconds / 3600
+        return {
+            "format": self.format,
+            "tracks": tracks,
+            "queued": len(self._queue),
+            "dropped": self.dropped,
+            "bytes_written": self.bytes_written,
+            "write_ops": self.write_ops,
+            "bytes_per_audio_hour": (
+                round(self.bytes_written / hours) if hours else None
+            ),
+            "write_ops_per_audio_hour": (
+                round(self.write_ops / hours) if hours else None
+            ),
+            "files_deleted": self.files_deleted,
+            "write_errors": self.write_errors,
+        }
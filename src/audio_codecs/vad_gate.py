@@ -0,0 +1,208 @@
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+import numpy as np
+
+
+class VoiceActivityGate:
+    """
+    上行语音活动门限：只把语音帧（及其前后缓冲）交给网络发送.
+
+    判决（逐帧，16kHz 单声道 int16）：
+    - 能量：帧能量（dBFS）须高于绝对门限，且高于自适应噪声底 snr_db 以上
+    - 频谱平坦度：语音频带（100Hz~4kHz）功率谱的几何均值/算术均值，
+      语音有谐波结构，平坦度明显低于风扇/空调等宽带噪声
+    - 连续 onset_frames 帧判为语音才开启，避免瞬态噪声误触发
+
+    门控：
+    - 预缓冲（pre-roll）：关闭期间保留最近若干帧已编码包，开启时先补发，
+      不丢失起始音节
+    - 拖尾（hangover）：语音结束后继续发送一段时间，保留尾音，并让服务端 VAD
+      看到足够的静音以判断说话结束
+    - 编码器仍逐帧编码（保持 Opus 编码状态连续），只丢弃非语音包
+
+    process() 只在采集线程调用；reset() 可在任意线程调用，由采集线程在下一帧执行。
+    """
+
+    # 参与平坦度计算的频带（Hz）
+    SPEECH_BAND = (100.0, 4000.0)
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_duration_ms: int,
+        energy_threshold_db: float = -50.0,
+        snr_db: float = 9.0,
+        flatness_threshold: float = 0.45,
+        hangover_ms: int = 800,
+        preroll_ms: int = 240,
+    ):
+        """初始化语音门限.
+
+        Args:
+            sample_rate: 采样率
+            frame_duration_ms: 帧长（毫秒）
+            energy_threshold_db: 绝对能量门限（dBFS），低于此值一律视为静音
+            snr_db: 相对自适应噪声底的最小信噪比（dB）
+            flatness_threshold: 频谱平坦度上限（0~1），超过视为噪声
+            hangover_ms: 语音结束后继续发送的时长（毫秒）
+            preroll_ms: 语音开始前补发的时长（毫秒）
+        """
+        frame_size = int(sample_rate * frame_duration_ms / 1000)
+        self.energy_threshold_db = energy_threshold_db
+        self.snr_db = snr_db
+        self.flatness_threshold = flatness_threshold
+        self._hangover_frames = max(0, round(hangover_ms / frame_duration_ms))
+        self._onset_frames = max(1, round(40 / frame_duration_ms))
+
+        # 频谱分析预分配
+        self._window = np.hanning(frame_size).astype(np.float32)
+        self._frame = np.zeros(frame_size, dtype=np.float32)
+        freqs = np.fft.rfftfreq(frame_size, 1.0 / sample_rate)
+        low, high = self.SPEECH_BAND
+        self._band = slice(
+            int(np.searchsorted(freqs, low)), int(np.searchsorted(freqs, high))
+        )
+
+        self._preroll: Deque[bytes] = deque(
+            maxlen=max(0, round(preroll_ms / frame_duration_ms))
+        )
+        self._noise_floor_db = energy_threshold_db
+        self._open = False
+        self._speech_run = 0
+        self._hangover_left = 0
+        self._reset_requested = False
+
+        # 统计
+        self.frames_total = 0
+        self.frames_sent = 0
+        self.frames_suppressed = 0
+        self.bytes_sent = 0
+        self.bytes_suppressed = 0
+        self.speech_segments = 0
+
+    def reset(self):
+        """
+        请求重置门控状态（丢弃预缓冲，门限回到关闭），在下一帧生效.
+        """
+        self._reset_requested = True
+
+    def _apply_reset(self):
+        self._reset_requested = False
+        self._preroll.clear()
+        self._open = False
+        self._speech_run = 0
+        self._hangover_left = 0
+
+    def _analyze(self, pcm: np.ndarray) -> Tuple[float, float]:
+        """
+        返回 (帧能量 dBFS, 语音频带频谱平坦度).
+        """
+        frame = self._frame
+        np.multiply(pcm, 1.0 / 32768.0, out=frame)
+        energy = float(np.dot(frame, frame)) / len(frame)
+        energy_db = 10.0 * float(np.log10(energy + 1e-10))
+        if energy_db < self.energy_threshold_db:
+            return energy_db, 1.0
+
+        frame *= self._window
+        power = np.abs(np.fft.rfft(frame)[self._band]) ** 2 + 1e-12
+        flatness = float(np.exp(np.mean(np.log(power))) / np.mean(power))
+        return energy_db, flatness
+
+    def is_speech(self, pcm: np.ndarray) -> bool:
+        """判断一帧是否为语音，并更新自适应噪声底.
+
+        Args:
+            pcm: 一帧 int16 单声道音频
+        """
+        energy_db, flatness = self._analyze(pcm)
+        speech = (
+            energy_db >= self.energy_threshold_db
+            and energy_db >= self._noise_floor_db + self.snr_db
+            and flatness <= self.flatness_threshold
+        )
+        if not speech:
+            # 噪声底快降慢升：安静时迅速跟随，持续噪声时缓慢抬升
+            rate = 0.3 if energy_db < self._noise_floor_db else 0.02
+            self._noise_floor_db += rate * (energy_db - self._noise_floor_db)
+            self._noise_floor_db = max(self._noise_floor_db, -90.0)
+        return speech
+
+    def process(self, pcm: np.ndarray, packet: bytes) -> List[bytes]:
+        """处理一帧：返回本帧应发送的包列表（可能包含补发的预缓冲包，或为空）.
+
+        Args:
+            pcm: 一帧 int16 单声道音频（编码前）
+            packet: 该帧的 Opus 编码包
+        """
+        if self._reset_requested:
+            self._apply_reset()
+
+        self.frames_total += 1
+        speech = self.is_speech(pcm)
+        self._speech_run = self._speech_run + 1 if speech else 0
+
+        if self._open:
+            if speech:
+                self._hangover_left = self._hangover_frames
+            elif self._hangover_left > 0:
+                self._hangover_left -= 1
+            else:
+                self._open = False
+
+        elif self._speech_run >= self._onset_frames:
+            # 语音开始：先补发预缓冲，再发送本帧
+            self._open = True
+            self._hangover_left = self._hangover_frames
+            self.speech_segments += 1
+            packets = list(self._preroll)
+            self._preroll.clear()
+            for buffered in packets:
+                self.frames_suppressed -= 1
+                self.bytes_suppressed -= len(buffered)
+            packets.append(packet)
+            self._count_sent(packets)
+            return packets
+
+        if self._open:
+            self._count_sent((packet,))
+            return [packet]
+
+        # 门限关闭：暂存到预缓冲（被挤出的包即被丢弃）
+        self._preroll.append(packet)
+        self.frames_suppressed += 1
+        self.bytes_suppressed += len(packet)
+        return []
+
+    def _count_sent(self, packets):
+        self.frames_sent += len(packets)
+        self.bytes_sent += sum(len(p) for p in packets)
+
+    @property
+    def is_open(self) -> bool:
+        return self._open
+
+    @property
+    def in_speech(self) -> bool:
+        """
+        最近一帧是否判为语音.
+        """
+        return self._speech_run > 0
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取门控统计信息.
+        """
+        total_bytes = self.bytes_sent + self.bytes_suppressed
+        return {
+            "open": self._open,
+            "noise_floor_db": round(self._noise_floor_db, 1),
+            "frames_total": self.frames_total,
+            "frames_sent": self.frames_sent,
+            "frames_suppressed": self.frames_suppressed,
+            "bytes_sent": self.bytes_sent,
+            "bytes_suppressed": self.bytes_suppressed,
+            "suppressed_ratio": round(self.bytes_suppressed / max(total_bytes, 1), 3),
+            "speech_segments": self.speech_segments,
+        }
@@ -1,11 +1,15 @@
 import asyncio
+import threading
 import time
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
 
 import numpy as np
 import sherpa_onnx
 
+from src.audio_codecs.frame_bus import DROP_OLDEST, FrameSubscription
+from src.audio_codecs.ring_buffer import AudioRingBuffer
+from src.audio_codecs.vad_gate import VoiceActivityGate
 from src.constants.constants import AudioConfig
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
@@ -14,17 +18,93 @@ from src.utils.resource_finder import resource_finder
 logger = get_logger(__name__)
 
 
+def create_keyword_spotter(
+    model_dir: Path,
+    sample_rate: int,
+    num_threads: int,
+    provider: str,
+    max_active_paths: int,
+    keywords_score: float,
+    keywords_threshold: float,
+    num_trailing_blanks: int,
+) -> sherpa_onnx.KeywordSpotter:
+    """按唤醒词配置从本地模型目录创建 KeywordSpotter（检测器与离线评测共用）.
+
+    Raises:
+        FileNotFoundError: 模型目录缺少必需文件
+    """
+    model_dir = Path(model_dir)
+    encoder_path = model_dir / "encoder.onnx"
+    decoder_path = model_dir / "decoder.onnx"
+    joiner_path = model_dir / "joiner.onnx"
+    tokens_path = model_dir / "tokens.txt"
+    keywords_path = model_dir / "keywords.txt"
+
+    # 检查模型文件
+    required_files = [
+        encoder_path,
+        decoder_path,
+        joiner_path,
+        tokens_path,
+        keywords_path,
+    ]
+    for file_path in required_files:
+        if not file_path.exists():
+            raise FileNotFoundError(f"模型文件不存在: {file_path}")
+
+    return sherpa_onnx.KeywordSpotter(
+        tokens=str(tokens_path),
+        encoder=str(encoder_path),
+        decoder=str(decoder_path),
+        joiner=str(joiner_path),
+        keywords_file=str(keywords_path),
+        num_threads=num_threads,
+        sample_rate=sample_rate,
+        feature_dim=80,
+        max_active_paths=max_active_paths,
+        keywords_score=keywords_score,
+        keywords_threshold=keywords_threshold,
+        num_trailing_blanks=num_trailing_blanks,
+        provider=provider,
+    )
+
+
 class WakeWordDetector:
+    """
+    Sherpa-ONNX 唤醒词检测器.
+
+    线程模型：
+    - 采集线程：AudioCodec 把 int16 帧发布到采集帧总线并唤醒解码线程，检测器不在采集线程做任何事
+    - 解码线程：每次唤醒取出所有已到达的音频，凑够 decode_chunk_ms 后整块送入
+      KeywordSpotter 并解码，不占用事件循环
+    - 事件循环：检测结果和错误通过 call_soon_threadsafe 投递回来，在循环线程执行回调
+
+    前置门限（PRE_GATE）：
+    - 解码线程先逐帧做能量/频谱平坦度判决（VoiceActivityGate），安静时只写入
+      约 1 秒的 PCM 预缓冲，不调用 KeywordSpotter
+    - 出现类语音帧时先把预缓冲送入解码流，再送入后续音频，保证唤醒词开头完整；
+      语音结束并经过拖尾后关闭门限并重置解码流
+    - 统计处理耗时占音频时长的比例（占空比），区分门限关闭时的空闲占空比
+    """
+
+    # 解码错误达到此次数后停止检测
+    MAX_ERRORS = 5
+    # 帧总线订阅的最大积压（秒），解码线程跟不上时丢弃最旧的帧
+    RING_SECONDS = 2
+    # 占空比日志的输出间隔（按已处理音频时长计，秒）
+    REPORT_INTERVAL_S = 300
+    # 前置门限的频谱平坦度上限：比上行门限宽松，宁可多唤醒解码也不漏检
+    PRE_GATE_FLATNESS = 0.6
 
     def __init__(self):
         # 基本属性
         self.audio_codec = None
         self.is_running_flag = False
         self.paused = False
-        self.detection_task = None
-
-        # 音频数据队列（用于异步处理）
-        self._audio_queue = asyncio.Queue(maxsize=100)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._event = threading.Event()
+        self._callback_tasks = set()
 
         # 防重复触发机制
         self.last_detection_time = 0
@@ -34,6 +114,20 @@ class WakeWordDetector:
         self.on_detected_callback: Optional[Callable] = None
         self.on_error: Optional[Callable] = None
 
+        # 统计（仅解码线程写入）
+        self.chunks_decoded = 0
+        self.decode_time_total = 0.0
+        self.decode_time_max = 0.0
+        self.detections = 0
+        self.frames_analyzed = 0
+        self.frames_fed = 0
+        self.gate_opens = 0
+        self.busy_time_total = 0.0
+        self.audio_time_total = 0.0
+        self.idle_busy_time = 0.0
+        self.idle_audio_time = 0.0
+        self._last_report_audio_time = 0.0
+
         # 配置检查
         config = ConfigManager.get_instance()
         if not config.get_config("WAKE_WORD_OPTIONS.USE_WAKE_WORD", False):
@@ -54,6 +148,41 @@ class WakeWordDetector:
         self._init_kws_model()
         self._validate_config()
 
+        # 采集帧总线订阅（start 时创建）及解码批次（预分配）
+        self._subscription: Optional[FrameSubscription] = None
+        capacity = self.sample_rate * self.RING_SECONDS
+        self._batch_int16 = np.zeros(capacity, dtype=np.int16)
+        self._batch = np.zeros(capacity, dtype=np.float32)
+        self._frame_samples = AudioConfig.INPUT_FRAME_SIZE
+        self._chunk_samples = max(
+            self._frame_samples,
+            int(self.sample_rate * self.decode_chunk_ms / 1000),
+        )
+
+        # 前置门限及其 PCM 预缓冲（整帧存取）
+        self._pre_gate: Optional[VoiceActivityGate] = None
+        self._gate_open = False
+        self._hangover_left = 0
+        preroll_frames = max(
+            1, round(self.pre_gate_preroll_ms / AudioConfig.FRAME_DURATION)
+        )
+        self._hangover_frames = max(
+            0, round(self.pre_gate_hangover_ms / AudioConfig.FRAME_DURATION)
+        )
+        self._preroll = AudioRingBuffer(
+            preroll_frames * self._frame_samples, dtype=np.int16
+        )
+        self._preroll_batch = np.zeros(self._preroll.capacity, dtype=np.int16)
+        if self.pre_gate_enabled:
+            self._pre_gate = VoiceActivityGate(
+                self.sample_rate,
+                AudioConfig.FRAME_DURATION,
+                energy_threshold_db=self.pre_gate_energy_db,
+                snr_db=self.pre_gate_snr_db,
+                flatness_threshold=self.PRE_GATE_FLATNESS,
+            )
+            self._batch = np.zeros(capacity + self._preroll.capacity, dtype=np.float32)
+
     def _load_config(self, config):
         """
         加载配置参数.
@@ -86,6 +215,25 @@ class WakeWordDetector:
         self.num_trailing_blanks = config.get_config(
             "WAKE_WORD_OPTIONS.NUM_TRAILING_BLANKS", 1
         )
+        # 每次送入解码的最小音频时长（毫秒），越大单次开销摊得越薄，检测延迟越高
+        self.decode_chunk_ms = config.get_config(
+            "WAKE_WORD_OPTIONS.DECODE_CHUNK_MS", 100
+        )
+
+        # 前置门限：安静时不送入解码，降低空闲 CPU
+        self.pre_gate_enabled = config.get_config("WAKE_WORD_OPTIONS.PRE_GATE", True)
+        self.pre_gate_energy_db = config.get_config(
+            "WAKE_WORD_OPTIONS.PRE_GATE_ENERGY_DB", -55.0
+        )
+        self.pre_gate_snr_db = config.get_config(
+            "WAKE_WORD_OPTIONS.PRE_GATE_SNR_DB", 6.0
+        )
+        self.pre_gate_preroll_ms = config.get_config(
+            "WAKE_WORD_OPTIONS.PRE_GATE_PREROLL_MS", 1000
+        )
+        self.pre_gate_hangover_ms = config.get_config(
+            "WAKE_WORD_OPTIONS.PRE_GATE_HANGOVER_MS", 600
+        )
 
         logger.info(
             f"KWS配置加载完成 - 阈值: {self.keywords_threshold}, 分数: {self.keywords_score}"
@@ -96,41 +244,17 @@ class WakeWordDetector:
         初始化Sherpa-ONNX KeywordSpotter模型.
         """
         try:
-            # 检查模型文件
-            encoder_path = self.model_dir / "encoder.onnx"
-            decoder_path = self.model_dir / "decoder.onnx"
-            joiner_path = self.model_dir / "joiner.onnx"
-            tokens_path = self.model_dir / "tokens.txt"
-            keywords_path = self.model_dir / "keywords.txt"
-
-            required_files = [
-                encoder_path,
-                decoder_path,
-                joiner_path,
-                tokens_path,
-                keywords_path,
-            ]
-            for file_path in required_files:
-                if not file_path.exists():
-                    raise FileNotFoundError(f"模型文件不存在: {file_path}")
-
             logger.info(f"加载Sherpa-ONNX KeywordSpotter模型: {self.model_dir}")
 
-            # 创建KeywordSpotter
-            self.keyword_spotter = sherpa_onnx.KeywordSpotter(
-                tokens=str(tokens_path),
-                encoder=str(encoder_path),
-                decoder=str(decoder_path),
-                joiner=str(joiner_path),
-                keywords_file=str(keywords_path),
-                num_threads=self.num_threads,
+            self.keyword_spotter = create_keyword_spotter(
+                self.model_dir,
                 sample_rate=self.sample_rate,
-                feature_dim=80,
+                num_threads=self.num_threads,
+                provider=self.provider,
                 max_active_paths=self.max_active_paths,
                 keywords_score=self.keywords_score,
                 keywords_threshold=self.keywords_threshold,
                 num_trailing_blanks=self.num_trailing_blanks,
-                provider=self.provider,
             )
 
             logger.info("Sherpa-ONNX KeywordSpotter模型加载成功")
@@ -145,23 +269,6 @@ class WakeWordDetector:
         """
         self.on_detected_callback = callback
 
-    def on_audio_data(self, audio_data: np.ndarray):
-        if not self.enabled or not self.is_running_flag or self.paused:
-            return
-
-        try:
-            # 将音频数据放入队列，由检测循环异步处理
-            self._audio_queue.put_nowait(audio_data.copy())
-        except asyncio.QueueFull:
-            # 队列满时丢弃最旧数据
-            try:
-                self._audio_queue.get_nowait()
-                self._audio_queue.put_nowait(audio_data.copy())
-            except asyncio.QueueEmpty:
-                self._audio_queue.put_nowait(audio_data.copy())
-        except Exception as e:
-            logger.debug(f"音频数据入队失败: {e}")
-
     async def start(self, audio_codec) -> bool:
         if not self.enabled:
             logger.warning("唤醒词功能未启用")
@@ -173,109 +280,243 @@ class WakeWordDetector:
 
         try:
             self.audio_codec = audio_codec
-            self.is_running_flag = True
+            self._loop = asyncio.get_running_loop()
             self.paused = False
 
             # 创建检测流
             self.stream = self.keyword_spotter.create_stream()
+            self._reset_gate()
+
+            # 订阅采集帧总线（共享帧，无拷贝），新帧到达时唤醒解码线程
+            self._subscription = audio_codec.subscribe_frames(
+                "kws",
+                max_pending=self.RING_SECONDS * 1000 // AudioConfig.FRAME_DURATION,
+                policy=DROP_OLDEST,
+                notify=self._event,
+            )
 
-            # 注册为音频监听器（观察者模式）
-            self.audio_codec.add_audio_listener(self)
-
-            # 启动检测任务
-            self.detection_task = asyncio.create_task(self._detection_loop())
+            # 启动解码线程
+            self.is_running_flag = True
+            self._thread = threading.Thread(
+                target=self._detection_loop, name="kws-decode", daemon=True
+            )
+            self._thread.start()
 
-            logger.info("Sherpa-ONNX KeywordSpotter检测器启动成功（观察者模式）")
+            logger.info("Sherpa-ONNX KeywordSpotter检测器启动成功（独立解码线程）")
             return True
         except Exception as e:
             logger.error(f"启动KeywordSpotter检测器失败: {e}")
+            self.is_running_flag = False
             self.enabled = False
             return False
 
-    async def _detection_loop(self):
+    def _detection_loop(self):
         """
-        检测循环.
+        解码线程主循环.
         """
         error_count = 0
-        MAX_ERRORS = 5
 
         while self.is_running_flag:
-            try:
-                if self.paused:
-                    await asyncio.sleep(0.1)
-                    continue
+            self._event.wait(timeout=0.1)
+            self._event.clear()
+            if not self.is_running_flag:
+                break
 
-                # 处理音频数据
-                await self._process_audio()
+            if self.paused:
+                self._subscription.clear()
+                self._reset_gate()
+                continue
 
-                # 减少延迟提高响应速度
-                await asyncio.sleep(0.005)
+            try:
+                # 一次取出所有已到达的音频，不足一个解码块时等下次唤醒
+                while (
+                    self._subscription.pending() * self._frame_samples
+                    >= self._chunk_samples
+                ):
+                    self._decode_available()
                 error_count = 0
 
-            except asyncio.CancelledError:
-                break
             except Exception as e:
                 error_count += 1
-                logger.error(f"KWS检测循环错误({error_count}/{MAX_ERRORS}): {e}")
-
-                # 调用错误回调
-                if self.on_error:
-                    try:
-                        if asyncio.iscoroutinefunction(self.on_error):
-                            await self.on_error(e)
-                        else:
-                            self.on_error(e)
-                    except Exception as callback_error:
-                        logger.error(f"执行错误回调时失败: {callback_error}")
-
-                if error_count >= MAX_ERRORS:
+                logger.error(
+                    f"KWS检测循环错误({error_count}/{self.MAX_ERRORS}): {e}",
+                    exc_info=True,
+                )
+                self._post(self._dispatch_error, e)
+
+                if error_count >= self.MAX_ERRORS:
                     logger.critical("达到最大错误次数，停止KWS检测")
+                    self.is_running_flag = False
                     break
-                await asyncio.sleep(1)
+                time.sleep(1)
+                self._subscription.clear()
+                self._reset_gate()
 
-    async def _process_audio(self):
+    def _decode_available(self):
         """
-        处理音频数据.
+        处理订阅中积压的全部音频（解码线程调用）.
         """
-        try:
-            if not self.stream:
-                return
+        count = self._subscription.read_into(self._batch_int16)
+        pcm = self._batch_int16[:count]
+
+        start = time.perf_counter()
+        if self._pre_gate is None:
+            samples = self._batch[:count]
+            np.multiply(pcm, 1.0 / 32768.0, out=samples)
+            self._decode(samples)
+            idle = False
+        else:
+            idle = self._gate_frames(pcm)
+        elapsed = time.perf_counter() - start
+
+        audio_time = count / self.sample_rate
+        self.busy_time_total += elapsed
+        self.audio_time_total += audio_time
+        if idle:
+            self.idle_busy_time += elapsed
+            self.idle_audio_time += audio_time
+        if self.audio_time_total - self._last_report_audio_time >= (
+            self.REPORT_INTERVAL_S
+        ):
+            self._last_report_audio_time = self.audio_time_total
+            self._report_duty_cycle()
+
+    def _gate_frames(self, pcm: np.ndarray) -> bool:
+        """逐帧前置门限判决，只把语音段（含预缓冲和拖尾）送入解码.
+
+        Returns:
+            整批音频门限均处于关闭状态（未做任何解码）时为 True
+        """
+        frame_samples = self._frame_samples
+        feed = self._batch
+        fed = 0
+        idle = not self._gate_open
+
+        for offset in range(0, len(pcm), frame_samples):
+            frame = pcm[offset : offset + frame_samples]
+            speech = self._pre_gate.is_speech(frame)
+            self.frames_analyzed += 1
+
+            if self._gate_open:
+                if speech:
+                    self._hangover_left = self._hangover_frames
+                elif self._hangover_left > 0:
+                    self._hangover_left -= 1
+                else:
+                    # 语音段结束：解码已送入的音频后重置解码流
+                    self._decode(feed[:fed])
+                    fed = 0
+                    self._gate_open = False
+                    self.keyword_spotter.reset_stream(self.stream)
 
-            try:
-                audio_data = self._audio_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                return
+            elif speech:
+                # 语音开始：先送入预缓冲
+                self._gate_open = True
+                self._hangover_left = self._hangover_frames
+                self.gate_opens += 1
+                idle = False
+                n = self._preroll.read_into(self._preroll_batch)
+                np.multiply(
+                    self._preroll_batch[:n], 1.0 / 32768.0, out=feed[fed : fed + n]
+                )
+                fed += n
+
+            if self._gate_open:
+                np.multiply(frame, 1.0 / 32768.0, out=feed[fed : fed + frame_samples])
+                fed += frame_samples
+                self.frames_fed += 1
+            else:
+                # 门限关闭：写入预缓冲，满时挤掉最旧的一帧
+                if self._preroll.free() < frame_samples:
+                    self._preroll.skip(frame_samples)
+                self._preroll.write(frame)
 
-            if audio_data is None or len(audio_data) == 0:
-                return
+        if fed:
+            self._decode(feed[:fed])
+        return idle
 
-            # 转换音频格式为 float32
-            if audio_data.dtype == np.int16:
-                samples = audio_data.astype(np.float32) / 32768.0
-            else:
-                samples = audio_data.astype(np.float32)
+    def _reset_gate(self):
+        """
+        重置前置门限状态（解码线程或启动前调用）.
+        """
+        self._gate_open = False
+        self._hangover_left = 0
+        self._preroll.clear()
 
-            # 提供音频数据给KeywordSpotter
-            self.stream.accept_waveform(sample_rate=self.sample_rate, waveform=samples)
+    def _decode(self, samples: np.ndarray):
+        """
+        送入一段 float32 音频并解码（解码线程调用）.
+        """
+        if len(samples) == 0:
+            return
+        start = time.perf_counter()
+        spotter = self.keyword_spotter
+        self.stream.accept_waveform(sample_rate=self.sample_rate, waveform=samples)
+        while spotter.is_ready(self.stream):
+            spotter.decode_stream(self.stream)
+            result = spotter.get_result(self.stream)
+            if result:
+                self.detections += 1
+                # 重置流状态，结果交回事件循环处理
+                spotter.reset_stream(self.stream)
+                self._post(self._handle_detection_result, result)
+
+        elapsed = time.perf_counter() - start
+        self.chunks_decoded += 1
+        self.decode_time_total += elapsed
+        if elapsed > self.decode_time_max:
+            self.decode_time_max = elapsed
+
+    def _report_duty_cycle(self):
+        stats = self.get_stats()
+        logger.info(
+            f"KWS占空比: 总体 {stats['duty_cycle']:.2%} | "
+            f"空闲 {stats['idle_duty_cycle']:.2%} | "
+            f"门限开启 {stats['gate_open_ratio']:.1%}（{self.gate_opens} 次）"
+        )
 
-            # 检查是否准备好解码
-            if self.keyword_spotter.is_ready(self.stream):
-                self.keyword_spotter.decode_stream(self.stream)
-                result = self.keyword_spotter.get_result(self.stream)
+    def _post(self, callback: Callable, *args):
+        """
+        把回调投递到事件循环线程执行.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
 
-                if result:
-                    await self._handle_detection_result(result)
-                    # 重置流状态
-                    self.keyword_spotter.reset_stream(self.stream)
+    def _create_task(self, coro):
+        """
+        创建回调任务并保留引用，避免任务未完成即被回收.
+        """
+        task = asyncio.create_task(coro)
+        self._callback_tasks.add(task)
+        task.add_done_callback(self._callback_tasks.discard)
 
-        except Exception as e:
-            logger.error(f"KWS音频处理错误: {e}", exc_info=True)
-            raise  # 重新抛出异常,让 _detection_loop 捕获
+    def _dispatch_error(self, error: Exception):
+        """
+        在事件循环线程调用错误回调.
+        """
+        if not self.on_error:
+            return
+        try:
+            if asyncio.iscoroutinefunction(self.on_error):
+                self._create_task(self.on_error(error))
+            else:
+                self.on_error(error)
+        except Exception as callback_error:
+            logger.error(f"执行错误回调时失败: {callback_error}")
 
-    async def _handle_detection_result(self, result):
+    def _handle_detection_result(self, result):
         """
-        处理检测结果.
+        处理检测结果（事件循环线程）.
         """
+        if not self.is_running_flag:
+            return
+
         # 防重复触发检查
         current_time = time.time()
         if current_time - self.last_detection_time < self.detection_cooldown:
@@ -287,7 +528,7 @@ class WakeWordDetector:
         if self.on_detected_callback:
             try:
                 if asyncio.iscoroutinefunction(self.on_detected_callback):
-                    await self.on_detected_callback(result, result)
+                    self._create_task(self.on_detected_callback(result, result))
                 else:
                     self.on_detected_callback(result, result)
             except Exception as e:
@@ -299,26 +540,60 @@ class WakeWordDetector:
         """
         self.is_running_flag = False
 
-        # 从AudioCodec移除监听器
-        if self.audio_codec:
-            self.audio_codec.remove_audio_listener(self)
+        # 取消帧总线订阅
+        if self.audio_codec and self._subscription:
+            self.audio_codec.unsubscribe_frames(self._subscription)
 
-        if self.detection_task:
-            self.detection_task.cancel()
-            try:
-                await self.detection_task
-            except asyncio.CancelledError:
-                pass
+        # 等待解码线程退出（最多等当前一块解码完成）
+        self._event.set()
+        thread, self._thread = self._thread, None
+        if thread and thread.is_alive():
+            await asyncio.to_thread(thread.join, 1.0)
+        self._subscription = None
 
-        # 清空队列
-        while not self._audio_queue.empty():
-            try:
-                self._audio_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        if self.enabled and self.audio_time_total > 0:
+            self._report_duty_cycle()
 
         logger.info("Sherpa-ONNX KeywordSpotter检测器已停止")
 
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取解码统计信息（时间单位：微秒）.
+
+        duty_cycle 为解码线程处理耗时（门限判决+解码）占已处理音频时长的比例，
+        idle_duty_cycle 只统计门限整批关闭时的部分，即安静环境下的常驻开销。
+        """
+        chunks = max(self.chunks_decoded, 1)
+        return {
+            "pre_gate": self._pre_gate is not None,
+            "duty_cycle": round(
+                self.busy_time_total / max(self.audio_time_total, 1e-9), 5
+            ),
+            "idle_duty_cycle": round(
+                self.idle_busy_time / max(self.idle_audio_time, 1e-9), 5
+            ),
+            "gate_open_ratio": (
+                round(self.frames_fed / max(self.frames_analyzed, 1), 4)
+                if self._pre_gate is not None
+                else 1.0
+            ),
+            "gate_opens": self.gate_opens,
+            "chunks_decoded": self.chunks_decoded,
+            "decode_avg_us": round(self.decode_time_total / chunks * 1e6, 1),
+            "decode_max_us": round(self.decode_time_max * 1e6, 1),
+            "pending_samples": (
+                self._subscription.pending() * self._frame_samples
+                if self._subscription
+                else 0
+            ),
+            "dropped_samples": (
+                self._subscription.dropped * self._frame_samples
+                if self._subscription
+                else 0
+            ),
+            "detections": self.detections,
+        }
+
     def _validate_config(self):
         """
         验证配置参数.
@@ -1,9 +1,13 @@
 import asyncio
 import os
-from typing import Any
+from typing import Any, Optional
 
+from src.audio_codecs.aec_processor import AECProcessor
 from src.audio_codecs.audio_codec import AudioCodec
 from src.plugins.base import Plugin
+from src.protocols.audio_send_queue import DROP_OLDEST
+from src.utils.config_manager import ConfigManager
+from src.utils.latency_tracer import UPLINK_LAST, LatencyTracer
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -22,7 +26,9 @@ class AudioPlugin(Plugin):
         self.codec: AudioCodec | None = None
         self._main_loop = None
         self._send_sem = asyncio.Semaphore(MAX_CONCURRENT_AUDIO_SENDS)
+        self._pending_sends = 0  # 已调度未完成的发送任务数（发送积压）
         self._in_silence_period = False  # 静默期标志，用于防止TTS尾音被捕获
+        self._tracer = LatencyTracer.get_instance()
 
     async def setup(self, app: Any) -> None:
         self.app = app
@@ -32,7 +38,15 @@ class AudioPlugin(Plugin):
             return
 
         try:
-            self.codec = AudioCodec()
+            # 软件AEC：WebRTC APM 在进程内处理（Linux 以本进程播放音频作为参考）
+            config = ConfigManager.get_instance()
+            audio_processor = None
+            if config.get_config("AEC_OPTIONS.ENABLED", False) and config.get_config(
+                "AEC_OPTIONS.SOFTWARE_AEC", False
+            ):
+                audio_processor = AECProcessor()
+
+            self.codec = AudioCodec(audio_processor)
             await self.codec.initialize()
 
             # 设置编码音频回调：直接发送，不走队列
@@ -52,7 +66,7 @@ class AudioPlugin(Plugin):
         if not self.codec:
             return
 
-        from src.constants.constants import DeviceState
+        from src.constants.constants import DeviceState, ListeningMode
 
         # 如果进入监听状态，清空队列并等待硬件输出完全停止
         if state == DeviceState.LISTENING:
@@ -65,6 +79,15 @@ class AudioPlugin(Plugin):
                 # 清空和等待完成后，解除静默期
                 self._in_silence_period = False
 
+            # 自动/实时对话才启用上行语音门限（手动按键说话时全部发送）；
+            # 重置在静默期之后，预缓冲不会带上 TTS 尾音
+            if self.codec:
+                self.codec.set_uplink_gate(
+                    self.app.is_keep_listening()
+                    and self.app.get_listening_mode()
+                    in (ListeningMode.REALTIME, ListeningMode.AUTO_STOP)
+                )
+
     async def on_incoming_json(self, message: Any) -> None:
         """处理 TTS 事件，控制音乐播放.
 
@@ -88,15 +111,18 @@ class AudioPlugin(Plugin):
         except Exception as e:
             logger.error(f"处理 TTS 事件失败: {e}", exc_info=True)
 
-    async def on_incoming_audio(self, data: bytes) -> None:
+    async def on_incoming_audio(
+        self, data: bytes, sequence: Optional[int] = None
+    ) -> None:
         """接收服务端返回的音频数据并播放.
 
         Args:
             data: 服务端返回的Opus编码音频数据
+            sequence: 传输层序列号（MQTT/UDP 提供），缺号由抖动缓冲做 FEC/PLC 补偿
         """
         if self.codec:
             try:
-                await self.codec.write_audio(data)
+                await self.codec.write_audio(data, sequence)
             except Exception as e:
                 logger.debug(f"写入音频数据失败: {e}")
 
@@ -212,6 +238,19 @@ class AudioPlugin(Plugin):
         if not self.app or not self.app.running or not self.app.protocol:
             return
 
+        # 协议自带有界发送队列（丢弃最旧策略）时直接入队，不再每帧创建任务
+        queue = self.app.protocol.audio_send_queue
+        if queue is not None and queue.policy == DROP_OLDEST:
+            if (
+                self.app.protocol.is_audio_channel_opened()
+                and self._should_send_microphone_audio()
+            ):
+                queue.put_nowait(encoded_data)
+                self._tracer.mark_last(UPLINK_LAST)
+            if self.codec:
+                self.codec.report_send_backlog(queue.depth)
+            return
+
         async def _send():
             async with self._send_sem:
                 try:
@@ -222,11 +261,23 @@ class AudioPlugin(Plugin):
                         return
                     if self._should_send_microphone_audio():
                         await self.app.protocol.send_audio(encoded_data)
+                        self._tracer.mark_last(UPLINK_LAST)
                 except Exception:
                     pass
 
         # 创建任务但不等待，实现"发完即忘"
-        self.app.spawn(_send(), name="audio:send")
+        task = self.app.spawn(_send(), name="audio:send")
+        if task is None:
+            return
+        self._pending_sends += 1
+        task.add_done_callback(self._on_send_done)
+        # 发送积压反馈给编码控制器（网络拥塞时降低码率）
+        if self.codec:
+            backlog = self._pending_sends + (queue.depth if queue else 0)
+            self.codec.report_send_backlog(backlog)
+
+    def _on_send_done(self, _task) -> None:
+        self._pending_sends -= 1
 
     def _should_send_microphone_audio(self) -> bool:
         """
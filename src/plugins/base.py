@@ -1,5 +1,5 @@
 import asyncio
-from typing import Any
+from typing import Any, Optional
 
 
 class Plugin:
@@ -38,9 +38,11 @@ class Plugin:
         """
         await asyncio.sleep(0)
 
-    async def on_incoming_audio(self, data: bytes) -> None:
+    async def on_incoming_audio(
+        self, data: bytes, sequence: Optional[int] = None
+    ) -> None:
         """
-        收到音频数据时的通知。
+        收到音频数据时的通知（sequence 为传输层序列号，可能为 None）。
         """
         await asyncio.sleep(0)
 
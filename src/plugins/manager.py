@@ -1,4 +1,4 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
 from .base import Plugin
 
@@ -63,10 +63,12 @@ class PluginManager:
             except Exception:
                 pass
 
-    async def notify_incoming_audio(self, data: bytes) -> None:
+    async def notify_incoming_audio(
+        self, data: bytes, sequence: Optional[int] = None
+    ) -> None:
         for p in list(self._plugins):
             try:
-                await p.on_incoming_audio(data)
+                await p.on_incoming_audio(data, sequence)
             except Exception:
                 pass
 
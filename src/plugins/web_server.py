@@ -12,6 +12,7 @@ from aiohttp import web, WSMsgType
 from src.constants.constants import AbortReason, DeviceState
 from src.core.ota import Ota
 from src.plugins.base import Plugin
+from src.utils.latency_tracer import LatencyTracer
 from src.utils.logging_config import get_logger
 from src.utils.resource_finder import resource_finder
 
@@ -84,6 +85,7 @@ class WebServerPlugin(Plugin):
         self._aiohttp_app.router.add_post("/api/voice/auto", self._handle_auto_conversation)  # fmt: skip
         self._aiohttp_app.router.add_post("/api/abort", self._handle_abort)
         self._aiohttp_app.router.add_get("/api/config", self._handle_config)
+        self._aiohttp_app.router.add_get("/api/latency", self._handle_latency)
         
         # WebSocket 代理路由（用于 Web 前端）
         self._aiohttp_app.router.add_get("/api/ws-proxy", self._handle_websocket_proxy)
@@ -198,6 +200,14 @@ class WebServerPlugin(Plugin):
         await self.app.abort_speaking(AbortReason.USER_INTERRUPTION)
         return web.json_response({"status": "aborted"})
 
+    async def _handle_latency(self, _: web.Request) -> web.Response:
+        """Return per-stage voice latency histograms and recent turns."""
+        stats = LatencyTracer.get_instance().get_stats()
+        codec = getattr(self.app, "audio_codec", None)
+        if codec:
+            stats["interrupt"] = codec.get_interrupt_stats()
+        return web.json_response(stats)
+
     async def _handle_config(self, _: web.Request) -> web.Response:
         """Return minimal config for the web UI."""
         try:
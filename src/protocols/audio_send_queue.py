@@ -0,0 +1,198 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 队列满时的策略：
+# DROP_OLDEST 丢弃最旧的帧，保证发出去的总是最新的音频（默认，实时语音优先低延迟）
+# BLOCK 不丢帧，生产者在 put() 中等待空位（put_nowait() 则拒绝新帧）
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+
+class AudioSendQueue:
+    """
+    上行音频发送队列：每个连接一个发送任务，按序发送有界队列中的帧.
+
+    - 生产者只入队，不再每帧创建一个发送任务
+    - 传输层写缓冲超过 write_buffer_limit 时暂停发送，等待内核/网络排空，
+      期间新帧在队列中按策略淘汰，不会在 websockets 写缓冲中无限堆积
+    - 统计队列深度、丢帧数以及从入队到写入传输层的发送延迟
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], Awaitable[None]],
+        max_frames: int = 10,
+        policy: str = DROP_OLDEST,
+        get_write_buffer_size: Optional[Callable[[], int]] = None,
+        write_buffer_limit: int = 16384,
+        on_error: Optional[Callable[[Exception], Awaitable[None]]] = None,
+    ):
+        """初始化发送队列.
+
+        Args:
+            send: 发送一帧的协程函数
+            max_frames: 队列容量（帧）
+            policy: DROP_OLDEST 或 BLOCK
+            get_write_buffer_size: 返回传输层写缓冲字节数，None 表示不监测
+            write_buffer_limit: 写缓冲上限（字节），超过时暂停发送
+            on_error: 发送失败时调用（之后发送任务退出）
+        """
+        if policy not in (DROP_OLDEST, BLOCK):
+            raise ValueError(f"未知的发送队列策略: {policy}")
+        self.policy = policy
+        self.max_frames = max(1, int(max_frames))
+        self._send = send
+        self._get_write_buffer_size = get_write_buffer_size
+        self._write_buffer_limit = write_buffer_limit
+        self._on_error = on_error
+
+        self._frames: Deque[Tuple[bytes, float]] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        # 统计
+        self.enqueued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self.throttled = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_last = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._frames)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._closed = False
+            self._task = asyncio.create_task(self._sender_loop())
+
+    async def stop(self):
+        """
+        停止发送任务并丢弃未发送的帧.
+        """
+        self._closed = True
+        self._frames.clear()
+        self._not_full.set()
+        task, self._task = self._task, None
+        # 发送失败回调中清理连接时会从发送任务自身调用 stop()
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def put_nowait(self, frame: bytes) -> bool:
+        """非阻塞入队.
+
+        Returns:
+            bool: 是否入队；BLOCK 策略下队列已满时拒绝新帧并返回 False
+        """
+        if self._closed:
+            return False
+        frames = self._frames
+        if len(frames) >= self.max_frames:
+            if self.policy == BLOCK:
+                self.rejected += 1
+                return False
+            frames.popleft()
+            self.dropped += 1
+        frames.append((frame, time.monotonic()))
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, len(frames))
+        if len(frames) >= self.max_frames:
+            self._not_full.clear()
+        self._not_empty.set()
+        return True
+
+    async def put(self, frame: bytes) -> bool:
+        """
+        入队；BLOCK 策略下队列已满时等待空位，DROP_OLDEST 策略下立即返回.
+        """
+        if self.policy == BLOCK:
+            while not self._closed and len(self._frames) >= self.max_frames:
+                self._not_full.clear()
+                await self._not_full.wait()
+        return self.put_nowait(frame)
+
+    async def _wait_write_buffer(self):
+        """
+        传输层写缓冲超过上限时等待排空.
+        """
+        get_size = self._get_write_buffer_size
+        if get_size is None:
+            return
+        if get_size() <= self._write_buffer_limit:
+            return
+        self.throttled += 1
+        while not self._closed and get_size() > self._write_buffer_limit:
+            await asyncio.sleep(0.005)
+
+    async def _sender_loop(self):
+        frames = self._frames
+        try:
+            while not self._closed:
+                if not frames:
+                    self._not_empty.clear()
+                    await self._not_empty.wait()
+                    continue
+
+                await self._wait_write_buffer()
+                if not frames:
+                    continue
+
+                frame, enqueued_at = frames.popleft()
+                self._not_full.set()
+                await self._send(frame)
+
+                latency = time.monotonic() - enqueued_at
+                self.sent += 1
+                self._latency_last = latency
+                self._latency_total += latency
+                self._latency_max = max(self._latency_max, latency)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"上行音频发送失败: {e}")
+            self._closed = True
+            self._frames.clear()
+            self._not_full.set()
+            if self._on_error:
+                await self._on_error(e)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取队列统计（延迟单位毫秒）.
+        """
+        return {
+            "policy": self.policy,
+            "depth": len(self._frames),
+            "max_depth": self.max_depth,
+            "capacity": self.max_frames,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "send_latency_last_ms": round(self._latency_last * 1000, 2),
+            "send_latency_avg_ms": (
+                round(self._latency_total / self.sent * 1000, 2) if self.sent else 0
+            ),
+            "send_latency_max_ms": round(self._latency_max * 1000, 2),
+            "write_buffer_size": (
+                self._get_write_buffer_size() if self._get_write_buffer_size else None
+            ),
+        }
@@ -1,6 +1,5 @@
 import asyncio
 import json
-import socket
 import threading
 import time
 
@@ -10,6 +9,8 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
 from src.constants.constants import AudioConfig
 from src.protocols.protocol import Protocol
+from src.protocols.udp_audio_transport import UdpAudioTransport
+from src.protocols.udp_packet_codec import UdpPacketCodec
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
@@ -23,9 +24,7 @@ class MqttProtocol(Protocol):
         self.loop = loop
         self.config = ConfigManager.get_instance()
         self.mqtt_client = None
-        self.udp_socket = None
-        self.udp_thread = None
-        self.udp_running = False
+        self.udp_transport = None
         self.connected = False
 
         # 连接状态监控
@@ -53,6 +52,58 @@ class MqttProtocol(Protocol):
         self.aes_nonce = None
         self.local_sequence = 0
         self.remote_sequence = 0
+        # 发送/接收各用一个包编解码器（加密上下文带内部状态，收发互不共享）
+        self._tx_codec = None
+        self._rx_codec = None
+        network = "SYSTEM_OPTIONS.NETWORK"
+        self._udp_reorder_window = int(
+            self.config.get_config(f"{network}.UDP_REORDER_WINDOW", 4)
+        )
+        self._udp_reorder_delay = (
+            float(self.config.get_config(f"{network}.UDP_REORDER_DELAY_MS", 60)) / 1000
+        )
+        self._udp_recv_buffer = int(
+            self.config.get_config(f"{network}.UDP_RECV_BUFFER", 262144)
+        )
+        # 接收质量报告（RTCP 风格，定期以 JSON 消息发给服务端）
+        self._udp_report_interval = float(
+            self.config.get_config(f"{network}.UDP_STATS_REPORT_INTERVAL", 10)
+        )
+        self._udp_loss_alert = float(
+            self.config.get_config(f"{network}.UDP_LOSS_ALERT", 0.05)
+        )
+        self._udp_jitter_alert_ms = float(
+            self.config.get_config(f"{network}.UDP_JITTER_ALERT_MS", 50)
+        )
+        self._udp_report_task = None
+        self._server_frame_duration = AudioConfig.FRAME_DURATION
+
+        # 异步发布：paho on_publish 的 mid -> asyncio future
+        self._publish_qos = int(
+            self.config.get_config(f"{network}.MQTT_PUBLISH_QOS", 0)
+        )
+        self._publish_timeout = float(
+            self.config.get_config(f"{network}.MQTT_PUBLISH_TIMEOUT", 5.0)
+        )
+        self._max_inflight = max(
+            1, int(self.config.get_config(f"{network}.MQTT_MAX_INFLIGHT", 8))
+        )
+        self._publish_window = asyncio.Semaphore(self._max_inflight)
+        self._publish_lock = threading.Lock()
+        self._pending_publishes = {}
+        # publish() 返回前就已确认的 mid（网络线程先于登记触发回调）
+        self._early_acks = set()
+        # 已超时放弃、确认可能迟到的 mid
+        self._expired_publishes = set()
+        self._publish_stats = {
+            "published": 0,
+            "acked": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "max_inflight": 0,
+            "ack_total_ms": 0.0,
+            "ack_max_ms": 0.0,
+        }
 
         # 事件
         self.server_hello_event = asyncio.Event()
@@ -136,6 +187,7 @@ class MqttProtocol(Protocol):
 
         # 如果已有MQTT客户端，先断开连接
         if self.mqtt_client:
+            self._fail_pending_publishes("MQTT客户端已重建")
             try:
                 self.mqtt_client.loop_stop()
                 self.mqtt_client.disconnect()
@@ -159,6 +211,7 @@ class MqttProtocol(Protocol):
         # 创建新的MQTT客户端
         self.mqtt_client = mqtt.Client(client_id=self.client_id)
         self.mqtt_client.username_pw_set(self.username, self.password)
+        self.mqtt_client.max_inflight_messages_set(self._max_inflight)
 
         # 根据端口决定是否配置TLS加密连接
         if use_tls:
@@ -220,6 +273,9 @@ class MqttProtocol(Protocol):
                 was_connected = self.connected
                 self.connected = False
 
+                # 等待确认的消息不会再收到回执
+                self._fail_pending_publishes(f"MQTT连接断开(rc={rc})")
+
                 # 通知连接状态变化
                 if self._on_connection_state_changed and was_connected:
                     reason = "正常断开" if rc == 0 else f"异常断开(rc={rc})"
@@ -270,6 +326,8 @@ class MqttProtocol(Protocol):
             MQTT消息发布回调.
             """
             self._last_activity_time = time.time()  # 更新活动时间
+            if client is self.mqtt_client:
+                self._on_publish_ack(mid)
 
         def on_subscribe_callback(client, userdata, mid, granted_qos):
             """
@@ -332,23 +390,25 @@ class MqttProtocol(Protocol):
                     await self._on_network_error("等待响应超时")
                 return False
 
-            # 创建UDP套接字
+            # 创建UDP音频通道（在事件循环中收发）
             try:
-                if self.udp_socket:
-                    self.udp_socket.close()
-
-                self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                self.udp_socket.settimeout(0.5)
-
-                # 启动UDP接收线程
-                if self.udp_thread and self.udp_thread.is_alive():
-                    self.udp_running = False
-                    self.udp_thread.join(1.0)
-
-                self.udp_running = True
-                self.udp_thread = threading.Thread(target=self._udp_receive_thread)
-                self.udp_thread.daemon = True
-                self.udp_thread.start()
+                self._stop_udp_receiver()
+                self.udp_transport = await UdpAudioTransport.open(
+                    self.loop,
+                    self.udp_server,
+                    self.udp_port,
+                    recv_buffer=self._udp_recv_buffer,
+                    decoder=self._decode_udp_packet,
+                    on_packets=self._dispatch_incoming_audio,
+                    reorder_window=self._udp_reorder_window,
+                    reorder_delay=self._udp_reorder_delay,
+                    frame_duration_ms=self._server_frame_duration,
+                )
+                logger.info(f"UDP音频通道已打开: {self.udp_server}:{self.udp_port}")
+                if self._udp_report_interval > 0:
+                    self._udp_report_task = asyncio.create_task(
+                        self._udp_stats_reporter()
+                    )
 
                 self.connected = True
                 self._reconnect_attempts = 0  # 重置重连计数
@@ -407,6 +467,12 @@ class MqttProtocol(Protocol):
                 self.udp_port = udp.get("port")
                 self.aes_key = udp.get("key")
                 self.aes_nonce = udp.get("nonce")
+                self._tx_codec = UdpPacketCodec(self.aes_key, self.aes_nonce)
+                self._rx_codec = UdpPacketCodec(self.aes_key, self.aes_nonce)
+                audio_params = data.get("audio_params") or {}
+                self._server_frame_duration = audio_params.get(
+                    "frame_duration", AudioConfig.FRAME_DURATION
+                )
 
                 # 重置序列号
                 self.local_sequence = 0
@@ -443,71 +509,30 @@ class MqttProtocol(Protocol):
         except Exception as e:
             logger.error(f"处理MQTT消息时出错: {e}")
 
-    def _udp_receive_thread(self):
-        """UDP接收线程.
-
-        参考 audio_player.py 的实现方式
+    def _decode_udp_packet(self, data):
         """
-        logger.info(
-            f"UDP接收线程已启动，监听来自 {self.udp_server}:{self.udp_port} 的数据"
-        )
-
-        self.udp_running = True
-        debug_counter = 0
-
-        while self.udp_running:
-            try:
-                data, addr = self.udp_socket.recvfrom(4096)
-                debug_counter += 1
-
-                try:
-                    # 验证数据包
-                    if len(data) < 16:  # 至少需要16字节的nonce
-                        logger.error(f"无效的音频数据包大小: {len(data)}")
-                        continue
-
-                    # 分离nonce和加密数据
-                    received_nonce = data[:16]
-                    encrypted_audio = data[16:]
-
-                    # 使用AES-CTR解密
-                    decrypted = self.aes_ctr_decrypt(
-                        bytes.fromhex(self.aes_key), received_nonce, encrypted_audio
-                    )
-
-                    # 调试信息
-                    if debug_counter % 100 == 0:
-                        logger.debug(
-                            f"已解密音频数据包 #{debug_counter}, 大小: {len(decrypted)} 字节"
-                        )
-
-                    # 处理解密后的音频数据
-                    if self._on_incoming_audio:
-
-                        def process_audio(audio_data=decrypted):
-                            if asyncio.iscoroutinefunction(self._on_incoming_audio):
-                                coro = self._on_incoming_audio(audio_data)
-                                if coro is not None:
-                                    asyncio.create_task(coro)
-                            else:
-                                self._on_incoming_audio(audio_data)
-
-                        self.loop.call_soon_threadsafe(process_audio)
-
-                except Exception as e:
-                    logger.error(f"处理音频数据包错误: {e}")
-                    continue
-
-            except socket.timeout:
-                # 超时是正常的，继续循环
-                pass
-            except Exception as e:
-                logger.error(f"UDP接收线程错误: {e}")
-                if not self.udp_running:
-                    break
-                time.sleep(0.1)  # 避免在错误情况下过度消耗CPU
-
-        logger.info("UDP接收线程已停止")
+        解密一个下行UDP音频包，返回 (序列号, 音频数据).
+        """
+        codec = self._rx_codec
+        if codec is None:
+            return None
+        sequence, decrypted = codec.decode(data)
+        self.remote_sequence = sequence
+        return sequence, decrypted
+
+    def _dispatch_incoming_audio(self, packets):
+        """
+        在事件循环中把一批按序的下行音频连同序列号交给回调（序列号的空洞即丢包）.
+        """
+        callback = self._on_incoming_audio
+        if not callback:
+            return
+        is_coroutine = asyncio.iscoroutinefunction(callback)
+        for sequence, audio_data in packets:
+            if is_coroutine:
+                asyncio.create_task(callback(audio_data, sequence))
+            else:
+                callback(audio_data, sequence)
 
     async def send_text(self, message):
         """
@@ -518,44 +543,156 @@ class MqttProtocol(Protocol):
             return False
 
         try:
-            result = self.mqtt_client.publish(self.publish_topic, message)
-            result.wait_for_publish()
-            return True
+            return await self.publish(message)
         except Exception as e:
             logger.error(f"发送MQTT消息失败: {e}")
             if self._on_network_error:
                 await self._on_network_error(f"发送MQTT消息失败: {e}")
             return False
 
+    async def publish(self, payload, qos: int = None, timeout: float = None) -> bool:
+        """异步发布消息到 publish_topic，等待 paho 确认但不阻塞事件循环.
+
+        QoS 0 在写入套接字后确认，QoS 1/2 在收到 PUBACK/PUBCOMP 后确认。
+        同时等待确认的消息数受 MQTT_MAX_INFLIGHT 限制，超出的消息在此排队。
+
+        Args:
+            payload: 消息内容
+            qos: 服务质量等级，默认取 MQTT_PUBLISH_QOS
+            timeout: 排队和等待确认的总超时（秒），默认取 MQTT_PUBLISH_TIMEOUT
+
+        Returns:
+            bool: 消息是否已确认；超时返回 False
+
+        Raises:
+            ConnectionError: 发布失败，或等待确认期间连接断开
+        """
+        qos = self._publish_qos if qos is None else qos
+        timeout = self._publish_timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(self._publish(payload, qos), timeout)
+        except asyncio.TimeoutError:
+            self._publish_stats["timeouts"] += 1
+            logger.warning(f"MQTT消息发布超时 ({timeout}秒, qos={qos})")
+            return False
+
+    async def _publish(self, payload, qos: int) -> bool:
+        async with self._publish_window:
+            client = self.mqtt_client
+            if not client:
+                raise ConnectionError("MQTT客户端未初始化")
+
+            info = client.publish(self.publish_topic, payload, qos=qos)
+            # QoS>0 未连接时 paho 会缓存消息并在连接后发送，继续等待确认
+            if info.rc != mqtt.MQTT_ERR_SUCCESS and not (
+                qos > 0 and info.rc == mqtt.MQTT_ERR_NO_CONN
+            ):
+                self._publish_stats["failed"] += 1
+                raise ConnectionError(f"MQTT发布失败: {mqtt.error_string(info.rc)}")
+
+            mid = info.mid
+            future = self.loop.create_future()
+            with self._publish_lock:
+                if mid in self._early_acks:
+                    self._early_acks.discard(mid)
+                    future.set_result(True)
+                else:
+                    self._pending_publishes[mid] = future
+                inflight = len(self._pending_publishes)
+
+            stats = self._publish_stats
+            stats["published"] += 1
+            stats["max_inflight"] = max(stats["max_inflight"], inflight)
+            start = time.monotonic()
+            try:
+                await future
+            except ConnectionError:
+                stats["failed"] += 1
+                raise
+            finally:
+                # 超时或被取消时 mid 仍在登记表中：确认可能迟到，
+                # 记录下来避免被当作之后复用同一 mid 的消息的确认
+                with self._publish_lock:
+                    if self._pending_publishes.pop(mid, None) is not None:
+                        self._expired_publishes.add(mid)
+
+            elapsed = (time.monotonic() - start) * 1000
+            stats["acked"] += 1
+            stats["ack_total_ms"] += elapsed
+            stats["ack_max_ms"] = max(stats["ack_max_ms"], elapsed)
+            return True
+
+    def _on_publish_ack(self, mid):
+        """
+        paho 网络线程回调：把 mid 对应的 future 交回事件循环完成.
+        """
+        with self._publish_lock:
+            future = self._pending_publishes.pop(mid, None)
+            if future is None:
+                if mid in self._expired_publishes:
+                    self._expired_publishes.discard(mid)
+                else:
+                    self._early_acks.add(mid)
+                return
+        self.loop.call_soon_threadsafe(self._resolve_publish, future, None)
+
+    @staticmethod
+    def _resolve_publish(future, error):
+        if future.done():
+            return
+        if error is None:
+            future.set_result(True)
+        else:
+            future.set_exception(error)
+
+    def _fail_pending_publishes(self, reason: str):
+        """
+        连接断开或客户端重建时，让所有等待确认的消息立即失败（可在任意线程调用）.
+        """
+        with self._publish_lock:
+            pending = list(self._pending_publishes.values())
+            self._pending_publishes.clear()
+            self._early_acks.clear()
+            self._expired_publishes.clear()
+        if not pending:
+            return
+        logger.warning(f"{len(pending)} 条MQTT消息未收到确认: {reason}")
+        for future in pending:
+            self.loop.call_soon_threadsafe(
+                self._resolve_publish, future, ConnectionError(reason)
+            )
+
+    def get_publish_stats(self) -> dict:
+        """
+        获取异步发布统计（确认耗时单位毫秒）.
+        """
+        stats = dict(self._publish_stats)
+        acked = stats.pop("ack_total_ms")
+        stats["ack_avg_ms"] = round(acked / stats["acked"], 1) if stats["acked"] else 0
+        stats["ack_max_ms"] = round(stats["ack_max_ms"], 1)
+        stats["inflight"] = len(self._pending_publishes)
+        stats["qos"] = self._publish_qos
+        stats["window"] = self._max_inflight
+        return stats
+
     async def send_audio(self, audio_data):
         """发送音频数据.
 
         参考 audio_sender.py 的实现方式
         """
-        if not self.udp_socket or not self.udp_server or not self.udp_port:
+        codec = self._tx_codec
+        if not self.udp_transport or codec is None:
             logger.error("UDP通道未初始化")
             return False
 
         try:
-            # 生成新的nonce (类似于 audio_sender.py 中的实现)
-            # 格式: 0x01 (1字节) + 0x00 (3字节) + 长度 (2字节) + 原始nonce (8字节) + 序列号 (8字节)
+            # 包头格式见 udp_packet_codec：nonce前缀 + 长度 + 原始nonce + 序列号
             self.local_sequence = (self.local_sequence + 1) & 0xFFFFFFFF
-            new_nonce = (
-                self.aes_nonce[:4]  # 固定前缀
-                + format(len(audio_data), "04x")  # 数据长度
-                + self.aes_nonce[8:24]  # 原始nonce
-                + format(self.local_sequence, "08x")  # 序列号
-            )
-
-            encrypt_encoded_data = self.aes_ctr_encrypt(
-                bytes.fromhex(self.aes_key), bytes.fromhex(new_nonce), bytes(audio_data)
-            )
+            packet = codec.encode(audio_data, self.local_sequence)
 
-            # 拼接nonce和密文
-            packet = bytes.fromhex(new_nonce) + encrypt_encoded_data
-
-            # 发送数据包
-            self.udp_socket.sendto(packet, (self.udp_server, self.udp_port))
+            # 发送数据包（非阻塞，由传输层缓冲）
+            if not self.udp_transport.send(packet):
+                raise ConnectionError("UDP通道已关闭")
 
             # 每发送10个包打印一次日志
             if self.local_sequence % 10 == 0:
@@ -616,7 +753,7 @@ class MqttProtocol(Protocol):
             return False
 
         # 检查UDP连接状态
-        return self.udp_socket is not None and self.udp_running
+        return self.udp_transport is not None and self.udp_transport.is_open()
 
     def aes_ctr_encrypt(self, key, nonce, plaintext):
         """AES-CTR模式加密函数
@@ -654,20 +791,9 @@ class MqttProtocol(Protocol):
         处理goodbye消息.
         """
         try:
-            # 停止UDP接收线程
-            if self.udp_thread and self.udp_thread.is_alive():
-                self.udp_running = False
-                self.udp_thread.join(1.0)
-                self.udp_thread = None
-            logger.info("UDP接收线程已停止")
-
-            # 关闭UDP套接字
-            if self.udp_socket:
-                try:
-                    self.udp_socket.close()
-                except Exception as e:
-                    logger.error(f"关闭UDP套接字失败: {e}")
-                self.udp_socket = None
+            # 关闭UDP音频通道
+            self._stop_udp_receiver()
+            logger.info("UDP音频通道已关闭")
 
             # 停止MQTT客户端
             if self.mqtt_client:
@@ -678,6 +804,7 @@ class MqttProtocol(Protocol):
                 except Exception as e:
                     logger.error(f"断开MQTT连接失败: {e}")
                 self.mqtt_client = None
+            self._fail_pending_publishes("音频通道已关闭")
 
             # 重置所有状态
             self.connected = False
@@ -688,6 +815,8 @@ class MqttProtocol(Protocol):
             self.udp_port = 0
             self.aes_key = None
             self.aes_nonce = None
+            self._tx_codec = None
+            self._rx_codec = None
 
             # 调用音频通道关闭回调
             if self._on_audio_channel_closed:
@@ -696,28 +825,64 @@ class MqttProtocol(Protocol):
         except Exception as e:
             logger.error(f"处理goodbye消息时出错: {e}")
 
-    def _stop_udp_receiver(self):
+    async def _udp_stats_reporter(self):
         """
-        停止UDP接收线程和关闭UDP套接字.
+        定期向服务端发送下行UDP接收质量报告，链路质量差时输出告警.
         """
-        # 关闭UDP接收线程
-        if (
-            hasattr(self, "udp_thread")
-            and self.udp_thread
-            and self.udp_thread.is_alive()
-        ):
-            self.udp_running = False
-            try:
-                self.udp_thread.join(1.0)
-            except RuntimeError:
-                pass  # 处理线程已经终止的情况
+        try:
+            while True:
+                await asyncio.sleep(self._udp_report_interval)
+                transport = self.udp_transport
+                if transport is None:
+                    break
+                report = transport.receiver.report()
+                if report["expected"] <= 0:
+                    # 本周期没有下行音频，不发送
+                    continue
 
-        # 关闭UDP套接字
-        if hasattr(self, "udp_socket") and self.udp_socket:
-            try:
-                self.udp_socket.close()
-            except Exception as e:
-                logger.error(f"关闭UDP套接字失败: {e}")
+                if (
+                    report["fraction_lost"] >= self._udp_loss_alert
+                    or report["jitter_ms"] >= self._udp_jitter_alert_ms
+                ):
+                    logger.warning(
+                        f"下行UDP链路质量差: 丢包 {report['fraction_lost']:.1%}, "
+                        f"抖动 {report['jitter_ms']:.1f}ms, "
+                        f"乱序深度 {report['reorder_depth']}"
+                    )
+
+                message = {
+                    "session_id": self.session_id,
+                    "type": "udp_stats",
+                    "interval_ms": int(self._udp_report_interval * 1000),
+                    **report,
+                }
+                try:
+                    await self.publish(json.dumps(message))
+                except Exception as e:
+                    logger.debug(f"发送UDP接收报告失败: {e}")
+        except asyncio.CancelledError:
+            pass
+
+    def _stop_udp_receiver(self):
+        """
+        关闭UDP音频通道（可在任意线程调用，实际关闭在事件循环中执行）.
+        """
+        report_task = getattr(self, "_udp_report_task", None)
+        transport = getattr(self, "udp_transport", None)
+        self._udp_report_task = None
+        if transport is None and report_task is None:
+            return
+        self.udp_transport = None
+        try:
+            if report_task is not None:
+                self.loop.call_soon_threadsafe(report_task.cancel)
+            if transport is not None:
+                self.loop.call_soon_threadsafe(transport.close)
+        except RuntimeError:
+            # 事件循环已关闭，传输层随之释放
+            pass
+        except Exception as e:
+            logger.error(f"关闭UDP音频通道失败: {e}")
 
     def __del__(self):
         """
@@ -904,6 +1069,8 @@ class MqttProtocol(Protocol):
                 f"{self.udp_server}:{self.udp_port}" if self.udp_server else None
             ),
             "session_id": self.session_id,
+            "publish": self.get_publish_stats(),
+            "udp": self.udp_transport.get_stats() if self.udp_transport else None,
         }
 
     async def _cleanup_connection(self):
@@ -930,6 +1097,7 @@ class MqttProtocol(Protocol):
                 self.mqtt_client.disconnect()
             except Exception as e:
                 logger.error(f"断开MQTT连接时出错: {e}")
+        self._fail_pending_publishes("连接已清理")
 
         # 重置时间戳
         self._last_activity_time = None
@@ -1,6 +1,7 @@
 import json
 
 from src.constants.constants import AbortReason, ListeningMode
+from src.utils.latency_tracer import LISTEN_STOP, LatencyTracer
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -18,6 +19,8 @@ class Protocol:
         # 新增连接状态变化回调
         self._on_connection_state_changed = None
         self._on_reconnecting = None
+        # 上行音频发送队列（AudioSendQueue），不使用发送队列的协议为 None
+        self.audio_send_queue = None
 
     def on_incoming_json(self, callback):
         """
@@ -28,6 +31,9 @@ class Protocol:
     def on_incoming_audio(self, callback):
         """
         设置音频数据接收回调函数.
+
+        回调签名为 callback(data, sequence=None)，sequence 为传输层序列号
+        （websocket 等可靠有序通道不提供）.
         """
         self._on_incoming_audio = callback
 
@@ -138,6 +144,7 @@ class Protocol:
         发送停止监听的消息.
         """
         message = {"session_id": self.session_id, "type": "listen", "state": "stop"}
+        LatencyTracer.get_instance().mark_last(LISTEN_STOP)
         await self.send_text(json.dumps(message))
 
     async def send_iot_descriptors(self, descriptors):
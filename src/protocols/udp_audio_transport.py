@@ -0,0 +1,488 @@
+import asyncio
+import socket
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_SEQ_MASK = 0xFFFFFFFF
+# 序列号跳变超过该距离视为服务端重新开始计数，直接重新同步
+RESYNC_DISTANCE = 1000
+# 一次可读事件最多连续读取的包数（Python 没有 recvmmsg，这里用非阻塞 recv 批量排空）
+MAX_BATCH = 32
+MAX_DATAGRAM = 4096
+
+
+def sequence_delta(sequence: int, reference: int) -> int:
+    """
+    32 位序列号的有符号差值（处理回绕）.
+    """
+    return ((sequence - reference + 0x80000000) & _SEQ_MASK) - 0x80000000
+
+
+class SequenceReorderBuffer:
+    """
+    按序列号重排下行音频包的小窗口缓冲.
+
+    - 按序到达的包立即输出，并带出缓冲中紧随其后的连续包
+    - 超前的包暂存；缺口超出 window 个包，或等待超过 max_delay 秒（由调用方调用
+      skip_gap()）时放弃缺失的包，计入 lost
+    - 迟到（已越过）或重复的包丢弃
+    - 输出 (扩展序列号, 载荷)：扩展序列号不回绕，放弃的缺口在其中保留为空洞
+      （供解码端做 FEC/PLC 补偿），服务端重新计数时从上一个值继续递增
+    """
+
+    def __init__(self, window: int = 4, max_delay: float = 0.06):
+        self.window = max(1, int(window))
+        self.max_delay = max(0.0, float(max_delay))
+        self._expected: Optional[int] = None
+        self._pending: Dict[int, bytes] = {}
+        self._gap_since: Optional[float] = None
+        # 下一个输出包的扩展序列号，与 _expected 同步前进
+        self._extended = 0
+
+        self.received = 0
+        self.delivered = 0
+        self.reordered = 0
+        self.late = 0
+        self.duplicates = 0
+        self.lost = 0
+        self.resyncs = 0
+        self.max_depth = 0
+
+    @property
+    def expected(self) -> Optional[int]:
+        return self._expected
+
+    @property
+    def gap_since(self) -> Optional[float]:
+        """
+        当前缺口开始等待的时刻（monotonic），没有缺口时为 None.
+        """
+        return self._gap_since
+
+    def reset(self):
+        self._expected = None
+        self._pending.clear()
+        self._gap_since = None
+
+    def push(self, sequence: int, payload: bytes) -> List[Tuple[int, bytes]]:
+        """放入一个包，返回可以按序输出的 (扩展序列号, 载荷) 列表.
+
+        Args:
+            sequence: 包序列号
+            payload: 解密后的音频数据
+        """
+        self.received += 1
+        out: List[Tuple[int, bytes]] = []
+        if self._expected is None:
+            self._expected = sequence
+
+        delta = sequence_delta(sequence, self._expected)
+        if delta < -RESYNC_DISTANCE or delta > RESYNC_DISTANCE:
+            # 服务端序列号重新开始：先按序交出缓冲，再从新序列号继续
+            self.resyncs += 1
+            self._flush(out)
+            self._expected = sequence
+            delta = 0
+
+        if delta < 0:
+            self.late += 1
+            return out
+
+        if delta == 0:
+            if self._pending:
+                self.reordered += 1
+            out.append((self._extended, payload))
+            self._extended += 1
+            self._expected = (sequence + 1) & _SEQ_MASK
+            self._drain(out)
+        elif sequence in self._pending:
+            self.duplicates += 1
+            return out
+        else:
+            self._pending[sequence] = payload
+            self.max_depth = max(self.max_depth, len(self._pending))
+            # 缺口超出窗口：放弃等待最旧的缺失包
+            while self._pending and delta >= self.window:
+                self._skip_to_next()
+                delta = sequence_delta(sequence, self._expected)
+            self._drain(out)
+
+        self._gap_since = (
+            (self._gap_since or time.monotonic()) if self._pending else None
+        )
+        self.delivered += len(out)
+        return out
+
+    def skip_gap(self) -> List[Tuple[int, bytes]]:
+        """
+        放弃当前缺口（等待超时），返回随后可按序输出的 (扩展序列号, 载荷).
+        """
+        out: List[Tuple[int, bytes]] = []
+        if self._pending:
+            self._skip_to_next()
+            self._drain(out)
+        self._gap_since = time.monotonic() if self._pending else None
+        self.delivered += len(out)
+        return out
+
+    def _skip_to_next(self):
+        expected = self._expected
+        nearest = min(self._pending, key=lambda seq: sequence_delta(seq, expected))
+        skipped = sequence_delta(nearest, expected)
+        self.lost += skipped
+        self._extended += skipped
+        self._expected = nearest
+
+    def _drain(self, out: List[Tuple[int, bytes]]):
+        pending = self._pending
+        expected = self._expected
+        extended = self._extended
+        while expected in pending:
+            out.append((extended, pending.pop(expected)))
+            expected = (expected + 1) & _SEQ_MASK
+            extended += 1
+        self._expected = expected
+        self._extended = extended
+
+    def _flush(self, out: List[Tuple[int, bytes]]):
+        while self._pending:
+            self._skip_to_next()
+            self._drain(out)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "received": self.received,
+            "delivered": self.delivered,
+            "reordered": self.reordered,
+            "late": self.late,
+            "duplicates": self.duplicates,
+            "lost": self.lost,
+            "resyncs": self.resyncs,
+            "depth": len(self._pending),
+            "max_depth": self.max_depth,
+        }
+
+
+# 到达间隔超过该值（秒）视为新的一段下行音频
+TALKSPURT_GAP = 0.5
+
+
+class ReceiverStatistics:
+    """
+    RTP/RTCP 风格的接收端统计（参照 RFC 3550 接收报告）.
+
+    - 丢包：按扩展最高序列号计算期望包数，区分累计丢包和报告间隔内的丢包比例
+    - 到达抖动：以"序列号 × 帧时长"作为媒体时间（包头没有 RTP 时间戳），
+      J += (|D| - J) / 16；句间停顿（到达间隔超过 TALKSPURT_GAP）后重新取基准，
+      避免把服务端的发送停顿算作网络抖动
+    - 乱序深度：包到达时已收到的最高序列号与其序列号之差
+    """
+
+    def __init__(self, frame_duration_ms: float):
+        self.frame_duration = float(frame_duration_ms) / 1000
+        self._base: Optional[int] = None
+        # 扩展最高序列号（相对 base，不回绕）
+        self._highest = -1
+        self._received = 0
+        self._jitter = 0.0
+        self._last_transit: Optional[float] = None
+        self._last_arrival: Optional[float] = None
+
+        self.out_of_order = 0
+        self.max_reorder_depth = 0
+
+        # 上次报告时的快照
+        self._prior_expected = 0
+        self._prior_received = 0
+        self._interval_max_depth = 0
+
+    def on_packet(self, sequence: int, arrival: float):
+        """记录一个到达的包.
+
+        Args:
+            sequence: 包序列号
+            arrival: 到达时刻（monotonic 秒）
+        """
+        if self._base is None:
+            self._base = sequence
+        index = sequence_delta(sequence, self._base)
+        if abs(index - self._highest) > RESYNC_DISTANCE:
+            # 序列号重新开始：以新序列号为基准（累计计数保持不变）
+            self._base = (sequence - self._highest - 1) & _SEQ_MASK
+            index = self._highest + 1
+        self._received += 1
+
+        if index > self._highest:
+            self._highest = index
+        else:
+            depth = self._highest - index
+            self.out_of_order += 1
+            self.max_reorder_depth = max(self.max_reorder_depth, depth)
+            self._interval_max_depth = max(self._interval_max_depth, depth)
+
+        transit = arrival - index * self.frame_duration
+        if (
+            self._last_transit is not None
+            and arrival - self._last_arrival <= TALKSPURT_GAP
+        ):
+            self._jitter += (abs(transit - self._last_transit) - self._jitter) / 16
+        self._last_transit = transit
+        self._last_arrival = arrival
+
+    @property
+    def expected(self) -> int:
+        return self._highest + 1
+
+    @property
+    def cumulative_lost(self) -> int:
+        """
+        累计丢包数（重复包可能使其为负，与 RTCP 一致）.
+        """
+        return self.expected - self._received
+
+    @property
+    def jitter_ms(self) -> float:
+        return self._jitter * 1000
+
+    def report(self) -> Dict[str, float]:
+        """
+        生成一份接收报告，并以当前状态作为下一个报告间隔的起点.
+        """
+        expected_interval = self.expected - self._prior_expected
+        received_interval = self._received - self._prior_received
+        lost_interval = expected_interval - received_interval
+        fraction_lost = (
+            max(0.0, lost_interval / expected_interval)
+            if expected_interval > 0
+            else 0.0
+        )
+        report = {
+            "expected": expected_interval,
+            "received": received_interval,
+            "fraction_lost": round(fraction_lost, 4),
+            "cumulative_lost": self.cumulative_lost,
+            "jitter_ms": round(self.jitter_ms, 2),
+            "reorder_depth": self._interval_max_depth,
+            "highest_sequence": (
+                (self._base + self._highest) & _SEQ_MASK
+                if self._base is not None
+                else None
+            ),
+        }
+        self._prior_expected = self.expected
+        self._prior_received = self._received
+        self._interval_max_depth = 0
+        return report
+
+    def get_stats(self) -> Dict[str, float]:
+        expected = self.expected
+        return {
+            "expected": expected,
+            "cumulative_lost": self.cumulative_lost,
+            "loss_fraction": (
+                round(max(0, self.cumulative_lost) / expected, 4) if expected else 0.0
+            ),
+            "jitter_ms": round(self.jitter_ms, 2),
+            "out_of_order": self.out_of_order,
+            "max_reorder_depth": self.max_reorder_depth,
+        }
+
+
+class UdpAudioTransport(asyncio.DatagramProtocol):
+    """
+    基于事件循环的 UDP 音频通道（替代阻塞接收线程）.
+
+    - 包直接在事件循环线程中收取、解密，不再每包一次跨线程唤醒
+    - 每次可读事件用非阻塞 recv 排空套接字中已到达的包（最多 MAX_BATCH 个），
+      经重排缓冲后一次性交给消费者
+    - 发送走 transport.sendto()（已 connect 的套接字，不必每次带地址）
+    """
+
+    def __init__(
+        self,
+        decoder: Callable[[bytes], Optional[Tuple[int, bytes]]],
+        on_packets: Callable[[List[Tuple[int, bytes]]], None],
+        reorder_window: int = 4,
+        reorder_delay: float = 0.06,
+        frame_duration_ms: float = 60,
+    ):
+        """初始化 UDP 音频通道.
+
+        Args:
+            decoder: 解析并解密一个包，返回 (序列号, 音频数据)，无法处理时返回 None
+            on_packets: 在事件循环线程中接收一批按序的 (扩展序列号, 音频数据)
+            reorder_window: 重排窗口（包数）
+            reorder_delay: 缺口最长等待时间（秒）
+            frame_duration_ms: 下行每包音频时长（毫秒），用于计算到达抖动
+        """
+        self._decoder = decoder
+        self._on_packets = on_packets
+        self.reorder = SequenceReorderBuffer(reorder_window, reorder_delay)
+        self.receiver = ReceiverStatistics(frame_duration_ms)
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self._sock: Optional[socket.socket] = None
+        self._gap_timer: Optional[asyncio.TimerHandle] = None
+
+        self.batches = 0
+        self.max_batch = 0
+        self.decode_errors = 0
+        self.sent = 0
+        self.send_errors = 0
+
+    @classmethod
+    async def open(
+        cls,
+        loop: asyncio.AbstractEventLoop,
+        host: str,
+        port: int,
+        recv_buffer: int = 0,
+        **kwargs,
+    ) -> "UdpAudioTransport":
+        """创建并连接到服务端的 UDP 音频通道.
+
+        Args:
+            loop: 事件循环
+            host: 服务端地址
+            port: 服务端端口
+            recv_buffer: 接收缓冲区大小（SO_RCVBUF，字节），0 表示使用系统默认
+            **kwargs: 传给构造函数的其余参数
+        """
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_DGRAM)
+        if not infos:
+            raise OSError(f"无法解析UDP服务器地址: {host}:{port}")
+        family, type_, proto, _, address = infos[0]
+
+        sock = socket.socket(family, type_, proto)
+        try:
+            sock.setblocking(False)
+            if recv_buffer > 0:
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, recv_buffer)
+                except OSError as e:
+                    logger.warning(f"设置UDP接收缓冲区失败: {e}")
+            sock.connect(address)
+            protocol = cls(**kwargs)
+            protocol._sock = sock
+            await loop.create_datagram_endpoint(lambda: protocol, sock=sock)
+        except Exception:
+            sock.close()
+            raise
+        return protocol
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        batch = [data]
+        sock = self._sock
+        # 排空已到达的包，同一次唤醒内批量处理
+        while len(batch) < MAX_BATCH:
+            try:
+                batch.append(sock.recv(MAX_DATAGRAM))
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                self.error_received(e)
+                break
+
+        self.batches += 1
+        self.max_batch = max(self.max_batch, len(batch))
+
+        ready: List[Tuple[int, bytes]] = []
+        reorder = self.reorder
+        receiver = self.receiver
+        arrival = time.monotonic()
+        for packet in batch:
+            try:
+                decoded = self._decoder(packet)
+            except Exception as e:
+                self.decode_errors += 1
+                logger.debug(f"处理音频数据包错误: {e}")
+                continue
+            if decoded is not None:
+                receiver.on_packet(decoded[0], arrival)
+                ready.extend(reorder.push(*decoded))
+
+        self._schedule_gap_timer()
+        if ready:
+            self._deliver(ready)
+
+    def _schedule_gap_timer(self):
+        gap_since = self.reorder.gap_since
+        if gap_since is None:
+            if self._gap_timer is not None:
+                self._gap_timer.cancel()
+                self._gap_timer = None
+            return
+        if self._gap_timer is None and self.transport is not None:
+            loop = asyncio.get_running_loop()
+            delay = max(0.0, gap_since + self.reorder.max_delay - time.monotonic())
+            self._gap_timer = loop.call_later(delay, self._on_gap_timeout)
+
+    def _on_gap_timeout(self):
+        self._gap_timer = None
+        ready = self.reorder.skip_gap()
+        self._schedule_gap_timer()
+        if ready:
+            self._deliver(ready)
+
+    def _deliver(self, packets: List[Tuple[int, bytes]]):
+        try:
+            self._on_packets(packets)
+        except Exception as e:
+            logger.error(f"分发下行音频失败: {e}")
+
+    def error_received(self, exc):
+        # 对端端口不可达等 ICMP 错误，不影响后续收发
+        logger.debug(f"UDP通道错误: {exc}")
+
+    def connection_lost(self, exc):
+        if self._gap_timer is not None:
+            self._gap_timer.cancel()
+            self._gap_timer = None
+        if exc:
+            logger.warning(f"UDP通道异常关闭: {exc}")
+        self.transport = None
+        self._sock = None
+
+    def send(self, packet: bytes) -> bool:
+        transport = self.transport
+        if transport is None or transport.is_closing():
+            self.send_errors += 1
+            return False
+        transport.sendto(packet)
+        self.sent += 1
+        return True
+
+    def is_open(self) -> bool:
+        return self.transport is not None and not self.transport.is_closing()
+
+    def close(self):
+        """
+        关闭通道（必须在事件循环线程中调用）.
+        """
+        if self.transport is not None:
+            self.transport.close()
+
+    def get_stats(self) -> Dict[str, float]:
+        stats = self.reorder.get_stats()
+        stats.update(self.receiver.get_stats())
+        stats.update(
+            {
+                "batches": self.batches,
+                "max_batch": self.max_batch,
+                "avg_batch": (
+                    round(self.reorder.received / self.batches, 2)
+                    if self.batches
+                    else 0
+                ),
+                "decode_errors": self.decode_errors,
+                "sent": self.sent,
+                "send_errors": self.send_errors,
+            }
+        )
+        return stats
@@ -0,0 +1,116 @@
+import struct
+from typing import Tuple
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+# 包头即 AES-CTR 的 16 字节初始计数器：
+# 原始nonce[0:2] (0x01 0x00) + 载荷长度 (2字节) + 原始nonce[4:12] (8字节) + 序列号 (4字节)
+HEADER_SIZE = 16
+_LENGTH_OFFSET = 2
+_SEQUENCE_OFFSET = 12
+
+_BLOCK = 16
+_COUNTER_MASK = (1 << 128) - 1
+# 预计算的计数器块数上限（64 块 = 1024 字节载荷），更长的包退回标准 CTR 上下文
+_MAX_PRECOMPUTED_BLOCKS = 64
+
+
+def _counter_constants(blocks: int) -> Tuple[int, int]:
+    """连续 blocks 个计数器块拼成的大整数 = base * repeat + offsets.
+
+    repeat 在每个块的位置放 1，offsets 在第 i 个块放 i，
+    于是一次大整数乘加即可生成 base, base+1, ... 的全部计数器块。
+    """
+    repeat = 0
+    offsets = 0
+    for i in range(blocks):
+        shift = 128 * (blocks - 1 - i)
+        repeat |= 1 << shift
+        offsets |= i << shift
+    return repeat, offsets
+
+
+_COUNTER_TABLE = [(0, 0)] + [
+    _counter_constants(blocks) for blocks in range(1, _MAX_PRECOMPUTED_BLOCKS + 1)
+]
+
+
+class UdpPacketCodec:
+    """
+    MQTT UDP 音频通道的 AES-CTR 包编解码器.
+
+    - 会话内只创建一次 AES-ECB 加密上下文（密钥扩展只做一次），
+      每个包按 CTR 规则生成计数器块、用 ECB 上下文批量加密得到密钥流，再与载荷异或；
+      避免每包新建 Cipher/encryptor 以及 nonce 的十六进制字符串往返
+    - 发送包头预分配为 bytearray，只用 struct.pack_into 改写长度和序列号
+
+    加密上下文带内部状态，一个实例只能在一个线程中使用
+    （发送和接收线程各自创建实例）。
+    """
+
+    def __init__(self, key_hex: str, nonce_hex: str):
+        """初始化编解码器.
+
+        Args:
+            key_hex: 十六进制 AES 密钥（服务端 hello 中的 udp.key）
+            nonce_hex: 十六进制 16 字节 nonce（服务端 hello 中的 udp.nonce）
+        """
+        key = bytes.fromhex(key_hex)
+        nonce = bytes.fromhex(nonce_hex)
+        if len(nonce) != HEADER_SIZE:
+            raise ValueError(f"nonce 长度必须为 {HEADER_SIZE} 字节: {len(nonce)}")
+
+        self._algorithm = algorithms.AES(key)
+        self._ecb = Cipher(self._algorithm, modes.ECB()).encryptor()
+        self._header = bytearray(nonce)
+
+    def _keystream_xor(self, counter: bytes, data: bytes) -> bytes:
+        """
+        以 counter 为初始计数器对 data 做 AES-CTR 变换（加解密相同）.
+        """
+        size = len(data)
+        if not size:
+            return b""
+        blocks = (size + _BLOCK - 1) // _BLOCK
+        base = int.from_bytes(counter, "big")
+
+        if blocks > _MAX_PRECOMPUTED_BLOCKS or base > _COUNTER_MASK - blocks:
+            # 超长包或计数器在包内回绕（128 位溢出）：退回标准 CTR 上下文
+            cipher = Cipher(self._algorithm, modes.CTR(bytes(counter)))
+            return cipher.encryptor().update(data)
+
+        repeat, offsets = _COUNTER_TABLE[blocks]
+        counters = (base * repeat + offsets).to_bytes(blocks * _BLOCK, "big")
+        keystream = self._ecb.update(counters)
+        return (
+            int.from_bytes(data, "big") ^ int.from_bytes(keystream[:size], "big")
+        ).to_bytes(size, "big")
+
+    def encode(self, payload: bytes, sequence: int) -> bytes:
+        """加密一帧音频并加上包头.
+
+        Args:
+            payload: 编码后的音频数据
+            sequence: 包序列号（取低 32 位）
+
+        Returns:
+            bytes: 包头 + 密文
+        """
+        header = self._header
+        struct.pack_into(">H", header, _LENGTH_OFFSET, len(payload) & 0xFFFF)
+        struct.pack_into(">I", header, _SEQUENCE_OFFSET, sequence & 0xFFFFFFFF)
+        return bytes(header) + self._keystream_xor(header, payload)
+
+    def decode(self, packet: bytes) -> Tuple[int, bytes]:
+        """解析并解密一个 UDP 音频包.
+
+        Args:
+            packet: 收到的数据包
+
+        Returns:
+            tuple: (序列号, 解密后的音频数据)
+        """
+        if len(packet) < HEADER_SIZE:
+            raise ValueError(f"无效的音频数据包大小: {len(packet)}")
+        (sequence,) = struct.unpack_from(">I", packet, _SEQUENCE_OFFSET)
+        return sequence, self._keystream_xor(packet[:HEADER_SIZE], packet[HEADER_SIZE:])
@@ -6,6 +6,7 @@ import time
 import websockets
 
 from src.constants.constants import AudioConfig
+from src.protocols.audio_send_queue import BLOCK, DROP_OLDEST, AudioSendQueue
 from src.protocols.protocol import Protocol
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
@@ -40,6 +41,20 @@ class WebsocketProtocol(Protocol):
         self._max_reconnect_attempts = 0  # 默认不重连
         self._auto_reconnect_enabled = False  # 默认关闭自动重连
 
+        # 上行音频发送队列配置（每个连接一个发送任务）
+        self._send_queue_frames = self.config.get_config(
+            "SYSTEM_OPTIONS.NETWORK.WEBSOCKET_SEND_QUEUE_FRAMES", 10
+        )
+        self._send_policy = self.config.get_config(
+            "SYSTEM_OPTIONS.NETWORK.WEBSOCKET_SEND_POLICY", DROP_OLDEST
+        )
+        if self._send_policy not in (DROP_OLDEST, BLOCK):
+            logger.warning(f"未知的发送队列策略: {self._send_policy}，使用 drop_oldest")
+            self._send_policy = DROP_OLDEST
+        self._write_buffer_limit = self.config.get_config(
+            "SYSTEM_OPTIONS.NETWORK.WEBSOCKET_WRITE_BUFFER_LIMIT", 16384
+        )
+
         self.WEBSOCKET_URL = self.config.get_config(
             "SYSTEM_OPTIONS.NETWORK.WEBSOCKET_URL"
         )
@@ -130,6 +145,7 @@ class WebsocketProtocol(Protocol):
                 await asyncio.wait_for(self.hello_received.wait(), timeout=10.0)
                 self.connected = True
                 self._reconnect_attempts = 0  # 重置重连计数
+                self._start_audio_send_queue()
                 logger.info("已连接到WebSocket服务器")
 
                 # 通知连接状态变化
@@ -151,6 +167,40 @@ class WebsocketProtocol(Protocol):
                 self._on_network_error(f"无法连接服务: {str(e)}")
             return False
 
+    def _start_audio_send_queue(self):
+        """
+        为当前连接创建上行音频发送队列和发送任务.
+        """
+        transport = getattr(self.websocket, "transport", None)
+        get_write_buffer_size = (
+            transport.get_write_buffer_size
+            if transport is not None and hasattr(transport, "get_write_buffer_size")
+            else None
+        )
+        queue = AudioSendQueue(
+            self.websocket.send,
+            max_frames=self._send_queue_frames,
+            policy=self._send_policy,
+            get_write_buffer_size=get_write_buffer_size,
+            write_buffer_limit=self._write_buffer_limit,
+            on_error=self._on_audio_send_error,
+        )
+        queue.start()
+        self.audio_send_queue = queue
+
+    async def _on_audio_send_error(self, e: Exception):
+        """
+        发送任务写入失败：按连接丢失处理.
+        """
+        if self._is_closing:
+            return
+        if isinstance(e, websockets.ConnectionClosed):
+            logger.warning(f"发送音频时连接已关闭: {e}")
+            await self._handle_connection_loss(f"发送音频失败: {e.code} {e.reason}")
+        else:
+            logger.error(f"发送音频数据失败: {e}")
+            await self._handle_connection_loss(f"发送音频异常: {str(e)}")
+
     def _start_heartbeat(self):
         """
         启动心跳检测任务.
@@ -349,6 +399,9 @@ class WebsocketProtocol(Protocol):
             "last_ping_time": self._last_ping_time,
             "last_pong_time": self._last_pong_time,
             "websocket_url": self.WEBSOCKET_URL,
+            "audio_send_queue": (
+                self.audio_send_queue.get_stats() if self.audio_send_queue else None
+            ),
         }
 
     async def _message_handler(self):
@@ -407,24 +460,16 @@ class WebsocketProtocol(Protocol):
             await self._handle_connection_loss(f"消息处理异常: {str(e)}")
 
     async def send_audio(self, data: bytes):
-        """
-        发送音频数据.
+        """发送音频数据.
+
+        只入队，由连接的发送任务按序写出；发送失败由发送任务按连接丢失处理
         """
         if not self.is_audio_channel_opened():
             return
 
-        try:
-            await self.websocket.send(data)
-        except websockets.ConnectionClosed as e:
-            logger.warning(f"发送音频时连接已关闭: {e}")
-            await self._handle_connection_loss(f"发送音频失败: {e.code} {e.reason}")
-        except websockets.ConnectionClosedError as e:
-            logger.warning(f"发送音频时连接错误: {e}")
-            await self._handle_connection_loss(f"发送音频错误: {e.code} {e.reason}")
-        except Exception as e:
-            logger.error(f"发送音频数据失败: {e}")
-            # 不要在这里调用网络错误回调，让连接处理器处理
-            await self._handle_connection_loss(f"发送音频异常: {str(e)}")
+        queue = self.audio_send_queue
+        if queue is not None:
+            await queue.put(data)
 
     async def send_text(self, message: str):
         """
@@ -529,6 +574,11 @@ class WebsocketProtocol(Protocol):
             except asyncio.CancelledError:
                 pass
 
+        # 停止上行音频发送任务
+        if self.audio_send_queue:
+            await self.audio_send_queue.stop()
+            self.audio_send_queue = None
+
         # 关闭WebSocket连接
         if self.websocket and self.websocket.close_code is None:
             try:
@@ -86,6 +86,28 @@ def downmix_to_mono(
     return y[:, None] if keepdims else y
 
 
+def downmix_to_mono_into(pcm: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """将浮点多声道音频下混到预分配的单声道数组（原地计算，不分配内存）
+
+    供实时音频回调使用；整数或字节输入请使用 downmix_to_mono。
+
+    Args:
+        pcm: 浮点 PCM 数组，形状 (N, C)
+        out: 预分配的浮点输出数组，形状 (N,)
+
+    Returns:
+        out 本身
+    """
+    channels = pcm.shape[1]
+    # 逐声道累加（比 axis=1 归约少一次内部缓冲分配，也更快）
+    np.copyto(out, pcm[:, 0])
+    for ch in range(1, channels):
+        np.add(out, pcm[:, ch], out=out)
+    if channels > 1:
+        np.multiply(out, 1.0 / channels, out=out)
+    return out
+
+
 def safe_queue_put(
     queue: asyncio.Queue, item: Any, replace_oldest: bool = True
 ) -> bool:
@@ -132,6 +154,45 @@ def upmix_mono_to_channels(mono_data: np.ndarray, num_channels: int) -> np.ndarr
     return np.tile(mono_data.reshape(-1, 1), (1, num_channels))
 
 
+def upmix_mono_into(mono_data: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """将单声道音频广播写入预分配的多声道数组（不分配内存）
+
+    Args:
+        mono_data: 单声道音频数据，形状 (N,)
+        out: 目标多声道数组，形状 (N, num_channels)，如 sounddevice 的 outdata
+
+    Returns:
+        out 本身
+    """
+    out[:] = mono_data[:, None]
+    return out
+
+
+def probe_sample_rate(kind: str, device: int, channels: int, sample_rate: int) -> bool:
+    """探测设备能否以指定采样率直接打开（不实际创建流）
+
+    Args:
+        kind: "input" 或 "output"
+        device: 设备索引
+        channels: 声道数
+        sample_rate: 待探测采样率
+
+    Returns:
+        True=设备支持该采样率
+    """
+    check = sd.check_input_settings if kind == "input" else sd.check_output_settings
+    try:
+        check(
+            device=device,
+            channels=channels,
+            dtype="float32",
+            samplerate=sample_rate,
+        )
+        return True
+    except Exception:
+        return False
+
+
 def _valid(devs: List[dict], idx: int, kind: str, include_virtual: bool) -> bool:
     if not isinstance(idx, int) or idx < 0 or idx >= len(devs):
         return False
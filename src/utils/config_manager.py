@@ -23,6 +23,18 @@ class ConfigManager:
                 "WEBSOCKET_URL": None,
                 "WEBSOCKET_ACCESS_TOKEN": None,
                 "MQTT_INFO": None,
+                "MQTT_PUBLISH_QOS": 0,  # 文本消息发布的QoS: 0, 1, 2
+                "MQTT_PUBLISH_TIMEOUT": 5.0,  # 单条消息等待确认的超时（秒）
+                "MQTT_MAX_INFLIGHT": 8,  # 同时等待确认的消息数上限
+                "UDP_REORDER_WINDOW": 4,  # 下行音频重排窗口（包数）
+                "UDP_REORDER_DELAY_MS": 60,  # 缺包最长等待时间
+                "UDP_RECV_BUFFER": 262144,  # UDP接收缓冲区（字节），0为系统默认
+                "UDP_STATS_REPORT_INTERVAL": 10,  # 接收质量报告间隔（秒），0为关闭
+                "UDP_LOSS_ALERT": 0.05,  # 报告间隔内丢包比例告警阈值
+                "UDP_JITTER_ALERT_MS": 50,  # 到达抖动告警阈值
+                "WEBSOCKET_SEND_QUEUE_FRAMES": 10,  # 上行音频发送队列容量（帧）
+                "WEBSOCKET_SEND_POLICY": "drop_oldest",  # 队列满时: drop_oldest, block
+                "WEBSOCKET_WRITE_BUFFER_LIMIT": 16384,  # 写缓冲超过该字节数时暂停发送
                 "ACTIVATION_VERSION": "v2",  # 可选值: v1, v2
                 "AUTHORIZATION_URL": "https://xiaozhi.me/",
             },
@@ -36,6 +48,12 @@ class ConfigManager:
             "KEYWORDS_SCORE": 1.8,
             "KEYWORDS_THRESHOLD": 0.2,
             "NUM_TRAILING_BLANKS": 1,
+            "DECODE_CHUNK_MS": 100,
+            "PRE_GATE": True,
+            "PRE_GATE_ENERGY_DB": -55.0,
+            "PRE_GATE_SNR_DB": 6.0,
+            "PRE_GATE_PREROLL_MS": 1000,
+            "PRE_GATE_HANGOVER_MS": 600,
         },
         "CAMERA": {
             "camera_index": 0,
@@ -64,6 +82,34 @@ class ConfigManager:
             "FRAME_DELAY": 3,
             "FILTER_LENGTH_RATIO": 0.4,
             "ENABLE_PREPROCESS": True,
+            "SOFTWARE_AEC": False,
+        },
+        "OPUS_ENCODER": {
+            "BITRATE": 16000,
+            "MIN_BITRATE": 8000,
+            "COMPLEXITY": 5,
+            "MIN_COMPLEXITY": 1,
+            "DTX": False,
+            "INBAND_FEC": False,
+            "PACKET_LOSS_PERC": 0,
+            "ADAPTIVE": True,
+        },
+        "VAD_OPTIONS": {
+            "UPLINK_GATE": False,
+            "ENERGY_THRESHOLD_DB": -50.0,
+            "SNR_DB": 9.0,
+            "FLATNESS_THRESHOLD": 0.45,
+            "HANGOVER_MS": 800,
+            "PREROLL_MS": 240,
+        },
+        "RECORDER": {
+            "ENABLED": False,
+            "FORMAT": "opus",
+            "DIRECTORY": "recordings",
+            "MAX_FILE_MB": 20,
+            "MAX_FILE_SECONDS": 1800,
+            "MAX_TOTAL_MB": 500,
+            "QUEUE_SIZE": 1000,
         },
         "AUDIO_DEVICES": {
             "input_device_id": None,
@@ -74,6 +120,11 @@ class ConfigManager:
             "output_sample_rate": None,
             "input_channels": None,
             "output_channels": None,
+            "CAPTURE_WORKER": False,
+            "RESAMPLE_PROFILE": "low_latency",
+            "RESAMPLE_INTEGER_FAST_PATH": False,
+            "NATIVE_RATE_NEGOTIATION": True,
+            "RATE_PROBE_CACHE": {},
         },
     }
 
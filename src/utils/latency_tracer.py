@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 打点名称
+UPLINK_LAST = "uplink_last"  # 最后一帧上行音频（AudioPlugin 发送）
+SPEECH_LAST = "speech_last"  # 最后一帧判为语音的上行音频（启用上行语音门限时）
+LISTEN_STOP = "listen_stop"  # 发送 listen stop（Protocol.send_stop_listening）
+STT = "stt"  # 收到 stt（服务端识别完成）
+TTS_START = "tts_start"  # 收到 tts start
+SENTENCE_START = "sentence_start"  # 收到第一条 tts sentence_start
+AUDIO_RX = "audio_rx"  # 收到第一个下行音频包
+DECODE_FIRST = "decode_first"  # 第一帧解码完成并进入播放队列
+PLAYBACK_FIRST = "playback_first"  # 输出回调取走第一帧
+
+# 阶段定义：(名称, 起点, 终点)，起点 "eos" 表示说话结束时刻：
+# 手动模式取 listen stop；否则优先取最后一帧语音（需启用上行语音门限），
+# 再退回最后一帧上行音频（未启用门限时上行持续到 TTS 开始，只能近似）
+STAGES = (
+    ("eos_to_stt", "eos", STT),
+    ("eos_to_tts", "eos", TTS_START),
+    ("tts_to_sentence", TTS_START, SENTENCE_START),
+    ("eos_to_audio", "eos", AUDIO_RX),
+    ("audio_to_decode", AUDIO_RX, DECODE_FIRST),
+    ("decode_to_play", DECODE_FIRST, PLAYBACK_FIRST),
+    ("eos_to_play", "eos", PLAYBACK_FIRST),
+)
+
+# 直方图桶上界（毫秒），最后一个桶为溢出桶
+HISTOGRAM_BUCKETS_MS = (20, 50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000)
+
+
+class LatencyTracer:
+    """
+    端到端语音延迟追踪：从说话结束到第一个 TTS 样本播放.
+
+    - 各模块在关键位置调用 mark()/mark_last() 打单调时钟时间戳，
+      可在任意线程（事件循环、解码线程、音频回调）调用，只做字典赋值
+    - 一轮对话以 end_turn()（收到 tts stop）结束：计算各阶段耗时，
+      写入每阶段直方图和最近轮次，并输出一行紧凑日志
+    - 区分设备侧（解码、播放队列）、网络+服务端（说话结束到首包）的耗时
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, history: int = 100):
+        self._turn: Dict[str, float] = {}
+        self._turn_index = 0
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self._histograms: Dict[str, List[int]] = {
+            name: [0] * (len(HISTOGRAM_BUCKETS_MS) + 1) for name, _, _ in STAGES
+        }
+        self._samples: Dict[str, Deque[float]] = {
+            name: deque(maxlen=history) for name, _, _ in STAGES
+        }
+
+    @classmethod
+    def get_instance(cls) -> "LatencyTracer":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def mark(self, point: str, after: Optional[str] = None):
+        """记录本轮某打点的首次发生时刻（重复调用不覆盖）.
+
+        Args:
+            point: 打点名称
+            after: 前置打点，本轮尚未发生时忽略此次打点
+                （避免上一轮残留的解码/播放帧被算作本轮首帧）
+        """
+        turn = self._turn
+        if point not in turn and (after is None or after in turn):
+            turn[point] = time.monotonic()
+
+    def mark_last(self, point: str):
+        """
+        记录本轮某打点的最近一次发生时刻；收到 tts start 后不再更新
+        （实时模式下 TTS 期间上行不停，不能把回复期间的上行当作说话结束）.
+        """
+        turn = self._turn
+        if TTS_START not in turn:
+            turn[point] = time.monotonic()
+
+    def begin_response(self):
+        """
+        收到 tts start：上一轮未正常结束时先结算，再记录本轮 tts start.
+        """
+        if TTS_START in self._turn:
+            self.end_turn()
+        self.mark(TTS_START)
+
+    def end_turn(self):
+        """
+        结算本轮（收到 tts stop 时调用），没有任何服务端响应的轮次直接丢弃.
+        """
+        turn, self._turn = self._turn, {}
+        if TTS_START not in turn and AUDIO_RX not in turn:
+            return
+
+        eos = turn.get(SPEECH_LAST, turn.get(UPLINK_LAST))
+        listen_stop = turn.get(LISTEN_STOP)
+        if listen_stop is not None:
+            eos = listen_stop
+        points = dict(turn, eos=eos)
+
+        stages: Dict[str, float] = {}
+        for name, start, end in STAGES:
+            if points.get(start) is None or points.get(end) is None:
+                continue
+            value = (points[end] - points[start]) * 1000
+            if value < 0:
+                continue
+            stages[name] = round(value, 1)
+            self._record(name, value)
+
+        self._turn_index += 1
+        self._recent.append({"turn": self._turn_index, **stages})
+        logger.info(
+            f"[latency] turn={self._turn_index} "
+            + " ".join(f"{name}={value:.0f}" for name, value in stages.items())
+        )
+
+    def _record(self, name: str, value: float):
+        bucket = len(HISTOGRAM_BUCKETS_MS)
+        for i, upper in enumerate(HISTOGRAM_BUCKETS_MS):
+            if value <= upper:
+                bucket = i
+                break
+        self._histograms[name][bucket] += 1
+        self._samples[name].append(value)
+
+    @staticmethod
+    def _percentile(values: List[float], q: float) -> Optional[float]:
+        if not values:
+            return None
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return round(ordered[index], 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取各阶段直方图、分位数（最近若干轮）和最近轮次明细（毫秒）.
+        """
+        stages = {}
+        for name, _, _ in STAGES:
+            values = list(self._samples[name])
+            stages[name] = {
+                "count": len(values),
+                "p50": self._percentile(values, 0.5),
+                "p90": self._percentile(values, 0.9),
+                "p99": self._percentile(values, 0.99),
+                "max": round(max(values), 1) if values else None,
+                "histogram": self._histograms[name],
+            }
+        return {
+            "turns": self._turn_index,
+            "buckets_ms": list(HISTOGRAM_BUCKETS_MS) + ["inf"],
+            "stages": stages,
+            "recent": list(self._recent),
+        }